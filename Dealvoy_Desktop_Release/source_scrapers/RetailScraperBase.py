@@ -4,20 +4,95 @@ RetailScraperBase - Modular base class for retail source scrapers
 Provides standardized scraping framework with compliance and anti-bot features
 """
 
+import os
+import re
 import time
 import random
+import threading
 import requests
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import json
 from urllib.parse import urljoin, urlparse
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import undetected_chromedriver as uc
+from urllib.robotparser import RobotFileParser
+# selenium / undetected_chromedriver are imported inside create_chrome_driver()
+# so scrapers that never need a browser don't pay for them at import time
+from response_cache import get_default_cache
+from browser_pool import get_browser_pool
+from html_parser import parse_html
+
+# ----------------------------------------------------------------------
+# Precompiled extraction patterns
+# ----------------------------------------------------------------------
+
+# UPC labels are scattered through large pages but 12-13 digit runs are rare,
+# so the page is scanned once for digit runs and only the text just before
+# each run is checked for a label. Branch ranks follow the order the old
+# per-pattern loop tried them.
+_DIGIT_RUN_RE = re.compile(r'[0-9]{12,}')
+_UPC_LABEL_WINDOW = 64
+_UPC_LABEL_RE = re.compile(
+    r'(?:(?P<upc>UPC)'
+    r'|(?P<universal>Universal Product Code)'
+    r'|(?P<product>Product Code)'
+    r'|(?P<item>Item Number))[:\s]*$'
+    r'|"(?:(?P<json_upc>upc)|(?P<json_gtin>gtin(?:12|13)?))"[:\s]*"$',
+    re.IGNORECASE
+)
+_UPC_BRANCH_RANK = {'upc': 0, 'universal': 1, 'product': 2, 'item': 3, 'json_upc': 4, 'json_gtin': 5}
+
+_JSON_LD_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]+id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+_STRUCTURED_UPC_KEYS = ('gtin12', 'upc', 'gtin13', 'gtin', 'ean')
+
+_PRICE_RE = re.compile(r'\d[\d,]*\.?\d*')
+
+def gtin_is_valid(code: str) -> bool:
+    """Validate the GS1 check digit of a UPC-A / EAN-13 (or GTIN-8/14) code"""
+    if not code or not code.isdigit() or len(code) not in (8, 12, 13, 14):
+        return False
+    digits = [int(c) for c in code]
+    body, check = digits[:-1], digits[-1]
+    # weights alternate 3,1,3,... starting from the digit next to the check digit
+    total = sum(d * (3 if i % 2 == 0 else 1) for i, d in enumerate(reversed(body)))
+    return (10 - total % 10) % 10 == check
+
+def _find_structured_upc(node: Any) -> Optional[str]:
+    """Depth-first search of parsed JSON for the first valid GTIN/UPC value"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            for key in _STRUCTURED_UPC_KEYS:
+                value = current.get(key)
+                if isinstance(value, (str, int)):
+                    code = str(value).strip()
+                    if len(code) in (12, 13) and gtin_is_valid(code):
+                        return code
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return None
+
+def extract_structured_upc(html: str) -> Optional[str]:
+    """UPC from JSON-LD product markup or a Next.js __NEXT_DATA__ payload"""
+    for pattern in (_JSON_LD_RE, _NEXT_DATA_RE):
+        for match in pattern.finditer(html):
+            try:
+                data = json.loads(match.group(1))
+            except ValueError:
+                continue
+            upc = _find_structured_upc(data)
+            if upc:
+                return upc
+    return None
 
 @dataclass
 class ProductData:
@@ -38,46 +113,172 @@ class ProductData:
     shipping_info: Optional[str] = None
 
 class RobotsTxtChecker:
-    """Check robots.txt compliance before scraping"""
+    """
+    Check robots.txt compliance before scraping.
+    
+    Parsed rule sets are cached per origin (shared by every scraper
+    instance) and persisted to disk, so a compliance check is normally a
+    dict lookup. Entries expire after the robots.txt Cache-Control max-age,
+    or DEFAULT_TTL when the server doesn't send one.
+    """
+    
+    DEFAULT_TTL = 24 * 3600
+    FAILURE_TTL = 300  # retry unreachable robots.txt after 5 minutes
+    CACHE_FILE = os.getenv(
+        'DEALVOY_ROBOTS_CACHE',
+        os.path.join(os.path.expanduser('~'), '.dealvoy', 'robots_cache.json')
+    )
+    
+    # origin -> {'parser': RobotFileParser|None, 'expires': float}
+    _cache: Dict[str, Dict[str, Any]] = {}
+    _lock = threading.Lock()
+    _loaded = False
+    
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlparse(url)
+        return f"{parts.scheme}://{parts.netloc}"
+    
+    @staticmethod
+    def _parse(robots_text: str) -> RobotFileParser:
+        parser = RobotFileParser()
+        parser.parse(robots_text.splitlines())
+        return parser
     
     @staticmethod
-    def can_fetch(base_url: str, user_agent: str = "*") -> bool:
-        """Check if scraping is allowed by robots.txt"""
+    def _ttl_from_headers(headers) -> int:
+        cache_control = (headers or {}).get('Cache-Control', '')
+        match = re.search(r'max-age=(\d+)', cache_control)
+        if match:
+            return int(match.group(1))
+        return RobotsTxtChecker.DEFAULT_TTL
+    
+    @classmethod
+    def _load_disk_cache(cls):
+        """Populate the in-memory cache from disk once per process (lock held)"""
+        if cls._loaded:
+            return
+        cls._loaded = True
         try:
-            robots_url = urljoin(base_url, "/robots.txt")
-            response = requests.get(robots_url, timeout=5)
-            
+            with open(cls.CACHE_FILE, 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for origin, entry in stored.items():
+            if entry.get('expires', 0) > now:
+                text = entry.get('robots')
+                cls._cache[origin] = {
+                    'parser': cls._parse(text) if text is not None else None,
+                    'robots': text,
+                    'expires': entry['expires'],
+                }
+    
+    @classmethod
+    def _save_disk_cache(cls):
+        """Write unexpired entries back to disk (lock held)"""
+        now = time.time()
+        stored = {
+            origin: {'robots': entry['robots'], 'expires': entry['expires']}
+            for origin, entry in cls._cache.items()
+            if entry['expires'] > now
+        }
+        try:
+            os.makedirs(os.path.dirname(cls.CACHE_FILE), exist_ok=True)
+            # unique per process so concurrent scrapers don't clobber each other's temp file
+            tmp = f"{cls.CACHE_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(stored, f)
+            os.replace(tmp, cls.CACHE_FILE)
+        except OSError:
+            pass
+    
+    @classmethod
+    def _fetch(cls, origin: str) -> Dict[str, Any]:
+        """Download and parse robots.txt; unreachable or non-200 means allow-all"""
+        try:
+            response = requests.get(urljoin(origin, "/robots.txt"), timeout=5)
             if response.status_code == 200:
-                robots_content = response.text.lower()
-                # Simple robots.txt parsing - look for disallow rules
-                lines = robots_content.split('\n')
-                
-                current_user_agent = None
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('user-agent:'):
-                        current_user_agent = line.split(':', 1)[1].strip()
-                    elif line.startswith('disallow:') and (current_user_agent == '*' or current_user_agent == user_agent.lower()):
-                        disallowed_path = line.split(':', 1)[1].strip()
-                        if disallowed_path == '/':
-                            return False
-                            
-            return True
-        except:
+                return {
+                    'parser': cls._parse(response.text),
+                    'robots': response.text,
+                    'expires': time.time() + cls._ttl_from_headers(response.headers),
+                }
+            return {'parser': None, 'robots': None, 'expires': time.time() + cls.DEFAULT_TTL}
+        except Exception:
+            return {'parser': None, 'robots': None, 'expires': time.time() + cls.FAILURE_TTL}
+    
+    @classmethod
+    def _get_entry(cls, origin: str) -> Dict[str, Any]:
+        with cls._lock:
+            cls._load_disk_cache()
+            entry = cls._cache.get(origin)
+            if entry and entry['expires'] > time.time():
+                return entry
+        
+        # Fetch outside the lock so one slow host doesn't stall the others
+        entry = cls._fetch(origin)
+        with cls._lock:
+            cls._cache[origin] = entry
+            cls._save_disk_cache()
+        return entry
+    
+    @classmethod
+    def can_fetch(cls, base_url: str, user_agent: str = "*", url: Optional[str] = None) -> bool:
+        """Check if scraping `url` (default: the site root) is allowed by robots.txt"""
+        entry = cls._get_entry(cls._origin(base_url))
+        parser = entry['parser']
+        if parser is None:
             # If can't fetch robots.txt, assume scraping is allowed
             return True
+        return parser.can_fetch(user_agent, url or base_url)
+    
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
+
+def create_chrome_driver():
+    """Launch an undetected Chrome driver for JavaScript-heavy sites"""
+    from selenium.webdriver.chrome.options import Options
+    import undetected_chromedriver as uc
+    
+    options = Options()
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    # Removed problematic/deprecated options for compatibility
+    # options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    # options.add_experimental_option('useAutomationExtension', False)
+    # Use undetected-chromedriver
+    driver = uc.Chrome(options=options)
+    try:
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    except Exception:
+        pass
+    return driver
 
 class RetailScraperBase(ABC):
     """
     Base class for retail source scrapers with built-in compliance and anti-bot features
     """
     
+    # HTML parser for this source (see html_parser.py); None uses HTML_PARSER_BACKEND
+    parser_backend: Optional[str] = None
+    
+    # Seconds a cached page is served without a request; sources whose
+    # prices move during the day set a shorter value
+    cache_ttl: int = 3600
+    
     def __init__(self, source_name: str, base_url: str):
         self.source_name = source_name
         self.base_url = base_url
         self.session = requests.Session()
         self.driver = None
         
+        # Shared on-disk response cache (None unless DEALVOY_HTTP_CACHE is set)
+        self.response_cache = get_default_cache()
+        
         # Rate limiting settings
         self.min_delay = 1.0
         self.max_delay = 3.0
@@ -121,24 +322,17 @@ class RetailScraperBase(ABC):
         if self.request_count % 10 == 0:
             time.sleep(random.uniform(5.0, 10.0))
     
-    def get_driver(self) -> webdriver.Chrome:
-        """Get undetected Chrome driver for JavaScript-heavy sites"""
+    def get_driver(self):
+        """Get a dedicated undetected Chrome driver for JavaScript-heavy sites"""
         if self.driver is None:
-            options = Options()
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            # Removed problematic/deprecated options for compatibility
-            # options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            # options.add_experimental_option('useAutomationExtension', False)
-            # Use undetected-chromedriver
-            self.driver = uc.Chrome(options=options)
-            try:
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            except Exception:
-                pass
+            self.driver = create_chrome_driver()
         return self.driver
     
+    @property
+    def browser_pool(self):
+        """Shared pool of warm drivers used by make_request(use_selenium=True)"""
+        return get_browser_pool(create_chrome_driver)
+    
     def close_driver(self):
         """Close the webdriver"""
         if self.driver:
@@ -158,14 +352,25 @@ class RetailScraperBase(ABC):
     
     def make_request(self, url: str, use_selenium: bool = False, retries: int = 3) -> requests.Response:
         """Make a rate-limited, compliant request with enhanced error handling"""
+        request_headers = {
+            **self.headers,
+            'Referer': self.base_url,
+        }
+        cache = self.response_cache if not use_selenium else None
+        if cache:
+            cached = cache.get_fresh(url, request_headers, ttl=self.cache_ttl)
+            if cached is not None:
+                return cached
+        
         self.rate_limit()
         
         for attempt in range(retries):
             try:
                 if use_selenium:
-                    driver = self.get_driver()
-                    driver.get(url)
-                    time.sleep(random.uniform(2, 5))  # Mimic human behavior
+                    with self.browser_pool.lease() as browser:
+                        browser.get(url)
+                        time.sleep(random.uniform(2, 5))  # Mimic human behavior
+                        page_source = browser.page_source
                     
                     # Create a mock response object with page source
                     class MockResponse:
@@ -174,18 +379,30 @@ class RetailScraperBase(ABC):
                             self.text = content
                             self.status_code = status_code
                     
-                    return MockResponse(driver.page_source)
+                    return MockResponse(page_source)
                 else:
                     # Enhanced session request with better timeouts and headers
+                    headers = dict(request_headers)
+                    conditional = cache.conditional_headers(url, request_headers) if cache else {}
+                    headers.update(conditional)
                     response = self.session.get(
                         url, 
                         timeout=(10, 30),  # Connect timeout, read timeout
                         allow_redirects=True,
-                        headers={
-                            **self.headers,
-                            'Referer': self.base_url,
-                        }
+                        headers=headers
                     )
+                    if cache:
+                        response = cache.store(url, request_headers, self.source_name, response)
+                        if conditional and response.status_code == 304:
+                            # Entry was evicted while the request was in flight, so there
+                            # is no body to revalidate - fetch the page again unconditionally
+                            response = self.session.get(
+                                url,
+                                timeout=(10, 30),
+                                allow_redirects=True,
+                                headers=request_headers
+                            )
+                            response = cache.store(url, request_headers, self.source_name, response)
                     return response
                     
             except (requests.exceptions.Timeout, requests.exceptions.ConnectionError, 
@@ -217,47 +434,52 @@ class RetailScraperBase(ABC):
                             self.text = ''
                     return FailedResponse()
     
+    def parse_html(self, markup):
+        """Parse a page with this scraper's parser backend (bs4-compatible result)"""
+        return parse_html(markup, self.parser_backend)
+    
     def extract_price(self, price_text: str) -> Optional[float]:
         """Extract price from text string"""
         if not price_text:
             return None
             
-        # Remove common currency symbols and text
-        price_clean = price_text.replace('$', '').replace(',', '').replace('USD', '').strip()
-        
-        # Extract first number that looks like a price
-        import re
-        price_match = re.search(r'(\d+\.?\d*)', price_clean)
+        # First number that looks like a price; thousands separators dropped
+        price_match = _PRICE_RE.search(price_text)
         
         if price_match:
             try:
-                return float(price_match.group(1))
+                return float(price_match.group(0).replace(',', ''))
             except ValueError:
                 return None
         return None
     
     def extract_upc(self, product_page_content: str) -> Optional[str]:
         """Extract UPC from product page content"""
-        import re
+        if not product_page_content:
+            return None
         
-        # Common UPC patterns
-        upc_patterns = [
-            r'UPC[:\s]*(\d{12,13})',
-            r'upc[:\s]*(\d{12,13})',
-            r'Universal Product Code[:\s]*(\d{12,13})',
-            r'Product Code[:\s]*(\d{12,13})',
-            r'Item Number[:\s]*(\d{12,13})',
-            r'"upc"[:\s]*"(\d{12,13})"',
-            r'"gtin"[:\s]*"(\d{12,13})"'
-        ]
+        # Structured data is the most reliable source when the page has it
+        if '__NEXT_DATA__' in product_page_content or 'ld+json' in product_page_content:
+            upc = extract_structured_upc(product_page_content)
+            if upc:
+                return upc
         
-        for pattern in upc_patterns:
-            match = re.search(pattern, product_page_content, re.IGNORECASE)
-            if match:
-                upc = match.group(1)
-                if len(upc) in [12, 13]:  # Valid UPC length
-                    return upc
-        return None
+        # Single pass over the page; keep the best-ranked candidate with a valid check digit
+        best_rank, best_upc = None, None
+        for run in _DIGIT_RUN_RE.finditer(product_page_content):
+            upc = run.group(0)
+            if len(upc) > 13:
+                continue
+            start = run.start()
+            label = _UPC_LABEL_RE.search(product_page_content, max(start - _UPC_LABEL_WINDOW, 0), start)
+            if not label:
+                continue
+            rank = _UPC_BRANCH_RANK[label.lastgroup]
+            if (best_rank is None or rank < best_rank) and gtin_is_valid(upc):
+                best_rank, best_upc = rank, upc
+                if rank == 0:
+                    break
+        return best_upc
     
     @abstractmethod
     def search_products(self, query: str, max_results: int = 10) -> List[ProductData]:
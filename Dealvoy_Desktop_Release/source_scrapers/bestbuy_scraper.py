@@ -11,7 +11,6 @@ import time
 from typing import List, Optional
 from urllib.parse import quote, urljoin
 import requests
-from bs4 import BeautifulSoup
 
 # Bulletproof import for RetailScraperBase
 import sys
@@ -26,6 +25,9 @@ class BestBuyScraper(RetailScraperBase):
     BestBuy.com scraper with compliance and anti-bot features
     """
     
+    # deal-of-the-day and open-box prices change through the day
+    cache_ttl = 600
+    
     def __init__(self):
         super().__init__(
             source_name="BestBuy",
@@ -70,7 +72,7 @@ class BestBuyScraper(RetailScraperBase):
                 print(f"❌ BestBuy search failed: {response.status_code}")
                 return products
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Find product cards
             product_cards = soup.find_all('li', class_=re.compile(r'sku-item')) or \
@@ -178,7 +180,7 @@ class BestBuyScraper(RetailScraperBase):
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Extract detailed information
             title = self._extract_product_title(soup)
@@ -1,10 +1,12 @@
 from RetailScraperBase import RetailScraperBase, ProductData
 from typing import List, Optional
 from urllib.parse import quote
-from bs4 import BeautifulSoup
 import re
 
 class BHScraper(RetailScraperBase):
+    # electronics prices change through the day
+    cache_ttl = 600
+
     def __init__(self):
         super().__init__(
             source_name="B&H",
@@ -26,7 +28,7 @@ class BHScraper(RetailScraperBase):
         if response.status_code != 200:
             print(f"❌ B&H search failed: {response.status_code}")
             return products
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = self.parse_html(response.content)
         product_cards = soup.find_all('div', class_=re.compile(r'itemWrapper'))
         for card in product_cards[:max_results]:
             title_elem = card.find('span', class_=re.compile(r'descriptiveText'))
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+BrowserPool - Reusable pool of warm headless browser drivers
+The implementation lives in app/browser_pool.py; importing `browser_pool`
+here resolves to that same module, so the Desktop scrapers and the app
+share one pool and one copy of the code.
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+import app.browser_pool
+
+sys.modules[__name__] = app.browser_pool
@@ -11,7 +11,6 @@ import time
 from typing import List, Optional
 from urllib.parse import quote, urljoin
 import requests
-from bs4 import BeautifulSoup
 
 # Bulletproof import for RetailScraperBase
 import sys
@@ -84,11 +83,11 @@ class CVSScraper(RetailScraperBase):
                     with open('/tmp/cvs_selenium_debug.html', 'w', encoding='utf-8') as f:
                         f.write(page_source)
                     print("[DEBUG] Saved Selenium page source to /tmp/cvs_selenium_debug.html")
-                    soup = BeautifulSoup(page_source, 'html.parser')
+                    soup = self.parse_html(page_source)
                 except Exception as e:
                     print(f"Selenium fallback error: {e}")
             elif hasattr(response, 'content'):
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = self.parse_html(response.content)
             else:
                 print(f"❌ CVS search failed: {getattr(response, 'status_code', 'unknown')}")
                 return products
@@ -175,7 +174,7 @@ class CVSScraper(RetailScraperBase):
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Extract detailed information
             title = self._extract_product_title(soup)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+UPC/price extraction micro-benchmark
+Times RetailScraperBase.extract_upc against the old seven-pass regex loop
+over saved product pages: a directory of *.html files, or the pages in the
+response cache (see response_cache.py).
+
+    python extraction_benchmark.py --pages ./sample_pages
+    python extraction_benchmark.py --source Target
+"""
+
+import os
+import re
+import sys
+import time
+import glob
+import argparse
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+from RetailScraperBase import TestRetailScraper
+from response_cache import ResponseCache, DEFAULT_CACHE_DIR
+
+LEGACY_UPC_PATTERNS = [
+    r'UPC[:\s]*(\d{12,13})',
+    r'upc[:\s]*(\d{12,13})',
+    r'Universal Product Code[:\s]*(\d{12,13})',
+    r'Product Code[:\s]*(\d{12,13})',
+    r'Item Number[:\s]*(\d{12,13})',
+    r'"upc"[:\s]*"(\d{12,13})"',
+    r'"gtin"[:\s]*"(\d{12,13})"'
+]
+
+def legacy_extract_upc(content: str):
+    """The pre-compiled-pattern implementation, kept for comparison"""
+    for pattern in LEGACY_UPC_PATTERNS:
+        match = re.search(pattern, content, re.IGNORECASE)
+        if match:
+            return match.group(1)
+    return None
+
+def load_pages(pages_dir=None, source=None):
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+        return pages
+    cache = ResponseCache(os.getenv('DEALVOY_HTTP_CACHE', DEFAULT_CACHE_DIR))
+    return [entry.text for entry in cache.iter_entries(source)]
+
+def time_it(fn, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            fn(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UPC extraction over saved pages")
+    parser.add_argument('--pages', help='directory of saved *.html product pages')
+    parser.add_argument('--source', help='use cached pages for this source instead')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.source)
+    if not pages:
+        print("❌ No sample pages found")
+        sys.exit(1)
+
+    scraper = TestRetailScraper()
+    total_mb = sum(len(p) for p in pages) / (1024 * 1024)
+    legacy = time_it(legacy_extract_upc, pages, args.repeat)
+    current = time_it(scraper.extract_upc, pages, args.repeat)
+    agree = sum(1 for p in pages if legacy_extract_upc(p) == scraper.extract_upc(p))
+
+    print(f"📄 {len(pages)} pages, {total_mb:.1f} MB")
+    print(f"  legacy extract_upc : {legacy * 1000:9.2f} ms  ({legacy / len(pages) * 1000:.3f} ms/page)")
+    print(f"  extract_upc        : {current * 1000:9.2f} ms  ({current / len(pages) * 1000:.3f} ms/page)")
+    print(f"  speedup            : {legacy / current:9.1f}x")
+    print(f"  same result        : {agree}/{len(pages)} pages "
+          f"(differences are check-digit rejects or structured-data hits)")
+
+if __name__ == "__main__":
+    main()
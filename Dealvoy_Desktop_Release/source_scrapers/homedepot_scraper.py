@@ -11,7 +11,6 @@ import time
 from typing import List, Optional
 from urllib.parse import quote, urljoin
 import requests
-from bs4 import BeautifulSoup
 
 # Bulletproof import for RetailScraperBase
 import sys
@@ -63,7 +62,7 @@ class HomeDepotScraper(RetailScraperBase):
                 print(f"❌ HomeDepot search failed: {response.status_code}")
                 return products
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Find product cards - Home Depot uses pods
             product_cards = soup.find_all('div', class_=re.compile(r'browse-search__pod|product-pod')) or \
@@ -162,7 +161,7 @@ class HomeDepotScraper(RetailScraperBase):
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Extract detailed information
             title = self._extract_product_title(soup)
@@ -0,0 +1,16 @@
+# html_parser.py
+#
+# The Desktop scrapers import this module flat (`from html_parser import
+# parse_html`). The implementation lives in app/html_parser.py; this name
+# resolves to that same module object, so there is one copy to maintain.
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+import app.html_parser
+
+sys.modules[__name__] = app.html_parser
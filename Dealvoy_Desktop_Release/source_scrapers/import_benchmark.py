@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Scraper import-time benchmark
+Imports every registered scraper module in a fresh interpreter and reports
+cold import time, plus whether selenium got pulled in at import. Use
+--max-ms to fail (exit 1) when any module is slower than the budget, so
+cold-start regressions are caught.
+
+    python import_benchmark.py --max-ms 400
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+PROBE = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({{'ms': elapsed * 1000, 'selenium': 'selenium' in sys.modules}}))\n"
+)
+
+def measure(module_name: str) -> dict:
+    """Cold-import one module in a subprocess"""
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module_name)],
+        cwd=current_dir,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        last_line = (proc.stderr.strip().splitlines() or ['unknown error'])[-1]
+        return {'module': module_name, 'ok': False, 'error': last_line}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {'module': module_name, 'ok': True, **result}
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time per scraper module")
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='fail if any module takes longer than this to import')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    from scraper_registry import ScraperRegistry
+    modules = sorted({config['module'] for config in ScraperRegistry().scrapers.values()})
+    results = [measure(name) for name in modules]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'module':<32}{'import ms':>12}  selenium")
+        for r in sorted(results, key=lambda r: -r.get('ms', -1)):
+            if r['ok']:
+                print(f"{r['module']:<32}{r['ms']:>12.1f}  {'yes' if r['selenium'] else 'no'}")
+            else:
+                print(f"{r['module']:<32}{'failed':>12}  {r['error']}")
+
+    slow = [r for r in results if r['ok'] and args.max_ms is not None and r['ms'] > args.max_ms]
+    if slow:
+        print(f"❌ {len(slow)} module(s) over the {args.max_ms:.0f} ms budget: "
+              f"{', '.join(r['module'] for r in slow)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,6 @@ import time
 from typing import List, Optional
 from urllib.parse import quote, urljoin
 import requests
-from bs4 import BeautifulSoup
 
 # Bulletproof import for RetailScraperBase
 import sys
@@ -69,7 +68,7 @@ class LowesScraper(RetailScraperBase):
                 print(f"❌ Lowes search failed: {response.status_code}")
                 return products
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Find product cards - Lowe's uses specific patterns
             product_cards = soup.find_all('div', class_=re.compile(r'srp-item|product-item|plp-product')) or \
@@ -175,7 +174,7 @@ class LowesScraper(RetailScraperBase):
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Extract detailed information
             title = self._extract_product_title(soup)
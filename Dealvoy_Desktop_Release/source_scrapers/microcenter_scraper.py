@@ -1,10 +1,12 @@
 from RetailScraperBase import RetailScraperBase, ProductData
 from typing import List, Optional
 from urllib.parse import quote
-from bs4 import BeautifulSoup
 import re
 
 class MicrocenterScraper(RetailScraperBase):
+    # electronics prices change through the day
+    cache_ttl = 600
+
     def __init__(self):
         super().__init__(
             source_name="Microcenter",
@@ -26,7 +28,7 @@ class MicrocenterScraper(RetailScraperBase):
         if response.status_code != 200:
             print(f"❌ Microcenter search failed: {response.status_code}")
             return products
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = self.parse_html(response.content)
         product_cards = soup.find_all('div', class_=re.compile(r'product_wrapper'))
         for card in product_cards[:max_results]:
             title_elem = card.find('a', class_=re.compile(r'product_link'))
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+HTML parser backend benchmark
+Parses saved pages (a directory of *.html files, or the pages in the
+response cache) with every installed html_parser backend and reports parse
+time, parse + typical listing queries, and resident memory per document.
+Without saved pages, --synthetic N generates Amazon/Target-shaped listings.
+
+    python parser_benchmark.py --pages ./sample_pages
+    python parser_benchmark.py --source Target
+    python parser_benchmark.py --synthetic 20
+"""
+
+import os
+import re
+import gc
+import sys
+import json
+import time
+import random
+import argparse
+import subprocess
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+from html_parser import available_backends, parse_html
+from extraction_benchmark import load_pages
+
+AMAZON_CARD = """<div data-component-type="s-search-result" data-asin="B0{n:08d}" class="sg-col-4-of-24 s-result-item s-asin sg-col">
+<div class="sg-col-inner"><div class="s-widget-container s-spacing-small s-widget-container-height-small">
+<span class="a-declarative"><div class="puis-card-container s-card-container s-overflow-hidden">
+<div class="a-section a-spacing-base"><div class="s-product-image-container"><span class="rush-component">
+<a class="a-link-normal s-no-outline" href="/dp/B0{n:08d}"><div class="a-section aok-relative s-image-square-aspect">
+<img class="s-image" src="https://m.media-amazon.com/images/I/{n}.jpg" alt="Product {n}"></div></a></span></div>
+<div class="a-section a-spacing-small puis-padding-left-small puis-padding-right-small">
+<h2 class="a-size-mini a-spacing-none a-color-base s-line-clamp-4"><a class="a-link-normal s-link-style a-text-normal" href="/dp/B0{n:08d}">
+<span class="a-size-base-plus a-color-base a-text-normal">Building Set {n} with {pieces} Pieces, Gift for Kids</span></a></h2>
+<div class="a-row a-size-small"><span aria-label="4.{r} out of 5 stars"><i class="a-icon a-icon-star-small a-star-small-4-5"></i></span>
+<span class="a-size-base s-underline-text">{reviews}</span></div>
+<div class="a-row a-size-base a-color-base"><a class="a-size-base a-link-normal s-no-hover s-underline-text" href="/dp/B0{n:08d}">
+<span class="a-price" data-a-size="xl"><span class="a-offscreen">${whole}.{frac}</span><span aria-hidden="true">
+<span class="a-price-symbol">$</span><span class="a-price-whole">{whole}<span class="a-price-decimal">.</span></span>
+<span class="a-price-fraction">{frac}</span></span></span></a></div>
+<div class="a-row a-size-base a-color-secondary s-align-children-center"><span class="a-color-base">FREE delivery</span></div>
+</div></div></div></span></div></div></div>"""
+
+TARGET_CARD = """<div data-test="@web/site-top-of-funnel/ProductCardWrapper" class="styles__ProductCardWrapper-sc-{n}">
+<div data-test="product-card" class="ProductCard styles__StyledCol-sc-fw90uk">
+<a data-test="product-title" href="/p/set-{n}/-/A-{n:08d}" class="styles__StyledLink-sc-vpsldm">Building Set {n}</a>
+<div class="h-padding-t-tiny"><span data-test="product-brand" class="styles__BrandText">Brand {r}</span></div>
+<span data-test="product-price" class="styles__PriceFontSize">${whole}.{frac}</span>
+<picture><img src="https://target.scene7.com/is/image/Target/{n}" alt="Set {n}"></picture>
+<span data-test="fulfillment-shipping" class="h-text-greenDark">Shipping arrives by Tue</span></div></div>"""
+
+
+def synthetic_pages(count: int, cards: int = 60):
+    rng = random.Random(42)
+    filler = "<script>" + json.dumps({"state": ["x" * 40] * 1500}) + "</script>"
+    pages = []
+    for p in range(count):
+        template = AMAZON_CARD if p % 2 == 0 else TARGET_CARD
+        body = "".join(
+            template.format(n=p * cards + i, pieces=rng.randint(50, 3000), r=rng.randint(0, 9),
+                            reviews=rng.randint(1, 90000), whole=rng.randint(5, 300), frac=rng.randint(10, 99))
+            for i in range(cards)
+        )
+        pages.append(f"<html><head><title>results</title>{filler}</head>"
+                     f"<body><div class=\"s-main-slot\">{body}</div></body></html>")
+    return pages
+
+
+def listing_queries(soup):
+    """The work a search-results scraper does after parsing"""
+    out = []
+    for card in soup.select("div[data-component-type='s-search-result']"):
+        title = card.select_one("h2 a span")
+        price = card.select_one("span.a-price .a-price-whole")
+        out.append((card.get("data-asin"), title.get_text(strip=True) if title else None,
+                    price.get_text(strip=True) if price else None))
+    for card in soup.find_all('div', {'data-test': 'product-card'}):
+        title = card.find('a', {'data-test': 'product-title'})
+        price = card.find('span', class_=re.compile(r'price', re.I))
+        out.append((title.get('href') if title else None, title.get_text(strip=True) if title else None,
+                    price.get_text(strip=True) if price else None))
+    return out
+
+
+def best_time(fn, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            fn(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        # peak rather than current where /proc is unavailable (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def memory_per_doc(backend, pages):
+    """Resident memory held per parsed document (run in a fresh process per backend)"""
+    gc.collect()
+    before = rss_bytes()
+    docs = [parse_html(page, backend) for page in pages]
+    gc.collect()
+    held = rss_bytes() - before
+    return held / len(docs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends over saved pages")
+    parser.add_argument('--pages', help='directory of saved *.html pages')
+    parser.add_argument('--source', help='use cached pages for this source instead')
+    parser.add_argument('--synthetic', type=int, default=0, help='generate N listing pages instead')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--memory-only', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.synthetic) if args.synthetic else load_pages(args.pages, args.source)
+    if not pages:
+        print("❌ No sample pages found (try --synthetic 20)")
+        sys.exit(1)
+
+    if args.memory_only:
+        print(memory_per_doc(args.memory_only, pages))
+        return
+
+    total_mb = sum(len(p) for p in pages) / (1024 * 1024)
+    print(f"📄 {len(pages)} pages, {total_mb:.1f} MB")
+    print(f"  {'backend':<12}{'parse ms/page':>15}{'+queries ms/page':>18}{'MB/doc':>9}{'speedup':>9}")
+    baseline = None
+    for backend in reversed(available_backends()):  # html.parser first
+        parse = best_time(lambda p: parse_html(p, backend), pages, args.repeat)
+        full = best_time(lambda p: listing_queries(parse_html(p, backend)), pages, args.repeat)
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--memory-only', backend] + sys.argv[1:],
+            capture_output=True, text=True
+        )
+        mem = float(child.stdout.strip() or 'nan') / (1024 * 1024)
+        baseline = baseline or full
+        print(f"  {backend:<12}{parse / len(pages) * 1000:>15.2f}{full / len(pages) * 1000:>18.2f}"
+              f"{mem:>9.2f}{baseline / full:>8.1f}x")
+
+    # every backend must pull the same fields out of the pages
+    reference = [listing_queries(parse_html(p, 'html.parser')) for p in pages]
+    for backend in available_backends():
+        same = sum(1 for p, ref in zip(pages, reference) if listing_queries(parse_html(p, backend)) == ref)
+        print(f"  {backend:<12} same fields as html.parser: {same}/{len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+ResponseCache - On-disk HTTP response cache for retail source scrapers
+Stores compressed page bodies by content hash, revalidates with ETag /
+Last-Modified, caps total size with LRU eviction, and can replay cached
+pages offline so parsers can be regression-tested and benchmarked.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+# Request headers that change what the server sends back
+VARY_HEADERS = ('Accept', 'Accept-Language', 'Accept-Encoding', 'X-Requested-With')
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.dealvoy', 'http_cache')
+
+class CachedResponse:
+    """requests.Response look-alike served from the cache"""
+
+    def __init__(self, url: str, status_code: int, content: bytes,
+                 headers: Optional[Dict[str, str]] = None, from_cache: bool = True):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = from_cache
+        self.encoding = 'utf-8'
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+class ResponseCache:
+    """
+    Content-addressed response cache.
+
+    Metadata (URL, validators, fetched-at, last access) lives in a small
+    SQLite index; bodies are zlib-compressed blobs named by the SHA-256 of
+    the body, so identical pages reached through different URLs share one
+    file on disk.
+
+    Modes:
+        live   - serve fresh entries, revalidate stale ones, fetch misses
+        replay - serve whatever is cached regardless of age, never touch
+                 the network (misses come back as 504)
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = 500 * 1024 * 1024,
+                 default_ttl: int = 3600, mode: str = 'live'):
+        if mode not in ('live', 'replay'):
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.mode = mode
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0}
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite3'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key           TEXT PRIMARY KEY,
+                url           TEXT NOT NULL,
+                source        TEXT,
+                status        INTEGER,
+                etag          TEXT,
+                last_modified TEXT,
+                content_type  TEXT,
+                body_hash     TEXT NOT NULL,
+                size          INTEGER NOT NULL,
+                fetched_at    REAL NOT NULL,
+                last_access   REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_source ON entries(source)")
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional['ResponseCache']:
+        """
+        Build the cache from environment variables, or None if disabled.
+        DEALVOY_HTTP_CACHE     - cache directory (unset = caching off)
+        DEALVOY_CACHE_MODE     - live | replay
+        DEALVOY_CACHE_MAX_MB   - LRU size cap in MB
+        DEALVOY_CACHE_TTL      - default TTL in seconds
+        """
+        cache_dir = os.getenv('DEALVOY_HTTP_CACHE')
+        if not cache_dir:
+            return None
+        return cls(
+            cache_dir=cache_dir,
+            max_bytes=int(os.getenv('DEALVOY_CACHE_MAX_MB', '500')) * 1024 * 1024,
+            default_ttl=int(os.getenv('DEALVOY_CACHE_TTL', '3600')),
+            mode=os.getenv('DEALVOY_CACHE_MODE', 'live'),
+        )
+
+    # ------------------------------------------------------------------
+    # Keys and blobs
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        headers = headers or {}
+        lowered = {k.lower(): v for k, v in headers.items()}
+        parts = [url] + [f"{h}={lowered.get(h.lower(), '')}" for h in VARY_HEADERS]
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def _blob_path(self, body_hash: str) -> str:
+        return os.path.join(self.blob_dir, body_hash[:2], f"{body_hash}.z")
+
+    def _read_blob(self, body_hash: str) -> Optional[bytes]:
+        try:
+            with open(self._blob_path(body_hash), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def _write_blob(self, body: bytes) -> Tuple[str, int]:
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(zlib.compress(body, 6))
+            os.replace(tmp, path)
+        return body_hash, os.path.getsize(path)
+
+    def _row(self, key: str):
+        return self._db.execute(
+            "SELECT url, status, etag, last_modified, content_type, body_hash, fetched_at "
+            "FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+    def _to_response(self, row) -> Optional[CachedResponse]:
+        url, status, etag, last_modified, content_type, body_hash, _ = row
+        body = self._read_blob(body_hash)
+        if body is None:
+            return None
+        headers = {}
+        if etag:
+            headers['ETag'] = etag
+        if last_modified:
+            headers['Last-Modified'] = last_modified
+        if content_type:
+            headers['Content-Type'] = content_type
+        return CachedResponse(url, status, body, headers)
+
+    # ------------------------------------------------------------------
+    # Public API used by RetailScraperBase.make_request
+    # ------------------------------------------------------------------
+
+    def get_fresh(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  ttl: Optional[int] = None) -> Optional[CachedResponse]:
+        """Return a cached response that can be used without a request, else None"""
+        key = self.make_key(url, headers)
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            row = self._row(key)
+            if row is not None and (self.mode == 'replay' or time.time() - row[6] < ttl):
+                response = self._to_response(row)
+                if response is not None:
+                    self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self.stats['hits'] += 1
+                    return response
+            self.stats['misses'] += 1
+
+        if self.mode == 'replay':
+            # Replay never goes to the network
+            return CachedResponse(url, 504, b'', from_cache=True)
+        return None
+
+    def conditional_headers(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for a stale entry, if we have validators"""
+        with self._lock:
+            row = self._row(self.make_key(url, headers))
+        if row is None:
+            return {}
+        conditional = {}
+        if row[2]:
+            conditional['If-None-Match'] = row[2]
+        if row[3]:
+            conditional['If-Modified-Since'] = row[3]
+        return conditional
+
+    def store(self, url: str, headers: Optional[Dict[str, str]], source: str, response):
+        """
+        Record a live response. A 304 refreshes the existing entry and
+        returns the cached body; a 200 is written to disk. Anything else
+        is passed through untouched - including a 304 whose entry has been
+        evicted since the conditional request was sent, which the caller
+        must refetch without validators.
+        """
+        key = self.make_key(url, headers)
+        now = time.time()
+
+        if response.status_code == 304:
+            with self._lock:
+                row = self._row(key)
+                if row is not None:
+                    cached = self._to_response(row)
+                    if cached is not None:
+                        self._db.execute(
+                            "UPDATE entries SET fetched_at = ?, last_access = ? WHERE key = ?",
+                            (now, now, key)
+                        )
+                        self._db.commit()
+                        self.stats['revalidated'] += 1
+                        return cached
+            return response
+
+        if response.status_code != 200 or not response.content:
+            return response
+
+        body_hash, size = self._write_blob(response.content)
+        resp_headers = getattr(response, 'headers', {}) or {}
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, source, status, etag, last_modified, content_type, body_hash, size, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, source, response.status_code, resp_headers.get('ETag'),
+                 resp_headers.get('Last-Modified'), resp_headers.get('Content-Type'),
+                 body_hash, size, now, now)
+            )
+            self._db.commit()
+            self.stats['stored'] += 1
+            self._evict()
+        return response
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _blob_bytes(self) -> int:
+        """Size of the blobs on disk; entries sharing a body count it once (lock held)"""
+        return self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT body_hash, size FROM entries)"
+        ).fetchone()[0]
+
+    def _evict(self):
+        """Drop least-recently-used entries until blobs fit under max_bytes (lock held)"""
+        total = self._blob_bytes()
+        if total <= self.max_bytes:
+            return
+
+        for key, body_hash, size in self._db.execute(
+            "SELECT key, body_hash, size FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.stats['evicted'] += 1
+            still_used = self._db.execute(
+                "SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)
+            ).fetchone()
+            if not still_used:
+                try:
+                    os.remove(self._blob_path(body_hash))
+                except OSError:
+                    pass
+                total -= size
+        self._db.commit()
+
+    def iter_entries(self, source: Optional[str] = None) -> Iterator[CachedResponse]:
+        """Yield cached responses (optionally for one source) for offline parser runs"""
+        with self._lock:
+            if source:
+                rows = self._db.execute(
+                    "SELECT url, status, etag, last_modified, content_type, body_hash, fetched_at "
+                    "FROM entries WHERE source = ?", (source,)
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT url, status, etag, last_modified, content_type, body_hash, fetched_at FROM entries"
+                ).fetchall()
+        for row in rows:
+            response = self._to_response(row)
+            if response is not None:
+                yield response
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total = self._blob_bytes()
+        return {'entries': entries, 'bytes_on_disk': total, **self.stats}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """Process-wide cache shared by every scraper instance (None if disabled)"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache.from_env() or False
+        return _default_cache or None
+
+def replay_benchmark(source: str, queries, cache_dir: str = DEFAULT_CACHE_DIR, repeat: int = 3):
+    """
+    Re-run a scraper's search_products against cached pages only and
+    report parse time per query. No network requests are made.
+    """
+    global _default_cache
+    from scraper_registry import registry
+
+    os.environ['DEALVOY_HTTP_CACHE'] = cache_dir
+    os.environ['DEALVOY_CACHE_MODE'] = 'replay'
+    _default_cache = None
+
+    scraper = registry.get_scraper(source)
+    if scraper is None:
+        print(f"❌ Unknown source: {source}")
+        return {}
+
+    results = {}
+    for query in queries:
+        timings = []
+        found = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = len(scraper.search_products(query))
+            timings.append(time.perf_counter() - start)
+        best = min(timings) * 1000
+        results[query] = {'products': found, 'best_ms': round(best, 2)}
+        print(f"  {query:<30} {found:>4} products  {best:>8.2f} ms")
+    return results
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ('stats', 'replay'):
+        print("Usage: python response_cache.py stats [cache_dir]")
+        print("       python response_cache.py replay <source> <query> [<query> ...]")
+        sys.exit(1)
+
+    if sys.argv[1] == 'stats':
+        cache = ResponseCache(sys.argv[2] if len(sys.argv) > 2 else os.getenv('DEALVOY_HTTP_CACHE', DEFAULT_CACHE_DIR))
+        print(json.dumps(cache.summary(), indent=2))
+    else:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        sys.path.append(current_dir)
+        replay_benchmark(sys.argv[2], sys.argv[3:], os.getenv('DEALVOY_HTTP_CACHE', DEFAULT_CACHE_DIR))
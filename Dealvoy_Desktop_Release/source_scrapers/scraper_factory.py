@@ -21,7 +21,6 @@ Compliance: ClaudeBridgeAgent, robots.txt, rate-limiting
 import requests
 import time
 import random
-from bs4 import BeautifulSoup
 from typing import List, Optional
 
 try:
@@ -52,7 +51,7 @@ class {class_name}(RetailScraperBase):
         resp = self.make_request(search_url)
         if resp.status_code != 200:
             return products
-        soup = BeautifulSoup(resp.content, 'html.parser')
+        soup = self.parse_html(resp.content)
         # TODO: Implement product card parsing
         return products
 
@@ -61,7 +60,7 @@ class {class_name}(RetailScraperBase):
         resp = self.make_request(product_url)
         if resp.status_code != 200:
             return None
-        soup = BeautifulSoup(resp.content, 'html.parser')
+        soup = self.parse_html(resp.content)
         # TODO: Implement detail parsing
         return None
 
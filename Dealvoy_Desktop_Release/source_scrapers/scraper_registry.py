@@ -8,7 +8,10 @@ import json
 import os
 import sys
 import time
-from typing import Dict, List, Optional, Any
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import asdict
 
 # Add current directory to path for imports
@@ -23,6 +26,14 @@ class ScraperRegistry:
     def __init__(self):
         self.scrapers = {}
         self.scraper_stats = {}
+        # module name -> imported module (or the ImportError), filled on first use
+        self._modules = {}
+        self._import_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        # Minimum spacing between two calls to the *same* source (per-domain, not global)
+        self.min_source_interval = 1.0
+        self._last_source_call = {}
+        self._source_locks = {}
         self._load_scrapers()
     
     def _load_scrapers(self):
@@ -478,9 +489,26 @@ class ScraperRegistry:
                 'total_requests': 0,
                 'successful_requests': 0,
                 'last_used': None,
-                'compliance_status': 'unknown'
+                'compliance_status': 'unknown',
+                'timeouts': 0,
+                'last_latency': None,
+                'total_latency': 0.0
             }
     
+    def _load_module(self, module_name: str):
+        """Import a scraper module once; later lookups (and failures) come from the cache"""
+        if module_name not in self._modules:
+            with self._import_lock:
+                if module_name not in self._modules:
+                    try:
+                        self._modules[module_name] = importlib.import_module(module_name)
+                    except ImportError as e:
+                        self._modules[module_name] = e
+        module = self._modules[module_name]
+        if isinstance(module, ImportError):
+            raise ImportError(str(module))
+        return module
+    
     def get_scraper(self, source_name: str):
         """Get a specific scraper instance"""
         if source_name not in self.scrapers:
@@ -488,8 +516,7 @@ class ScraperRegistry:
         
         config = self.scrapers[source_name]
         try:
-            # Dynamic import
-            module = __import__(config['module'])
+            module = self._load_module(config['module'])
             scraper_class = getattr(module, config['class'])
             return scraper_class()
         except (ImportError, AttributeError) as e:
@@ -503,8 +530,7 @@ class ScraperRegistry:
         
         config = self.scrapers[source_name]
         try:
-            # Dynamic import
-            module = __import__(config['module'])
+            module = self._load_module(config['module'])
             scraper_function = getattr(module, config['function'])
             return scraper_function
         except (ImportError, AttributeError) as e:
@@ -517,10 +543,7 @@ class ScraperRegistry:
         results = {}
         
         # Filter scrapers by category if specified
-        scrapers_to_use = []
-        for name, config in self.scrapers.items():
-            if categories is None or config['category'] in categories:
-                scrapers_to_use.append(name)
+        scrapers_to_use = self._select_sources(categories)
         
         print(f"🔍 Searching {len(scrapers_to_use)} sources for: {query}")
         
@@ -545,6 +568,89 @@ class ScraperRegistry:
         
         return results
     
+    def _select_sources(self, categories: Optional[List[str]] = None,
+                        sources: Optional[List[str]] = None) -> List[str]:
+        """Registered names from `sources` if given, otherwise every source in `categories`"""
+        if sources:
+            return [name for name in sources if name in self.scrapers]
+        return [name for name, config in self.scrapers.items()
+                if categories is None or config['category'] in categories]
+    
+    def _wait_for_source(self, source_name: str):
+        """Space out calls to one source; other sources are not held back"""
+        with self._stats_lock:
+            lock = self._source_locks.setdefault(source_name, threading.Lock())
+        with lock:
+            last = self._last_source_call.get(source_name)
+            if last is not None:
+                wait = self.min_source_interval - (time.time() - last)
+                if wait > 0:
+                    time.sleep(wait)
+            self._last_source_call[source_name] = time.time()
+    
+    def _run_source(self, source_name: str, query: str, max_results: int) -> Tuple[str, List[dict]]:
+        """Run one source and record its latency/success"""
+        scraper_func = self.get_scraper_function(source_name)
+        if not scraper_func:
+            return source_name, []
+        
+        self._wait_for_source(source_name)
+        start = time.time()
+        products = []
+        try:
+            products = scraper_func(query, max_results) or []
+        except Exception as e:
+            print(f"❌ Error searching {source_name}: {str(e)}")
+        self._update_stats(source_name, bool(products), time.time() - start)
+        return source_name, products
+    
+    def iter_search_all_sources(self, query: str, max_results_per_source: int = 5,
+                                categories: Optional[List[str]] = None,
+                                max_workers: int = 8,
+                                deadline: Optional[float] = None,
+                                sources: Optional[List[str]] = None) -> Iterator[Tuple[str, List[dict]]]:
+        """
+        Search sources in parallel, yielding (source_name, products) as each one finishes.
+        
+        Args:
+            max_workers: Size of the thread pool
+            deadline: Overall time budget in seconds; sources still running when it
+                      expires are abandoned and counted as timeouts
+            sources: Search only these sources (categories is then ignored)
+        """
+        scrapers_to_use = self._select_sources(categories, sources)
+        print(f"🔍 Searching {len(scrapers_to_use)} sources in parallel for: {query}")
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {
+            executor.submit(self._run_source, name, query, max_results_per_source): name
+            for name in scrapers_to_use
+        }
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                pending.discard(future)
+                yield future.result()
+        except FuturesTimeout:
+            print(f"⏱️  Deadline of {deadline}s reached, {len(pending)} sources still running")
+            for future in pending:
+                self._record_timeout(futures[future])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def search_all_sources_concurrent(self, query: str, max_results_per_source: int = 5,
+                                      categories: Optional[List[str]] = None,
+                                      max_workers: int = 8,
+                                      deadline: Optional[float] = None,
+                                      sources: Optional[List[str]] = None) -> Dict[str, List[dict]]:
+        """Parallel search_all_sources; returns whatever finished before the deadline"""
+        results = {}
+        for source_name, products in self.iter_search_all_sources(
+                query, max_results_per_source, categories, max_workers, deadline, sources):
+            if products:
+                results[source_name] = products
+        return results
+    
     def get_available_sources(self) -> List[str]:
         """Get list of all available scraper sources"""
         return list(self.scrapers.keys())
@@ -558,14 +664,24 @@ class ScraperRegistry:
         """Get all available categories"""
         return list(set(config['category'] for config in self.scrapers.values()))
     
-    def _update_stats(self, source_name: str, success: bool):
+    def _update_stats(self, source_name: str, success: bool, latency: Optional[float] = None):
         """Update scraper statistics"""
-        if source_name in self.scraper_stats:
-            stats = self.scraper_stats[source_name]
-            stats['total_requests'] += 1
-            if success:
-                stats['successful_requests'] += 1
-            stats['last_used'] = time.time()
+        with self._stats_lock:
+            if source_name in self.scraper_stats:
+                stats = self.scraper_stats[source_name]
+                stats['total_requests'] += 1
+                if success:
+                    stats['successful_requests'] += 1
+                stats['last_used'] = time.time()
+                if latency is not None:
+                    stats['last_latency'] = latency
+                    stats['total_latency'] += latency
+    
+    def _record_timeout(self, source_name: str):
+        # The abandoned call still records its request when it eventually returns
+        with self._stats_lock:
+            if source_name in self.scraper_stats:
+                self.scraper_stats[source_name]['timeouts'] += 1
     
     def get_scraper_info(self, source_name: str) -> Dict[str, Any]:
         """Get detailed information about a scraper"""
@@ -597,7 +713,9 @@ registry = ScraperRegistry()
 
 def search_products(query: str, sources: Optional[List[str]] = None, 
                    categories: Optional[List[str]] = None, 
-                   max_results_per_source: int = 5) -> Dict[str, List[dict]]:
+                   max_results_per_source: int = 5,
+                   concurrent: bool = False,
+                   deadline: Optional[float] = None) -> Dict[str, List[dict]]:
     """
     Main function to search products across multiple retail sources
     
@@ -606,10 +724,16 @@ def search_products(query: str, sources: Optional[List[str]] = None,
         sources: Specific sources to search (optional)
         categories: Categories to filter by (optional)
         max_results_per_source: Max results per source
+        concurrent: Search sources in parallel instead of one at a time
+        deadline: Time budget in seconds for concurrent searches (partial results)
     
     Returns:
         Dictionary with source names as keys and product lists as values
     """
+    if concurrent:
+        # Specific sources or all/by category, in parallel under the deadline
+        return registry.search_all_sources_concurrent(
+            query, max_results_per_source, categories, deadline=deadline, sources=sources)
     if sources:
         # Search specific sources
         results = {}
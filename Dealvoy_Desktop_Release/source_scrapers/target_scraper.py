@@ -11,7 +11,6 @@ import time
 from typing import List, Optional
 from urllib.parse import quote, urljoin
 import requests
-from bs4 import BeautifulSoup
 
 # Bulletproof import for RetailScraperBase
 import sys
@@ -26,6 +25,11 @@ class TargetScraper(RetailScraperBase):
     Target.com scraper with compliance and anti-bot features
     """
     
+    # listing and detail parsing only uses calls html_parser.FastNode supports
+    parser_backend = "selectolax"
+    # Circle offers and price matches move during the day
+    cache_ttl = 900
+    
     def __init__(self):
         super().__init__(
             source_name="Target",
@@ -64,7 +68,7 @@ class TargetScraper(RetailScraperBase):
                 print(f"❌ Target search failed: {response.status_code}")
                 return products
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Find product cards
             product_cards = soup.find_all('div', {'data-test': 'product-card'}) or \
@@ -152,7 +156,7 @@ class TargetScraper(RetailScraperBase):
             if response.status_code != 200:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Extract detailed information
             title = self._extract_product_title(soup)
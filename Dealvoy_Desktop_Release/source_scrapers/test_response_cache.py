@@ -0,0 +1,169 @@
+# test_response_cache.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import response_cache
+from response_cache import ResponseCache
+from RetailScraperBase import RetailScraperBase
+
+URL = "https://shop.test/p/1"
+HEADERS = {"Accept": "text/html"}
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code, self.content, self.headers = status_code, content, headers or {}
+
+
+class FakeSession:
+    """Scripted session.get that records the headers of every request"""
+
+    def __init__(self, replies, on_get=None):
+        self.replies, self.sent, self.on_get = list(replies), [], on_get
+
+    def get(self, url, timeout=None, allow_redirects=True, headers=None):
+        self.sent.append(dict(headers or {}))
+        if self.on_get:
+            self.on_get()
+        return self.replies.pop(0)
+
+
+class StubScraper(RetailScraperBase):
+    def __init__(self, cache, session):
+        super().__init__("Stub", "https://shop.test")
+        self.response_cache = cache
+        self.session = session
+        self.rate_limit = lambda: None
+
+    def search_products(self, query, max_results=10):
+        return []
+
+    def get_product_details(self, product_url):
+        return None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr(response_cache.time, "time", lambda: now["t"])
+    return now
+
+
+def make_cache(tmp_path, **kwargs):
+    return ResponseCache(cache_dir=str(tmp_path / "http_cache"), **kwargs)
+
+
+def test_fresh_entries_are_hits_until_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, default_ttl=60)
+    cache.store(URL, HEADERS, "stub", FakeResponse(200, b"<html>page</html>"))
+
+    clock["t"] += 59
+    hit = cache.get_fresh(URL, HEADERS)
+    assert hit.text == "<html>page</html>" and hit.from_cache
+    # a different Accept header is a different entry
+    assert cache.get_fresh(URL, {"Accept": "application/json"}) is None
+
+    clock["t"] += 2
+    assert cache.get_fresh(URL, HEADERS) is None
+    assert cache.get_fresh(URL, HEADERS, ttl=3600) is not None
+    assert cache.stats["hits"] == 2 and cache.stats["misses"] == 2
+
+
+def test_304_revalidates_stale_entry(tmp_path, clock):
+    cache = make_cache(tmp_path, default_ttl=60)
+    cache.store(URL, HEADERS, "stub", FakeResponse(200, b"body", {"ETag": '"v1"', "Last-Modified": "Mon"}))
+    assert cache.conditional_headers(URL, HEADERS) == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"}
+
+    clock["t"] += 120
+    assert cache.get_fresh(URL, HEADERS) is None
+    revalidated = cache.store(URL, HEADERS, "stub", FakeResponse(304))
+    assert revalidated.status_code == 200 and revalidated.content == b"body"
+    assert cache.stats["revalidated"] == 1
+    # the 304 restarted the TTL
+    assert cache.get_fresh(URL, HEADERS).content == b"body"
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path, clock):
+    # random bodies don't compress, so each blob is ~1000 bytes on disk
+    cache = make_cache(tmp_path, max_bytes=2500)
+    for name in ("a", "b"):
+        cache.store(f"https://shop.test/{name}", HEADERS, "stub", FakeResponse(200, os.urandom(1000)))
+        clock["t"] += 1
+    cache.get_fresh("https://shop.test/a", HEADERS)
+    clock["t"] += 1
+    cache.store("https://shop.test/c", HEADERS, "stub", FakeResponse(200, os.urandom(1000)))
+
+    assert cache.get_fresh("https://shop.test/b", HEADERS) is None
+    assert cache.get_fresh("https://shop.test/a", HEADERS) is not None
+    assert cache.get_fresh("https://shop.test/c", HEADERS) is not None
+    assert cache.stats["evicted"] == 1
+    assert sum(len(files) for _, _, files in os.walk(cache.blob_dir)) == 2
+
+
+def test_replay_serves_stale_and_misses_with_504(tmp_path, clock):
+    live = make_cache(tmp_path, default_ttl=60)
+    live.store(URL, HEADERS, "stub", FakeResponse(200, b"cached"))
+    live.close()
+
+    clock["t"] += 10 ** 6
+    replay = make_cache(tmp_path, default_ttl=60, mode="replay")
+    assert replay.get_fresh(URL, HEADERS).content == b"cached"
+    miss = replay.get_fresh("https://shop.test/never-fetched", HEADERS)
+    assert miss.status_code == 504 and miss.content == b""
+
+    with pytest.raises(ValueError):
+        make_cache(tmp_path, mode="offline")
+
+
+def test_304_after_eviction_refetches_without_validators(tmp_path, clock):
+    cache = make_cache(tmp_path, default_ttl=60)
+    scraper_headers = {**StubScraper(None, None).headers, "Referer": "https://shop.test"}
+    cache.store(URL, scraper_headers, "Stub", FakeResponse(200, b"old", {"ETag": '"v1"'}))
+    clock["t"] += 3601
+
+    # the entry disappears between sending If-None-Match and getting the 304
+    evict = lambda: cache._db.execute("DELETE FROM entries") if len(session.sent) == 1 else None
+    session = FakeSession([FakeResponse(304), FakeResponse(200, b"new", {"ETag": '"v2"'})], on_get=evict)
+    scraper = StubScraper(cache, session)
+
+    response = scraper.make_request(URL)
+    assert response.status_code == 200 and response.content == b"new"
+    assert session.sent[0]["If-None-Match"] == '"v1"'
+    assert "If-None-Match" not in session.sent[1]
+    assert cache.get_fresh(URL, scraper_headers).content == b"new"
+
+
+def test_sources_override_cache_ttl(tmp_path, clock):
+    class VolatileStub(StubScraper):
+        cache_ttl = 60
+
+    cache = make_cache(tmp_path)
+    StubScraper(cache, FakeSession([FakeResponse(200, b"page")])).make_request(URL)
+    clock["t"] += 120
+
+    steady = StubScraper(cache, FakeSession([]))
+    assert steady.make_request(URL).content == b"page"
+    volatile = VolatileStub(cache, FakeSession([FakeResponse(200, b"new price")]))
+    assert volatile.make_request(URL).content == b"new price"
+    assert len(volatile.session.sent) == 1
+
+    from bestbuy_scraper import BestBuyScraper
+    assert BestBuyScraper.cache_ttl < RetailScraperBase.cache_ttl
+
+
+def test_summary_counts_shared_blobs_once(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    body = os.urandom(1000)
+    for name in ("a", "b", "c"):
+        cache.store(f"https://shop.test/{name}", HEADERS, "stub", FakeResponse(200, body))
+
+    blob_sizes = [os.path.getsize(os.path.join(root, f))
+                  for root, _, files in os.walk(cache.blob_dir) for f in files]
+    summary = cache.summary()
+    assert summary["entries"] == 3 and len(blob_sizes) == 1
+    assert summary["bytes_on_disk"] == blob_sizes[0]
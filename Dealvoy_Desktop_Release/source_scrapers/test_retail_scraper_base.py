@@ -0,0 +1,149 @@
+# test_retail_scraper_base.py
+
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import RetailScraperBase as base
+from RetailScraperBase import RetailScraperBase, RobotsTxtChecker, _PRICE_RE, gtin_is_valid
+
+
+class StubScraper(RetailScraperBase):
+    def __init__(self):
+        super().__init__("Stub", "https://example.com")
+
+    def search_products(self, query, max_results=10):
+        return []
+
+    def get_product_details(self, product_url):
+        return None
+
+
+@pytest.mark.parametrize("code, valid", [
+    ("036000291452", True),     # UPC-A
+    ("036000291453", False),
+    ("4006381333931", True),    # EAN-13
+    ("4006381333932", False),
+    ("10012345678902", True),   # GTIN-14
+    ("10012345678903", False),
+    ("96385074", True),         # GTIN-8
+    ("03600029145", False),     # 11 digits
+    ("03600029145X", False),
+    ("", False),
+])
+def test_gtin_check_digit(code, valid):
+    assert gtin_is_valid(code) is valid
+
+
+def test_extract_upc_prefers_labelled_valid_code():
+    scraper = StubScraper()
+    page = (
+        "<div>Order 123456789012345 shipped. Item Number: 4006381333931</div>"
+        "<div>Tracking 987654321098 | Model 20240101</div>"
+        "<span>UPC: 036000291453</span>"       # labelled but bad check digit
+        "<span>UPC: 036000291452</span>"
+    )
+    assert scraper.extract_upc(page) == "036000291452"
+    # the lower-ranked label wins when no valid "UPC" is present
+    assert scraper.extract_upc(page.replace("UPC: 036000291452", "")) == "4006381333931"
+    # unlabelled digit runs are never taken
+    assert scraper.extract_upc("Order 036000291452 shipped") is None
+    assert scraper.extract_upc(
+        '<script type="application/ld+json">{"@type": "Product", "gtin13": "4006381333931"}</script>'
+    ) == "4006381333931"
+
+
+@pytest.mark.parametrize("text, price", [
+    ("$19.99", 19.99),
+    ("$1,299.00", 1299.00),
+    ("Price: $12,345.67 each", 12345.67),
+    ("$45.50, free shipping", 45.50),
+    ("Now 1,000,000", 1000000.0),
+])
+def test_price_regex_keeps_thousands_separators(text, price):
+    assert float(_PRICE_RE.search(text).group(0).replace(",", "")) == price
+    assert StubScraper().extract_price(text) == price
+
+
+class FakeRobots:
+    def __init__(self, text="User-agent: *\nDisallow: /private", status=200, headers=None):
+        self.text, self.status_code, self.headers = text, status, headers or {}
+
+
+@pytest.fixture
+def robots(monkeypatch, tmp_path):
+    """RobotsTxtChecker with a temp disk cache, a controllable clock and a scripted fetch"""
+    clock = {"now": 1000.0}
+    replies, fetched = [], []
+
+    def fake_get(url, timeout=None):
+        fetched.append(url)
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(RobotsTxtChecker, "CACHE_FILE", str(tmp_path / "robots_cache.json"))
+    monkeypatch.setattr(RobotsTxtChecker, "_cache", {})
+    monkeypatch.setattr(RobotsTxtChecker, "_loaded", False)
+    monkeypatch.setattr(base.time, "time", lambda: clock["now"])
+    monkeypatch.setattr(base.requests, "get", fake_get)
+    return clock, replies, fetched
+
+
+def test_robots_entries_expire_after_max_age(robots):
+    clock, replies, fetched = robots
+    replies.append(FakeRobots(headers={"Cache-Control": "public, max-age=60"}))
+    assert not RobotsTxtChecker.can_fetch("https://shop.test", url="https://shop.test/private/x")
+    assert RobotsTxtChecker.can_fetch("https://shop.test", url="https://shop.test/p/1")
+
+    clock["now"] += 59
+    RobotsTxtChecker.can_fetch("https://shop.test/other")
+    assert len(fetched) == 1
+
+    clock["now"] += 2
+    replies.append(FakeRobots("User-agent: *\nDisallow: /"))
+    assert not RobotsTxtChecker.can_fetch("https://shop.test", url="https://shop.test/p/1")
+    assert fetched == ["https://shop.test/robots.txt"] * 2
+
+
+def test_unreachable_robots_allows_and_retries_after_failure_ttl(robots):
+    clock, replies, fetched = robots
+    replies.append(ConnectionError("down"))
+    assert RobotsTxtChecker.can_fetch("https://down.test", url="https://down.test/private")
+
+    clock["now"] += RobotsTxtChecker.FAILURE_TTL - 1
+    assert RobotsTxtChecker.can_fetch("https://down.test", url="https://down.test/private")
+    assert len(fetched) == 1
+
+    clock["now"] += 2
+    replies.append(FakeRobots())
+    assert not RobotsTxtChecker.can_fetch("https://down.test", url="https://down.test/private")
+    assert len(fetched) == 2
+
+
+def test_robots_cache_is_reloaded_from_disk(robots):
+    clock, replies, fetched = robots
+    replies.append(FakeRobots(headers={"Cache-Control": "max-age=3600"}))
+    RobotsTxtChecker.can_fetch("https://shop.test")
+    with open(RobotsTxtChecker.CACHE_FILE) as f:
+        assert json.load(f)["https://shop.test"]["expires"] == 1000.0 + 3600
+    assert not [name for name in os.listdir(os.path.dirname(RobotsTxtChecker.CACHE_FILE)) if name.endswith(".tmp")]
+
+    # a new process starts with an empty memory cache and reads the file
+    RobotsTxtChecker._cache.clear()
+    RobotsTxtChecker._loaded = False
+    assert not RobotsTxtChecker.can_fetch("https://shop.test", url="https://shop.test/private/x")
+    assert len(fetched) == 1
+
+    # expired entries on disk are not loaded
+    RobotsTxtChecker._cache.clear()
+    RobotsTxtChecker._loaded = False
+    clock["now"] += 3601
+    replies.append(FakeRobots(""))
+    assert RobotsTxtChecker.can_fetch("https://shop.test", url="https://shop.test/private/x")
+    assert len(fetched) == 2
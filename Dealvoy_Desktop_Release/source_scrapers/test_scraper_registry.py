@@ -0,0 +1,80 @@
+# test_scraper_registry.py
+
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scraper_registry
+from scraper_registry import ScraperRegistry, search_products
+
+
+def stub_registry(monkeypatch, delays):
+    """Registry whose sources return one product after sleeping `delays[name]` seconds"""
+    registry = ScraperRegistry()
+    registry.min_source_interval = 0
+    calls = []
+    for name, delay in delays.items():
+        def scrape(query, max_results, name=name, delay=delay):
+            calls.append(name)
+            time.sleep(delay)
+            return [{"source": name, "title": query}]
+        module = f"stub_{name}_scraper"
+        registry.scrapers[name] = dict(registry.scrapers[name], module=module, function="scrape")
+        registry._modules[module] = SimpleNamespace(scrape=scrape)
+    monkeypatch.setattr(scraper_registry, "registry", registry)
+    return registry, calls
+
+
+def test_concurrent_sources_respect_deadline(monkeypatch):
+    registry, calls = stub_registry(monkeypatch, {"target": 0.0, "bestbuy": 0.05, "cvs": 2.0})
+
+    start = time.time()
+    results = search_products("headphones", sources=["target", "bestbuy", "cvs", "nosuchsource"],
+                              concurrent=True, deadline=0.5)
+    elapsed = time.time() - start
+
+    # partial results: the two fast sources, not the one still sleeping
+    assert set(results) == {"target", "bestbuy"}
+    assert results["target"] == [{"source": "target", "title": "headphones"}]
+    assert elapsed < 1.5
+    assert registry.scraper_stats["cvs"]["timeouts"] == 1
+    # only the requested sources ran, none from the rest of the registry
+    assert sorted(calls) == ["bestbuy", "cvs", "target"]
+
+
+def test_sequential_sources_unchanged(monkeypatch):
+    registry, calls = stub_registry(monkeypatch, {"target": 0.0, "bestbuy": 0.0})
+
+    results = search_products("headphones", sources=["bestbuy", "target"])
+
+    assert set(results) == {"target", "bestbuy"}
+    assert calls == ["bestbuy", "target"]
+
+
+def test_scraper_imports_leave_selenium_unloaded():
+    here = os.path.dirname(os.path.abspath(__file__))
+    modules = sorted({config["module"] for config in ScraperRegistry().scrapers.values()
+                      if os.path.exists(os.path.join(here, config["module"] + ".py"))})
+    probe = ("import sys\n"
+             f"for name in {modules!r}:\n"
+             "    __import__(name)\n"
+             "print('selenium' in sys.modules, 'undetected_chromedriver' in sys.modules)\n")
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=here,
+                          capture_output=True, text=True)
+
+    assert proc.returncode == 0, proc.stderr
+    # selenium is only imported inside create_chrome_driver()
+    assert proc.stdout.split() == ["False", "False"]
+
+
+def test_load_module_imports_once():
+    registry = ScraperRegistry()
+
+    first = registry._load_module("target_scraper")
+
+    assert registry._load_module("target_scraper") is first
+    assert registry.get_scraper_function("target") is first.scrape_target
@@ -1,7 +1,6 @@
 from RetailScraperBase import RetailScraperBase, ProductData
 from typing import List
 from urllib.parse import quote
-from bs4 import BeautifulSoup
 import random, time
 
 USER_AGENTS = [
@@ -37,7 +36,7 @@ class TractorSupplyScraper(RetailScraperBase):
         if response.status_code != 200:
             print(f"❌ Tractor Supply search failed: {response.status_code}")
             return products
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = self.parse_html(response.content)
         product_cards = soup.find_all('div', class_='product-tile')
         for card in product_cards[:max_results]:
             title_elem = card.find('a', class_='product-title')
@@ -1,7 +1,6 @@
 from RetailScraperBase import RetailScraperBase, ProductData
 from typing import List, Optional
 from urllib.parse import quote
-from bs4 import BeautifulSoup
 import re
 
 class WalgreensScraper(RetailScraperBase):
@@ -26,7 +25,7 @@ class WalgreensScraper(RetailScraperBase):
         if response.status_code != 200:
             print(f"❌ Walgreens search failed: {response.status_code}")
             return products
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = self.parse_html(response.content)
         product_cards = soup.find_all('div', class_=re.compile(r'product__container'))
         for card in product_cards[:max_results]:
             title_elem = card.find('a', class_=re.compile(r'product__title'))
@@ -3,7 +3,6 @@ def scrape_worldmarket(query: str = "coffee", max_results: int = 10) -> list:
 from RetailScraperBase import RetailScraperBase, ProductData
 from typing import List, Optional
 from urllib.parse import quote
-from bs4 import BeautifulSoup
 import re
 
 class WorldMarketScraper(RetailScraperBase):
@@ -28,7 +27,7 @@ class WorldMarketScraper(RetailScraperBase):
         if response.status_code != 200:
             print(f"❌ World Market search failed: {response.status_code}")
             return products
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = self.parse_html(response.content)
         product_cards = soup.find_all('div', class_=re.compile(r'product-tile'))
         for card in product_cards[:max_results]:
             title_elem = card.find('a', class_=re.compile(r'product-title'))
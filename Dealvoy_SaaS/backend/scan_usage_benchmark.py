@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Scan Usage Tracker Benchmark
+Grows the scan history in steps and times log_scan at each size, to check
+that per-scan latency stays flat as the log reaches millions of rows.
+
+    python scan_usage_benchmark.py --rows 1000000 --samples 2000
+"""
+
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+import datetime
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scan_usage_tracker import ScanUsageTracker
+
+TIERS = ['starter', 'pro', 'enterprise', 'titan']
+AGENTS = ['DealFinderAI', 'PriceTrackerAI', 'ProfitAnalyzerAI', 'InventoryAI']
+
+def synthetic_logs(count: int, users: int, now: datetime.datetime):
+    """Historical scans spread over the last 90 days"""
+    for _ in range(count):
+        user = random.randrange(users)
+        yield {
+            "id": f"scan_{uuid.uuid4().hex}",
+            "timestamp": (now - datetime.timedelta(seconds=random.randrange(90 * 86400))).isoformat(),
+            "user_email": f"user{user}@example.com",
+            "user_tier": TIERS[user % len(TIERS)],
+            "agent_name": random.choice(AGENTS),
+            "scan_type": "product_search",
+            "outcome": "success" if random.random() < 0.9 else "error",
+            "products_found": random.randrange(50),
+            "processing_time_ms": random.randrange(200, 3000),
+            "ip_address": "10.0.0.1",
+            "user_agent": "benchmark",
+            "scan_parameters": {"search_query": "benchmark"},
+            "error_details": None
+        }
+
+def time_log_scan(tracker: ScanUsageTracker, samples: int, users: int):
+    latencies = []
+    for i in range(samples):
+        user = random.randrange(users)
+        start = time.perf_counter()
+        tracker.log_scan(f"user{user}@example.com", TIERS[user % len(TIERS)], random.choice(AGENTS),
+                         "product_search", "success", 10, 900, "10.0.0.1", "benchmark",
+                         {"search_query": "benchmark"})
+        latencies.append((time.perf_counter() - start) * 1000)
+    tracker.flush()
+    latencies.sort()
+    return statistics.mean(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ScanUsageTracker.log_scan as history grows")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='history size to grow to')
+    parser.add_argument('--steps', type=int, default=4, help='number of sizes to measure at')
+    parser.add_argument('--samples', type=int, default=1000, help='log_scan calls timed per step')
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    random.seed(42)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    checkpoints = sorted({max(args.rows // 10 ** (args.steps - 1 - i), 1) for i in range(args.steps)})
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        tracker = ScanUsageTracker(data_dir, batch_size=args.batch_size)
+        history = 0
+        print(f"📊 log_scan latency (batch_size={args.batch_size}, {args.samples} samples per step)")
+        print(f"  {'history rows':>14}  {'mean ms':>9}  {'p95 ms':>9}")
+        for target in checkpoints:
+            while history < target:
+                chunk = min(50_000, target - history)
+                tracker.import_logs(synthetic_logs(chunk, args.users, now))
+                history += chunk
+            mean_ms, p95_ms = time_log_scan(tracker, args.samples, args.users)
+            history += args.samples
+            print(f"  {history:>14,}  {mean_ms:>9.3f}  {p95_ms:>9.3f}")
+        tracker.close()
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,11 @@ Handles scan logging, tier management, and automated upgrade prompts
 """
 
 import json
+import time
+import atexit
+import sqlite3
 import datetime
+import threading
 import uuid
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -36,16 +40,136 @@ class TierLimits:
     monthly_price: float
     features: List[str]
 
+SCAN_LOG_COLUMNS = ('id', 'timestamp', 'user_email', 'user_tier', 'agent_name', 'scan_type',
+                    'outcome', 'products_found', 'processing_time_ms', 'ip_address',
+                    'user_agent', 'scan_parameters', 'error_details')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan_logs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    timestamp TEXT NOT NULL,
+    user_email TEXT NOT NULL,
+    user_tier TEXT NOT NULL,
+    agent_name TEXT,
+    scan_type TEXT,
+    outcome TEXT,
+    products_found INTEGER,
+    processing_time_ms INTEGER,
+    ip_address TEXT,
+    user_agent TEXT,
+    scan_parameters TEXT,
+    error_details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scan_logs_user_ts ON scan_logs (user_email, timestamp);
+CREATE INDEX IF NOT EXISTS idx_scan_logs_ts ON scan_logs (timestamp);
+CREATE TABLE IF NOT EXISTS usage_alerts (
+    user_email TEXT PRIMARY KEY,
+    tier TEXT,
+    usage_percentage REAL,
+    alert TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Rollups maintained by triggers in the same transaction as each inserted
+# scan, so reports read precomputed rows instead of re-aggregating the log.
+# Ignored duplicate inserts never fire the trigger.
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    day TEXT PRIMARY KEY,
+    scans INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS daily_agent_rollups (
+    day TEXT NOT NULL,
+    agent_name TEXT NOT NULL,
+    scans INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, agent_name)
+);
+CREATE TABLE IF NOT EXISTS daily_tier_user_rollups (
+    day TEXT NOT NULL,
+    user_tier TEXT NOT NULL,
+    user_email TEXT NOT NULL,
+    scans INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, user_tier, user_email)
+);
+CREATE TABLE IF NOT EXISTS user_rollups (
+    user_email TEXT PRIMARY KEY,
+    successes INTEGER NOT NULL DEFAULT 0,
+    latest_success_tier TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_user_rollups_successes ON user_rollups (successes);
+
+CREATE TRIGGER IF NOT EXISTS scan_logs_rollup AFTER INSERT ON scan_logs
+BEGIN
+    INSERT INTO daily_rollups (day, scans, successes)
+    VALUES (substr(NEW.timestamp, 1, 10), 1, NEW.outcome = 'success')
+    ON CONFLICT (day) DO UPDATE SET
+        scans = scans + 1, successes = successes + excluded.successes;
+    INSERT INTO daily_agent_rollups (day, agent_name, scans, successes)
+    VALUES (substr(NEW.timestamp, 1, 10), COALESCE(NEW.agent_name, ''), 1, NEW.outcome = 'success')
+    ON CONFLICT (day, agent_name) DO UPDATE SET
+        scans = scans + 1, successes = successes + excluded.successes;
+    INSERT INTO daily_tier_user_rollups (day, user_tier, user_email, scans)
+    VALUES (substr(NEW.timestamp, 1, 10), NEW.user_tier, NEW.user_email, 1)
+    ON CONFLICT (day, user_tier, user_email) DO UPDATE SET scans = scans + 1;
+    INSERT INTO user_rollups (user_email, successes, latest_success_tier)
+    VALUES (NEW.user_email, NEW.outcome = 'success',
+            CASE WHEN NEW.outcome = 'success' THEN NEW.user_tier END)
+    ON CONFLICT (user_email) DO UPDATE SET
+        successes = successes + excluded.successes,
+        latest_success_tier = COALESCE(excluded.latest_success_tier, latest_success_tier);
+END;
+"""
+
+ROLLUP_TABLES = ('daily_rollups', 'daily_agent_rollups', 'daily_tier_user_rollups', 'user_rollups')
+
+# Day buckets kept per user; enough to cover the longest quota period (a month)
+COUNTER_WINDOW_DAYS = 40
+
+def _normalize_timestamp(timestamp: str) -> str:
+    """Store UTC timestamps as +00:00 so string order matches time order"""
+    return timestamp.replace('Z', '+00:00')
+
 class ScanUsageTracker:
-    """Main scan usage tracking and management system"""
+    """Main scan usage tracking and management system
+
+    Scan logs live in a SQLite database (WAL mode) indexed on
+    (user_email, timestamp). log_scan buffers rows and writes them in one
+    transaction per batch, or after flush_interval seconds from a timer if
+    no further scans arrive, so a scan costs the same no matter how much
+    history there is. Daily, per-agent, per-tier and per-user rollups are
+    kept up to date by triggers for the reporting methods. An existing
+    scan_usage_log.json is imported once.
+    """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", batch_size: int = 32, flush_interval: float = 1.0):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
         self.scan_log_file = self.data_dir / "scan_usage_log.json"
+        self.scan_db_file = self.data_dir / "scan_usage.db"
         self.tier_config_file = self.data_dir / "tier_config.json"
         
+        # Group commit: pending rows are written when the batch fills or ages out
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = flush_interval
+        self._pending: List[Dict] = []
+        self._pending_since = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        
+        # Rolling quota counters: successful scans per user per UTC day,
+        # all-time totals, and (timestamp, tier) of each user's latest scan
+        self._daily_counts: Dict[str, Dict[str, int]] = {}
+        self._total_counts: Dict[str, int] = {}
+        self._latest: Dict[str, Tuple[str, str]] = {}
+        
         # Tier configurations
         self.tiers = {
             'starter': TierLimits('starter', 100, 12.0, ['5 AI agents', 'Basic support']),
@@ -56,40 +180,204 @@ class ScanUsageTracker:
             'vanguard': TierLimits('vanguard', -1, 399.0, ['Unlimited agents', 'Dedicated team', 'Custom solutions'])
         }
         
+        self.conn = sqlite3.connect(str(self.scan_db_file), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.executescript(ROLLUP_SCHEMA)
+        
+        # Databases written before the rollups existed are backfilled once
+        has_logs = self.conn.execute("SELECT 1 FROM scan_logs LIMIT 1").fetchone()
+        has_rollups = self.conn.execute("SELECT 1 FROM user_rollups LIMIT 1").fetchone()
+        if has_logs and not has_rollups:
+            self.backfill_rollups()
+        
         self.load_data()
+        self.rebuild_counters()
+        atexit.register(self.close)
     
     def load_data(self):
-        """Load existing scan data"""
+        """Load summary state and import a legacy JSON log if present"""
+        self.data = {"daily_summary": {}, "revenue_projections": {}}
         try:
+            for row in self.conn.execute("SELECT key, value FROM meta"):
+                self.data[row["key"]] = json.loads(row["value"])
             if self.scan_log_file.exists():
-                with open(self.scan_log_file, 'r') as f:
-                    self.data = json.load(f)
-            else:
-                self.data = {
-                    "scan_logs": [],
-                    "daily_summary": {},
-                    "usage_alerts": [],
-                    "revenue_projections": {}
-                }
+                self._import_json_log()
         except Exception as e:
             print(f"Error loading data: {e}")
-            self.data = {"scan_logs": [], "daily_summary": {}, "usage_alerts": [], "revenue_projections": {}}
+    
+    def _import_json_log(self):
+        """One-time migration of scan_usage_log.json into the database"""
+        with open(self.scan_log_file, 'r') as f:
+            legacy = json.load(f)
+        
+        self.import_logs(legacy.get("scan_logs", []))
+        with self._lock, self.conn:
+            for alert in legacy.get("usage_alerts", []):
+                self._store_alert(alert)
+        for key in ("daily_summary", "revenue_projections"):
+            if legacy.get(key):
+                self.data[key] = legacy[key]
+        self.save_data()
+        self.scan_log_file.rename(self.scan_log_file.with_name(self.scan_log_file.name + ".migrated"))
+    
+    def import_logs(self, logs: List[Dict]):
+        """Bulk-insert scan log dicts (same shape as ScanLog) in one transaction;
+        logs whose id is already stored are skipped, so re-imports are safe"""
+        with self._lock:
+            for log in self._insert_logs(logs, ignore_existing=True):
+                self._count_scan(log)
+    
+    def _insert_logs(self, logs: List[Dict], ignore_existing: bool = False) -> List[Dict]:
+        """Insert logs in one transaction; returns those inserted.
+        New scans use a plain INSERT so an id clash fails loudly instead of
+        dropping a scan the counters already hold."""
+        verb = "INSERT OR IGNORE" if ignore_existing else "INSERT"
+        sql = (f"{verb} INTO scan_logs ({', '.join(SCAN_LOG_COLUMNS)}) "
+               f"VALUES ({', '.join('?' for _ in SCAN_LOG_COLUMNS)})")
+        inserted = []
+        with self._lock, self.conn:
+            for log in logs:
+                if self.conn.execute(sql, self._to_row(log)).rowcount:
+                    inserted.append(log)
+        return inserted
+    
+    @staticmethod
+    def _to_row(log: Dict) -> Tuple:
+        row = dict(log)
+        row["timestamp"] = _normalize_timestamp(row["timestamp"])
+        row["scan_parameters"] = json.dumps(row.get("scan_parameters") or {})
+        row["error_details"] = json.dumps(row["error_details"]) if row.get("error_details") is not None else None
+        return tuple(row.get(column) for column in SCAN_LOG_COLUMNS)
+    
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Dict:
+        log = {column: row[column] for column in SCAN_LOG_COLUMNS}
+        log["scan_parameters"] = json.loads(log["scan_parameters"] or "{}")
+        log["error_details"] = json.loads(log["error_details"]) if log["error_details"] else None
+        return log
     
     def save_data(self):
-        """Save scan data to file"""
+        """Persist summary state (scan logs are written by flush())"""
         try:
-            with open(self.scan_log_file, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [(key, json.dumps(value)) for key, value in self.data.items()]
+                )
         except Exception as e:
             print(f"Error saving data: {e}")
     
+    def flush(self):
+        """Write buffered scans in a single transaction"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending or self.conn is None:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                self._insert_logs(pending)
+            except Exception as e:
+                self._pending = pending + self._pending
+                print(f"Error saving data: {e}")
+    
+    def close(self):
+        """Flush pending scans and close the database"""
+        with self._lock:
+            if self.conn is None:
+                return
+            self.flush()
+            self.conn.close()
+            self.conn = None
+    
+    def backfill_rollups(self):
+        """Recompute every rollup table from the full scan log"""
+        with self._lock, self.conn:
+            for table in ROLLUP_TABLES:
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.execute(
+                "INSERT INTO daily_rollups (day, scans, successes) "
+                "SELECT substr(timestamp, 1, 10), COUNT(*), SUM(outcome = 'success') "
+                "FROM scan_logs GROUP BY 1"
+            )
+            self.conn.execute(
+                "INSERT INTO daily_agent_rollups (day, agent_name, scans, successes) "
+                "SELECT substr(timestamp, 1, 10), COALESCE(agent_name, ''), COUNT(*), SUM(outcome = 'success') "
+                "FROM scan_logs GROUP BY 1, 2"
+            )
+            self.conn.execute(
+                "INSERT INTO daily_tier_user_rollups (day, user_tier, user_email, scans) "
+                "SELECT substr(timestamp, 1, 10), user_tier, user_email, COUNT(*) "
+                "FROM scan_logs GROUP BY 1, 2, 3"
+            )
+            self.conn.execute(
+                "INSERT INTO user_rollups (user_email, successes) "
+                "SELECT user_email, SUM(outcome = 'success') FROM scan_logs GROUP BY user_email"
+            )
+            # Bare user_tier comes from the MAX(seq) row: the latest successful scan
+            self.conn.execute(
+                "UPDATE user_rollups SET latest_success_tier = ("
+                "  SELECT user_tier FROM (SELECT user_email, user_tier, MAX(seq) FROM scan_logs "
+                "  WHERE outcome = 'success' GROUP BY user_email) latest "
+                "  WHERE latest.user_email = user_rollups.user_email)"
+            )
+    
+    def rebuild_counters(self):
+        """Rebuild the rolling quota counters from the scan log"""
+        cutoff = (datetime.date.today() - datetime.timedelta(days=COUNTER_WINDOW_DAYS)).isoformat()
+        with self._lock:
+            self._daily_counts = {}
+            self._total_counts = {}
+            self._latest = {}
+            for row in self.conn.execute(
+                "SELECT user_email, substr(timestamp, 1, 10) AS day, COUNT(*) AS n FROM scan_logs "
+                "WHERE outcome = 'success' AND timestamp >= ? GROUP BY user_email, day",
+                (cutoff,)
+            ):
+                self._daily_counts.setdefault(row["user_email"], {})[row["day"]] = row["n"]
+            for row in self.conn.execute(
+                "SELECT user_email, COUNT(*) AS n FROM scan_logs "
+                "WHERE outcome = 'success' GROUP BY user_email"
+            ):
+                self._total_counts[row["user_email"]] = row["n"]
+            # SQLite takes the bare user_tier from the MAX(timestamp) row
+            for row in self.conn.execute(
+                "SELECT user_email, user_tier, MAX(timestamp) AS ts FROM scan_logs GROUP BY user_email"
+            ):
+                self._latest[row["user_email"]] = (row["ts"], row["user_tier"])
+            for log in self._pending:
+                self._count_scan(log)
+    
+    def _count_scan(self, log: Dict):
+        """Fold one scan into the rolling counters (caller holds the lock)"""
+        email = log["user_email"]
+        timestamp = _normalize_timestamp(log["timestamp"])
+        latest = self._latest.get(email)
+        if latest is None or timestamp >= latest[0]:
+            self._latest[email] = (timestamp, log["user_tier"])
+        
+        if log["outcome"] != "success":
+            return
+        self._total_counts[email] = self._total_counts.get(email, 0) + 1
+        days = self._daily_counts.setdefault(email, {})
+        day = timestamp[:10]
+        days[day] = days.get(day, 0) + 1
+        if len(days) > COUNTER_WINDOW_DAYS:
+            cutoff = (datetime.date.today() - datetime.timedelta(days=COUNTER_WINDOW_DAYS)).isoformat()
+            for old in [d for d in days if d < cutoff]:
+                del days[old]
+    
     def log_scan(self, user_email: str, user_tier: str, agent_name: str, 
                  scan_type: str, outcome: str, products_found: int,
                  processing_time_ms: int, ip_address: str, user_agent: str,
                  scan_parameters: Dict, error_details: Optional[Dict] = None) -> str:
         """Log a new scan"""
         
-        scan_id = f"scan_{uuid.uuid4().hex[:8]}"
+        scan_id = f"scan_{uuid.uuid4().hex}"
         timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
         
         scan_log = ScanLog(
@@ -108,14 +396,30 @@ class ScanUsageTracker:
             error_details=error_details
         )
         
-        self.data["scan_logs"].append(asdict(scan_log))
-        self.save_data()
+        with self._lock:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(asdict(scan_log))
+            self._count_scan(self._pending[-1])
+            if (len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._pending_since >= self.flush_interval):
+                self.flush()
+            elif self._flush_timer is None:
+                # An idle process still writes the batch once it ages out
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
         
         # Check if user is approaching limits
         self.check_usage_alerts(user_email)
         
         return scan_id
     
+    def _latest_tier(self, user_email: str) -> Optional[str]:
+        """Tier recorded on the user's most recent scan, or None for a new user"""
+        latest = self._latest.get(user_email)
+        return latest[1] if latest else None
+    
     def get_user_scan_count(self, user_email: str, period: str = "monthly") -> int:
         """Get user's scan count for specified period"""
         today = datetime.date.today()
@@ -129,25 +433,35 @@ class ScanUsageTracker:
         else:
             start_date = datetime.date(1970, 1, 1)
         
-        count = 0
-        for log in self.data["scan_logs"]:
-            if log["user_email"] == user_email and log["outcome"] == "success":
-                log_date = datetime.datetime.fromisoformat(log["timestamp"].replace('Z', '+00:00')).date()
-                if log_date >= start_date:
-                    count += 1
+        if period not in ("monthly", "daily", "weekly"):
+            return self._total_counts.get(user_email, 0)
         
-        return count
+        # At most COUNTER_WINDOW_DAYS buckets per user, independent of log size
+        start = start_date.isoformat()
+        with self._lock:
+            days = self._daily_counts.get(user_email, {})
+            return sum(count for day, count in days.items() if day >= start)
+    
+    def _store_alert(self, alert: Dict):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO usage_alerts (user_email, tier, usage_percentage, alert) "
+            "VALUES (?, ?, ?, ?)",
+            (alert["user_email"], alert["tier"], alert["usage_percentage"], json.dumps(alert))
+        )
+    
+    def get_usage_alerts(self) -> List[Dict]:
+        """Latest alert for every user that has one"""
+        with self._lock:
+            rows = self.conn.execute("SELECT alert FROM usage_alerts").fetchall()
+        return [json.loads(row["alert"]) for row in rows]
     
     def check_usage_alerts(self, user_email: str) -> Optional[Dict]:
         """Check if user needs usage alerts"""
         # Get user's current tier and usage
-        user_logs = [log for log in self.data["scan_logs"] if log["user_email"] == user_email]
-        if not user_logs:
+        user_tier = self._latest_tier(user_email)
+        if user_tier is None:
             return None
         
-        latest_log = max(user_logs, key=lambda x: x["timestamp"])
-        user_tier = latest_log["user_tier"]
-        
         if user_tier not in self.tiers:
             return None
         
@@ -207,11 +521,9 @@ class ScanUsageTracker:
             }
         
         if alert:
-            # Update alerts in data
-            existing_alerts = [a for a in self.data["usage_alerts"] if a["user_email"] != user_email]
-            existing_alerts.append(alert)
-            self.data["usage_alerts"] = existing_alerts
-            self.save_data()
+            # Replace the user's previous alert
+            with self._lock, self.conn:
+                self._store_alert(alert)
         
         return alert
     
@@ -240,13 +552,10 @@ class ScanUsageTracker:
     def can_user_scan(self, user_email: str) -> Tuple[bool, Optional[str]]:
         """Check if user can perform a scan"""
         # Get user's current tier
-        user_logs = [log for log in self.data["scan_logs"] if log["user_email"] == user_email]
-        if not user_logs:
+        user_tier = self._latest_tier(user_email)
+        if user_tier is None:
             return True, None  # New user, allow scan
         
-        latest_log = max(user_logs, key=lambda x: x["timestamp"])
-        user_tier = latest_log["user_tier"]
-        
         if user_tier not in self.tiers:
             return False, "Invalid user tier"
         
@@ -270,52 +579,58 @@ class ScanUsageTracker:
         
         date_str = date.isoformat()
         
-        # Filter logs for the day
-        day_logs = []
-        for log in self.data["scan_logs"]:
-            log_date = datetime.datetime.fromisoformat(log["timestamp"].replace('Z', '+00:00')).date()
-            if log_date == date:
-                day_logs.append(log)
+        # Precomputed rollups for the day
+        self.flush()
+        with self._lock:
+            day = self.conn.execute(
+                "SELECT scans, successes FROM daily_rollups WHERE day = ?", (date_str,)
+            ).fetchone()
+            agents = self.conn.execute(
+                "SELECT agent_name, scans, successes FROM daily_agent_rollups "
+                "WHERE day = ? ORDER BY scans DESC, agent_name LIMIT 5",
+                (date_str,)
+            ).fetchall()
+            tiers = {row["user_tier"]: row for row in self.conn.execute(
+                "SELECT user_tier, COUNT(*) AS users, SUM(scans) AS scans FROM daily_tier_user_rollups "
+                "WHERE day = ? GROUP BY user_tier",
+                (date_str,)
+            )}
+            unique_users = self.conn.execute(
+                "SELECT COUNT(DISTINCT user_email) FROM daily_tier_user_rollups WHERE day = ?",
+                (date_str,)
+            ).fetchone()[0]
+            near_limit = dict(self.conn.execute(
+                "SELECT tier, COUNT(*) FROM usage_alerts WHERE usage_percentage >= 75 GROUP BY tier"
+            ).fetchall())
         
         # Calculate summary stats
-        total_scans = len(day_logs)
-        successful_scans = len([log for log in day_logs if log["outcome"] == "success"])
+        total_scans = day["scans"] if day else 0
+        successful_scans = day["successes"] if day else 0
         failed_scans = total_scans - successful_scans
-        unique_users = len(set(log["user_email"] for log in day_logs))
         
         # Top agents
-        agent_usage = {}
-        for log in day_logs:
-            agent = log["agent_name"]
-            if agent not in agent_usage:
-                agent_usage[agent] = {"count": 0, "successes": 0}
-            agent_usage[agent]["count"] += 1
-            if log["outcome"] == "success":
-                agent_usage[agent]["successes"] += 1
-        
         top_agents = []
-        for agent, stats in sorted(agent_usage.items(), key=lambda x: x[1]["count"], reverse=True)[:5]:
-            success_rate = (stats["successes"] / stats["count"]) * 100 if stats["count"] > 0 else 0
+        for agent in agents:
+            success_rate = (agent["successes"] / agent["scans"]) * 100 if agent["scans"] > 0 else 0
             top_agents.append({
-                "name": agent,
-                "usage_count": stats["count"],
+                "name": agent["agent_name"],
+                "usage_count": agent["scans"],
                 "success_rate": round(success_rate, 1)
             })
         
         # Tier usage
         tier_usage = {}
         for tier in self.tiers.keys():
-            tier_logs = [log for log in day_logs if log["user_tier"] == tier]
-            unique_tier_users = len(set(log["user_email"] for log in tier_logs))
-            total_tier_scans = len(tier_logs)
+            row = tiers.get(tier)
+            unique_tier_users = row["users"] if row else 0
+            total_tier_scans = row["scans"] if row else 0
             avg_scans = total_tier_scans / unique_tier_users if unique_tier_users > 0 else 0
             
             tier_usage[tier] = {
                 "users": unique_tier_users,
                 "total_scans": total_tier_scans,
                 "avg_scans_per_user": round(avg_scans, 1),
-                "users_near_limit": len([alert for alert in self.data["usage_alerts"] 
-                                       if alert["tier"] == tier and alert["usage_percentage"] >= 75])
+                "users_near_limit": near_limit.get(tier, 0)
             }
         
         summary = {
@@ -336,23 +651,18 @@ class ScanUsageTracker:
     
     def get_top_users(self, limit: int = 10) -> List[Dict]:
         """Get top users by scan count"""
-        user_stats = {}
-        
-        for log in self.data["scan_logs"]:
-            if log["outcome"] == "success":
-                email = log["user_email"]
-                if email not in user_stats:
-                    user_stats[email] = {
-                        "email": email,
-                        "tier": log["user_tier"],
-                        "scan_count": 0
-                    }
-                user_stats[email]["scan_count"] += 1
-                user_stats[email]["tier"] = log["user_tier"]  # Keep latest tier
-        
-        # Sort by scan count and add usage percentage
+        self.flush()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT user_email, latest_success_tier, successes FROM user_rollups "
+                "WHERE successes > 0 ORDER BY successes DESC, user_email LIMIT ?",
+                (limit,)
+            ).fetchall()
+        
+        # Add usage percentage
         top_users = []
-        for user in sorted(user_stats.values(), key=lambda x: x["scan_count"], reverse=True)[:limit]:
+        for row in rows:
+            user = {"email": row["user_email"], "tier": row["latest_success_tier"], "scan_count": row["successes"]}
             tier_limit = self.tiers[user["tier"]].scan_limit
             usage_percentage = 0 if tier_limit == -1 else (user["scan_count"] / tier_limit) * 100
             
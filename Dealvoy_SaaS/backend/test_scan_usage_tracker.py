@@ -0,0 +1,164 @@
+# test_scan_usage_tracker.py
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scan_usage_tracker import ScanUsageTracker
+
+USERS = [f"user{i}@example.com" for i in range(6)]
+TIERS = ["starter", "pro", "enterprise", "titan"]
+
+
+def make_logs(count, now):
+    rng = random.Random(7)
+    logs = []
+    for i in range(count):
+        logs.append({
+            "id": f"scan_{i:06d}",
+            "timestamp": (now - datetime.timedelta(minutes=rng.randrange(70 * 24 * 60))).isoformat(),
+            "user_email": rng.choice(USERS),
+            "user_tier": rng.choice(TIERS),
+            "agent_name": "DealFinderAI",
+            "scan_type": "product_search",
+            "outcome": "success" if rng.random() < 0.8 else "error",
+            "products_found": 1,
+            "processing_time_ms": 100,
+            "ip_address": "127.0.0.1",
+            "user_agent": "pytest",
+            "scan_parameters": {},
+        })
+    return logs
+
+
+def scan_based_count(logs, user_email, period):
+    """The original linear-scan implementation of get_user_scan_count"""
+    today = datetime.date.today()
+    if period == "monthly":
+        start_date = today.replace(day=1)
+    elif period == "daily":
+        start_date = today
+    elif period == "weekly":
+        start_date = today - datetime.timedelta(days=7)
+    else:
+        start_date = datetime.date(1970, 1, 1)
+
+    count = 0
+    for log in logs:
+        if log["user_email"] == user_email and log["outcome"] == "success":
+            log_date = datetime.datetime.fromisoformat(log["timestamp"].replace('Z', '+00:00')).date()
+            if log_date >= start_date:
+                count += 1
+    return count
+
+
+def scan_based_tier(logs, user_email):
+    user_logs = [log for log in logs if log["user_email"] == user_email]
+    return max(user_logs, key=lambda x: x["timestamp"])["user_tier"] if user_logs else None
+
+
+def assert_counts_match(tracker, logs):
+    for email in USERS + ["new@example.com"]:
+        for period in ("daily", "weekly", "monthly", "all"):
+            assert tracker.get_user_scan_count(email, period) == scan_based_count(logs, email, period)
+        assert tracker._latest_tier(email) == scan_based_tier(logs, email)
+
+
+def test_rolling_counters_match_scan_based_counts(tmp_path):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    logs = make_logs(3000, now)
+
+    tracker = ScanUsageTracker(str(tmp_path), batch_size=8)
+    tracker.import_logs(logs)
+    for i in range(20):
+        tracker.log_scan(USERS[i % 3], "starter", "DealFinderAI", "product_search",
+                         "success" if i % 4 else "error", 1, 100, "127.0.0.1", "pytest", {})
+    tracker.flush()
+    logged = [dict(row) for row in tracker.conn.execute("SELECT * FROM scan_logs")]
+    assert_counts_match(tracker, logged)
+
+    # Counters rebuilt from the database on startup agree as well
+    tracker.close()
+    reopened = ScanUsageTracker(str(tmp_path))
+    assert_counts_match(reopened, logged)
+    reopened.close()
+
+
+def test_can_user_scan_uses_latest_tier_limit(tmp_path):
+    tracker = ScanUsageTracker(str(tmp_path))
+    assert tracker.can_user_scan("fresh@example.com") == (True, None)
+
+    for _ in range(100):
+        tracker.log_scan("busy@example.com", "starter", "DealFinderAI", "product_search",
+                         "success", 1, 100, "127.0.0.1", "pytest", {})
+    allowed, message = tracker.can_user_scan("busy@example.com")
+    assert not allowed and "100" in message
+
+    tracker.log_scan("busy@example.com", "titan", "DealFinderAI", "product_search",
+                     "success", 1, 100, "127.0.0.1", "pytest", {})
+    assert tracker.can_user_scan("busy@example.com") == (True, None)
+    tracker.close()
+
+
+def test_rollups_match_full_aggregation(tmp_path):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    logs = make_logs(2000, now)
+    tracker = ScanUsageTracker(str(tmp_path))
+    tracker.import_logs(logs)
+    tracker.import_logs(logs[:10])  # duplicates are ignored and not double counted
+    assert_counts_match(tracker, logs)
+
+    day = now.date() - datetime.timedelta(days=3)
+    day_logs = [log for log in logs if log["timestamp"][:10] == day.isoformat()]
+    summary = tracker.generate_daily_summary(day)
+    assert summary["total_scans"] == len(day_logs)
+    assert summary["successful_scans"] == sum(log["outcome"] == "success" for log in day_logs)
+    assert summary["unique_users"] == len({log["user_email"] for log in day_logs})
+    for tier in TIERS:
+        tier_logs = [log for log in day_logs if log["user_tier"] == tier]
+        assert summary["tier_usage"][tier]["total_scans"] == len(tier_logs)
+        assert summary["tier_usage"][tier]["users"] == len({log["user_email"] for log in tier_logs})
+
+    top_users = tracker.get_top_users(3)
+    for user in top_users:
+        successes = [log for log in logs if log["user_email"] == user["email"] and log["outcome"] == "success"]
+        assert user["scan_count"] == len(successes)
+        assert user["tier"] == successes[-1]["user_tier"]
+
+    # A full backfill produces the same aggregates as the incremental triggers
+    tracker.backfill_rollups()
+    assert tracker.generate_daily_summary(day) == summary
+    assert tracker.get_top_users(3) == top_users
+    tracker.close()
+
+
+def test_idle_batch_is_flushed_by_timer(tmp_path):
+    tracker = ScanUsageTracker(str(tmp_path), batch_size=100, flush_interval=0.1)
+    scan_id = tracker.log_scan("idle@example.com", "starter", "DealFinderAI", "product_search",
+                               "success", 1, 100, "127.0.0.1", "pytest", {})
+    assert len(scan_id) == len("scan_") + 32
+
+    # no further log_scan call; the timer writes the batch on its own
+    deadline = time.monotonic() + 5
+    while tracker._pending and time.monotonic() < deadline:
+        time.sleep(0.02)
+    reader = sqlite3.connect(str(tmp_path / "scan_usage.db"))
+    assert reader.execute("SELECT id FROM scan_logs").fetchall() == [(scan_id,)]
+    reader.close()
+    tracker.close()
+
+
+def test_new_scan_with_existing_id_is_not_silently_dropped(tmp_path):
+    tracker = ScanUsageTracker(str(tmp_path))
+    log = make_logs(1, datetime.datetime.now(datetime.timezone.utc))[0]
+    tracker.import_logs([log])
+    with pytest.raises(sqlite3.IntegrityError):
+        tracker._insert_logs([log])
+    tracker.close()
@@ -1,7 +1,14 @@
-from app import time
-from app import cloudscraper
-from app.bs4 import BeautifulSoup
-from app.requests.exceptions import HTTPError
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import cloudscraper
+from requests.exceptions import HTTPError
+
+from app.http_utils import HostRateLimiter
+from app.html_parser import parse_html
+from app.shared.upc_service import CsvUPCService
+from app.settings import AMAZON_DETAIL_WORKERS, AMAZON_DETAIL_RATE, AMAZON_DETAIL_BURST
 
 # Create a cloudscraper session
 _scraper = cloudscraper.create_scraper()
@@ -15,6 +22,12 @@ _scraper.headers.update({
     "Referer": "https://www.amazon.com/",
 })
 
+# Search and detail pages only need select/select_one/get_text, so use the fast parser
+PARSER_BACKEND = "selectolax"
+
+# Spaces detail-page requests across the enrichment workers
+detail_rate_limiter = HostRateLimiter(rate=AMAZON_DETAIL_RATE, burst=AMAZON_DETAIL_BURST, jitter=0.3)
+
 def fetch_search_page(query, page=1, retries=3):
     url = f"https://www.amazon.com/s?k={query}&page={page}"
     for attempt in range(1, retries + 1):
@@ -23,9 +36,10 @@ def fetch_search_page(query, page=1, retries=3):
         snippet = resp.text[:200].replace("\n", " ")
         print(f"🔍 [DEBUG] HTML snippet: {snippet}…\n")
         resp.raise_for_status()
-        return BeautifulSoup(resp.text, "html.parser")
-def get_total_pages(query):
-    soup = fetch_search_page(query, 1)
+        return parse_html(resp.text, PARSER_BACKEND)
+def get_total_pages(query, soup=None):
+    # pass the page-1 soup when you already have it to skip a second fetch
+    soup = soup or fetch_search_page(query, 1)
     nodes = soup.select("ul.a-pagination li.a-normal a")
     nums  = [int(a.text) for a in nodes if a.text.isdigit()]
     return max(nums) if nums else 1
@@ -69,7 +83,7 @@ def fetch_detail_page(path, retries=2):
         try:
             r = _scraper.get(url, timeout=8)
             r.raise_for_status()
-            return BeautifulSoup(r.text, "html.parser")
+            return parse_html(r.text, PARSER_BACKEND)
         except HTTPError as e:
             code = getattr(e.response, "status_code", None)
             if code in (429, 503) and attempt < retries:
@@ -98,29 +112,159 @@ def extract_upc(detail_soup):
                 return digits
     return None
 
-def scrape_amazon(query, max_pages=None):
+def detail_upc(path):
+    """
+    Rate-limited detail-page fetch + UPC extraction, run on the enrichment pool.
+    Returns (upc, fetched); fetched is False when the page could not be loaded.
+    """
+    url = "https://www.amazon.com" + path
+    detail_rate_limiter.acquire(url)
+    try:
+        soup = fetch_detail_page(path)
+    except Exception as e:
+        print(f"     ⚠️ detail page failed ({path[:40]}…): {e!r}")
+        return None, False
+    return extract_upc(soup), soup is not None
+
+def new_run_stats():
+    return {"search_pages": 0, "detail_fetched": 0, "detail_skipped": 0, "upcs_found": 0, "pages_saved": 0,
+            "max_pages": None}
+
+def iter_search_pages(query, max_pages=None, run=None, start_page=1):
+    """
+    Yield (page, hits) for each search results page from `start_page`,
+    stopping at the first empty page. Page 1 is fetched once, for both the
+    page count and its hits. The page count ends up in run["max_pages"].
+    """
+    run = run if run is not None else new_run_stats()
+    first = None
+    if start_page == 1 or max_pages is None:
+        first = fetch_search_page(query, 1)
+        run["search_pages"] += 1
     if max_pages is None:
-        max_pages = get_total_pages(query)
+        max_pages = get_total_pages(query, first)
+        run["pages_saved"] += 1
         print(f"ℹ️ Detected {max_pages} pages for '{query}'")
+    run["max_pages"] = max_pages
 
-    results = []
-    for page in range(1, max_pages+1):
+    for page in range(start_page, max_pages+1):
         print(f"➡️ Fetching page {page}/{max_pages}")
-        soup = fetch_search_page(query, page)
+        if page == 1:
+            soup = first
+        else:
+            soup = fetch_search_page(query, page)
+            run["search_pages"] += 1
         hits = parse_search_results(soup)
         print(f"   🔍 Found {len(hits)} items on page {page}")
         if not hits:
             break
+        yield page, hits
+
+        if page < max_pages:
+            time.sleep(random.uniform(1.0,2.0))
+
+def enrich_hits(hits, upc_service, pool, run, failed=None):
+    """
+    Fill in prod["upc"] for one page of hits. ASINs already in the UPC cache
+    skip the detail page; the rest are fetched on `pool`, and newly found
+    UPCs are saved back to the cache. Detail pages that could not be loaded
+    are recorded in `failed` (asin -> path) when given. Returns the hits.
+    """
+    known = upc_service.lookup_many(p["asin"] for p in hits)
+    pending = {}
+    for prod in hits:
+        path = prod.pop("detail_path")
+        if prod["asin"] in known:
+            prod["upc"] = known[prod["asin"]]
+        else:
+            pending[prod["asin"]] = (path, pool.submit(detail_upc, path))
+    for prod in hits:
+        if prod["asin"] in pending:
+            path, future = pending[prod["asin"]]
+            prod["upc"], fetched = future.result()
+            if not fetched and failed is not None:
+                failed[prod["asin"]] = path
+
+    run["detail_skipped"] += len(hits) - len(pending)
+    run["detail_fetched"] += len(pending)
+    run["pages_saved"] += len(hits) - len(pending)
+    learned = [p for p in hits if p["asin"] in pending and p["upc"]]
+    run["upcs_found"] += len(learned)
+    if learned:
+        upc_service.update_cache(learned)
+
+    for idx, prod in enumerate(hits, start=1):
+        src = "cached" if prod["asin"] not in pending else "detail"
+        print(f"     [{idx}/{len(hits)}] {prod['asin']} → UPC={prod['upc'] or '–'} ({src})")
+    return hits
+
+def print_run_stats(run, total):
+    print(f"🏁 Completed scrape: {total} total items")
+    print(f"📊 Detail pages fetched {run['detail_fetched']}, skipped {run['detail_skipped']} (UPC known), "
+          f"new UPCs {run['upcs_found']}, requests saved {run['pages_saved']}\n")
+
+def retry_pending_details(checkpoint, results, upc_service, pool, run):
+    """Re-fetch detail pages a previous attempt could not load."""
+    futures = {asin: pool.submit(detail_upc, path) for asin, path in checkpoint.pending.items()}
+    learned = []
+    for asin, future in futures.items():
+        upc, fetched = future.result()
+        run["detail_fetched"] += 1
+        if not fetched:
+            continue
+        del checkpoint.pending[asin]
+        if asin in results:
+            results[asin]["upc"] = upc
+            if upc:
+                learned.append(results[asin])
+    run["upcs_found"] += len(learned)
+    if learned:
+        upc_service.update_cache(learned)
+    print(f"↩️ Retried {len(futures)} detail pages, {len(checkpoint.pending)} still failing")
+
+def scrape_amazon(query, max_pages=None, upc_service=None, workers=AMAZON_DETAIL_WORKERS, stats=None,
+                  checkpoint=None):
+    """
+    Scrape search results for `query` and enrich each product with its UPC.
+    Detail pages are fetched on `workers` threads, rate limited per host
+    (see enrich_hits). Pass a dict as `stats` to receive the run counters.
 
-        for idx, prod in enumerate(hits, start=1):
-            time.sleep(random.uniform(0.3,0.6))
-            dsoup = fetch_detail_page(prod["detail_path"])
-            prod["upc"] = extract_upc(dsoup)
-            del prod["detail_path"]
-            results.append(prod)
-            print(f"     [{idx}/{len(hits)}] {prod['asin']} → UPC={prod['upc'] or '–'}")
+    With a checkpoint (app.checkpoint.checkpoint_for) progress is saved after
+    every page: a failed run called again with the same checkpoint skips the
+    pages it already finished and retries detail pages that failed to load.
+    A completed run marks the checkpoint done (calling again returns its
+    items); the caller discards it after writing the output. Products are
+    unique by ASIN. For an incremental scrape -> export run see app.pipeline.
+    """
+    if checkpoint is not None and checkpoint.done:
+        return list(checkpoint.items.values())
+    upc_service = upc_service or CsvUPCService()
+    run = new_run_stats()
+    results = {}
+    start_page = 1
+    if checkpoint is not None and checkpoint.resumed:
+        results = dict(checkpoint.items)
+        max_pages = checkpoint.state.get("max_pages", max_pages)
+        start_page = checkpoint.state.get("last_page", 0) + 1
+        print(f"↩️ Resuming '{query}' at page {start_page} ({len(results)} items so far)")
 
-        time.sleep(random.uniform(1.0,2.0))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if checkpoint is not None and checkpoint.pending:
+            retry_pending_details(checkpoint, results, upc_service, pool, run)
+        for page, hits in iter_search_pages(query, max_pages, run, start_page):
+            failed = {}
+            for prod in enrich_hits(hits, upc_service, pool, run, failed):
+                results.setdefault(prod["asin"], prod)
+            if checkpoint is not None:
+                checkpoint.items = results
+                checkpoint.pending.update(failed)
+                checkpoint.state.update(last_page=page, max_pages=run["max_pages"])
+                checkpoint.save()
 
-    print(f"🏁 Completed scrape: {len(results)} total items\n")
-    return results
+    if checkpoint is not None:
+        checkpoint.items = results
+        checkpoint.mark_done()
+    print_run_stats(run, len(results))
+    if stats is not None:
+        stats.update(run)
+    return list(results.values())
@@ -1,13 +1,15 @@
 # amazon_selenium.py
 
-from app import time
-from app import cloudscraper
-from app.bs4 import BeautifulSoup
-from app import undetected_chromedriver
-from app.selenium.webdriver.common.by import By
-from app.selenium.webdriver.support.ui import WebDriverWait
-from app.selenium.webdriver.support import expected_conditions as EC
-from app.concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+import random
+import cloudscraper
+import undetected_chromedriver as uc
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app.browser_pool import get_browser_pool
 
 # ─── Browser Launcher ────────────────────────────────────────────────────────────
 def launch_browser(headless=True):
@@ -25,6 +27,10 @@ def launch_browser(headless=True):
     )
     return uc.Chrome(options=opts)
 
+def browser_pool():
+    """Warm headless drivers shared across runs instead of one launch per run."""
+    return get_browser_pool(launch_browser)
+
 # ─── UPC Fetch via Cloudsraper (fast, no JS) ────────────────────────────────────
 _scraper = cloudscraper.create_scraper()
 
@@ -60,13 +66,32 @@ def fetch_upc_cloudscraper(url):
 
 # ─── Main Scraper ────────────────────────────────────────────────────────────────
 def scrape_amazon_browser(query, max_pages=1, upc_workers=5):
-    driver = launch_browser(headless=True)
+    with browser_pool().lease() as browser:
+        items = _collect_search_items(browser, query, max_pages)
+    print(f"🏁 Collected {len(items)} items—proceeding to UPC fetch…")
+
+    # ─── Parallel UPC Fetching ──────────────────────────────────────────────────
+    with ThreadPoolExecutor(max_workers=upc_workers) as exe:
+        futures = {exe.submit(fetch_upc_cloudscraper, it["href"]): it for it in items}
+        for fut in as_completed(futures):
+            it = futures[fut]
+            try:
+                upc = fut.result(timeout=15)
+            except:
+                upc = None
+            it["upc"] = upc
+
+    # now items each have asin, title, price, href, upc
+    return items
+
+def _collect_search_items(browser, query, max_pages):
+    driver = browser.driver
     items = []  # will hold dicts: asin,title,price,href
 
     for page in range(1, max_pages + 1):
         url = f"https://www.amazon.com/s?k={query}&page={page}"
         print(f"➡️ Browsing page {page}/{max_pages}")
-        driver.get(url)
+        browser.get(url)
 
         # wait for any product card
         try:
@@ -135,20 +160,4 @@ def scrape_amazon_browser(query, max_pages=1, upc_workers=5):
 
         time.sleep(random.uniform(1.0, 2.0))
 
-    driver.quit()
-    print(f"🏁 Collected {len(items)} items—proceeding to UPC fetch…")
-
-    # ─── Parallel UPC Fetching ──────────────────────────────────────────────────
-    with ThreadPoolExecutor(max_workers=upc_workers) as exe:
-        futures = {exe.submit(fetch_upc_cloudscraper, it["href"]): it for it in items}
-        for fut in as_completed(futures):
-            it = futures[fut]
-            try:
-                upc = fut.result(timeout=15)
-            except:
-                upc = None
-            it["upc"] = upc
-
-    # now items each have asin, title, price, href, upc
     return items
-
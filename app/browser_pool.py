@@ -0,0 +1,249 @@
+# app/browser_pool.py
+#
+# Pool of warm headless browser drivers (the Desktop release imports this
+# module through source_scrapers/browser_pool.py). Drivers are checked
+# out/returned, health-checked, and recycled after a number of pages or
+# when their memory footprint grows.
+
+import os
+import time
+import atexit
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import psutil
+except ImportError:  # memory-based recycling is skipped without psutil
+    psutil = None
+
+class PooledDriver:
+    """A pooled driver plus the bookkeeping used to decide when to recycle it"""
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.created_at = time.time()
+        self.pages = 0
+        self.baseline_mb = None
+
+    def get(self, url: str):
+        """Load a page and count it against this driver's page budget"""
+        self.driver.get(url)
+        self.pages += 1
+
+    @property
+    def page_source(self) -> str:
+        return self.driver.page_source
+
+class BrowserPool:
+    """
+    Fixed-size pool of browser drivers created lazily by `factory`.
+
+    Args:
+        factory: Zero-argument callable returning a new driver
+        size: Maximum number of live drivers
+        max_pages: Recycle a driver after this many page loads
+        max_memory_growth_mb: Recycle a driver whose browser process tree grew
+                              by more than this since its first page (needs psutil)
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2, max_pages: int = 50,
+                 max_memory_growth_mb: float = 300.0):
+        self.factory = factory
+        self.size = max(int(size), 1)
+        self.max_pages = max_pages
+        self.max_memory_growth_mb = max_memory_growth_mb
+
+        self._idle = deque()
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._metrics = {
+            'checkouts': 0,
+            'created': 0,
+            'recycled': 0,
+            'unhealthy': 0,
+            'total_wait': 0.0,
+            'max_wait': 0.0,
+            'retired_pages': 0,
+            'retired_drivers': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Health and memory
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_healthy(pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _memory_mb(pooled: PooledDriver) -> Optional[float]:
+        """RSS of the chromedriver process and its children (the browser)"""
+        if psutil is None:
+            return None
+        try:
+            pid = pooled.driver.service.process.pid
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def _should_recycle(self, pooled: PooledDriver) -> bool:
+        if pooled.pages >= self.max_pages:
+            return True
+        memory = self._memory_mb(pooled)
+        if memory is None:
+            return False
+        if pooled.baseline_mb is None:
+            pooled.baseline_mb = memory
+            return False
+        return memory - pooled.baseline_mb > self.max_memory_growth_mb
+
+    def _retire(self, pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._live -= 1
+            self._metrics['retired_pages'] += pooled.pages
+            self._metrics['retired_drivers'] += 1
+            self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Take a driver from the pool, starting one if there is spare capacity"""
+        start = time.time()
+        deadline = None if timeout is None else start + timeout
+        create = False
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("BrowserPool is closed")
+                if self._idle:
+                    pooled = self._idle.popleft()
+                    break
+                if self._live < self.size:
+                    self._live += 1
+                    create = True
+                    pooled = None
+                    break
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a browser")
+                self._cond.wait(remaining)
+
+        if create:
+            try:
+                pooled = PooledDriver(self.factory())
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._metrics['created'] += 1
+        elif not self._is_healthy(pooled):
+            with self._cond:
+                self._metrics['unhealthy'] += 1
+            self._retire(pooled)
+            remaining = None if deadline is None else max(deadline - time.time(), 0)
+            return self.checkout(remaining)
+
+        waited = time.time() - start
+        with self._cond:
+            self._metrics['checkouts'] += 1
+            self._metrics['total_wait'] += waited
+            self._metrics['max_wait'] = max(self._metrics['max_wait'], waited)
+        return pooled
+
+    def checkin(self, pooled: PooledDriver, broken: bool = False):
+        """Return a driver; it is quit instead if broken or due for recycling"""
+        if broken or self._closed or self._should_recycle(pooled):
+            if not broken:
+                with self._cond:
+                    self._metrics['recycled'] += 1
+            self._retire(pooled)
+            return
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """with pool.lease() as browser: browser.get(url); html = browser.page_source"""
+        pooled = self.checkout(timeout)
+        broken = False
+        try:
+            yield pooled
+        except Exception:
+            broken = not self._is_healthy(pooled)
+            raise
+        finally:
+            self.checkin(pooled, broken=broken)
+
+    # ------------------------------------------------------------------
+    # Reporting / shutdown
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            m = dict(self._metrics)
+            live_pages = sum(p.pages for p in self._idle)
+            idle = len(self._idle)
+            live = self._live
+        drivers_seen = m['retired_drivers'] + idle
+        return {
+            'size': self.size,
+            'live': live,
+            'idle': idle,
+            'in_use': live - idle,
+            'checkouts': m['checkouts'],
+            'created': m['created'],
+            'recycled': m['recycled'],
+            'unhealthy': m['unhealthy'],
+            'avg_wait_ms': round(m['total_wait'] / m['checkouts'] * 1000, 2) if m['checkouts'] else 0.0,
+            'max_wait_ms': round(m['max_wait'] * 1000, 2),
+            'pages_per_driver': round((m['retired_pages'] + live_pages) / drivers_seen, 2) if drivers_seen else 0.0,
+        }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for pooled in idle:
+            self._retire(pooled)
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_browser_pool(factory: Callable[[], Any]) -> BrowserPool:
+    """
+    Process-wide pool shared by all Selenium scrapers.
+    DEALVOY_BROWSER_POOL_SIZE  - number of warm drivers (default 2)
+    DEALVOY_BROWSER_MAX_PAGES  - page loads before a driver is recycled (default 50)
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool(
+                factory,
+                size=int(os.getenv('DEALVOY_BROWSER_POOL_SIZE', '2')),
+                max_pages=int(os.getenv('DEALVOY_BROWSER_MAX_PAGES', '50')),
+            )
+            atexit.register(_default_pool.close)
+        return _default_pool
@@ -0,0 +1,121 @@
+# app/checkpoint.py
+#
+# Resumable multi-page scrapes. A ScrapeCheckpoint holds one run's progress
+# (cursor state such as the last completed page, the items collected so
+# far keyed by ASIN, and detail pages still to fetch) and is rewritten
+# atomically after every page. Running the same scrape again with the same
+# parameters picks the file up and continues where the last attempt stopped.
+#
+#   cp = checkpoint_for("amazon_search", query="lego", max_pages=30)
+#   items = scrape_amazon("lego", max_pages=30, checkpoint=cp)
+#   write_rows_csv("lego.csv", items, ["asin", "title", "price", "upc"], key="asin")
+#   cp.discard()   # only once the output is safely written
+
+import os
+import csv
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.settings import SCRAPE_CHECKPOINT_DIR
+
+
+def _atomic_write(path: str, write) -> None:
+    """Write via a temp file + os.replace so a crash never leaves a half-written file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # unique per writer, so two runs on the same checkpoint never share a temp file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ScrapeCheckpoint:
+    """
+    Progress of one scrape run, persisted as JSON.
+
+    state:   cursor data owned by the scraper (last page, next URL, ...)
+    items:   collected items keyed by their id, so re-adding a page is a no-op
+    pending: id -> detail URL still to fetch (e.g. failed on a transient block)
+    """
+
+    def __init__(self, path: str, kind: str = "", params: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.kind = kind
+        self.params = params or {}
+        self.state: Dict[str, Any] = {}
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.pending: Dict[str, str] = {}
+        self.done = False
+        self.resumed = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.state = data.get("state", {})
+            self.items = data.get("items", {})
+            self.pending = data.get("pending", {})
+            self.done = data.get("done", False)
+            self.resumed = True
+
+    def add_items(self, items: Iterable[Dict[str, Any]], key: str) -> None:
+        for item in items:
+            self.items[str(item[key])] = item
+
+    def save(self) -> None:
+        data = {
+            "kind": self.kind,
+            "params": self.params,
+            "state": self.state,
+            "items": self.items,
+            "pending": self.pending,
+            "done": self.done,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+        _atomic_write(self.path, lambda f: json.dump(data, f))
+
+    def mark_done(self) -> None:
+        self.done = True
+        self.save()
+
+    def discard(self) -> None:
+        """Forget the run (after its output has been written)."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.state, self.items, self.pending = {}, {}, {}
+        self.done = self.resumed = False
+
+
+def checkpoint_for(kind: str, directory: str = SCRAPE_CHECKPOINT_DIR, **params) -> ScrapeCheckpoint:
+    """The checkpoint for a scrape identified by `kind` and its parameters."""
+    digest = hashlib.sha1(json.dumps([kind, params], sort_keys=True).encode()).hexdigest()[:16]
+    return ScrapeCheckpoint(os.path.join(directory, f"{kind}-{digest}.json"), kind, params)
+
+
+def write_rows_csv(path: str, rows: Iterable[Dict[str, Any]], fieldnames: List[str], key: str) -> int:
+    """
+    Write `rows` to a CSV, one row per `key` (first occurrence wins), replacing
+    the file atomically. Writing the same rows twice gives the same file, so
+    a resumed run never duplicates output. Returns the number of rows written.
+    """
+    unique: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        unique.setdefault(row[key], row)
+
+    def write(f):
+        w = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(unique.values())
+
+    _atomic_write(path, write)
+    return len(unique)
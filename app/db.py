@@ -1,9 +1,9 @@
 ﻿# app/db.py
 
-import db.py
-from app.sqlalchemy import create_engine
-from app.sqlalchemy.ext.declarative import declarative_base
-from app.sqlalchemy.orm import sessionmaker
+import os
+from sqlalchemy import create_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
 
 # Load from .env or fallback to SQLite for easy dev
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///dev.db")
@@ -1,7 +1,7 @@
 ﻿# app/dependencies.py
 
 from typing import Generator
-from app.sqlalchemy.orm import Session
+from sqlalchemy.orm import Session
 from fastapi import Header, HTTPException
 from uuid import UUID
 
@@ -0,0 +1,148 @@
+# app/fake_sheets.py
+#
+# In-memory stand-in for the parts of gspread the exporters use. Lets the
+# sheet writers run in tests and benchmarks without credentials or quota.
+# Every API method counts as one call and can sleep `latency` seconds to
+# model the round trip.
+#
+#   client = FakeSheetsClient(latency=0.05)
+#   ws = open_worksheet(client, "ProductResults", "LegoSearch")
+
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Sequence
+
+from app.sheets_writer import WorksheetNotFound
+
+_A1_RE = re.compile(r"^(?:.*!)?([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?$")
+
+
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+def parse_range(a1: str):
+    """'A2:C5' -> (row0, col0, row1, col1), zero-based and inclusive."""
+    m = _A1_RE.match(a1.upper())
+    if not m:
+        raise ValueError(f"unsupported range {a1!r}")
+    c0, r0, c1, r1 = m.groups()
+    c1, r1 = c1 or c0, r1 or r0
+    return int(r0) - 1, _col_index(c0), int(r1) - 1, _col_index(c1)
+
+
+class FakeWorksheet:
+    def __init__(self, title: str, latency: float = 0.0):
+        self.title = title
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._cells: List[List[str]] = []
+
+    def _hit(self, method: str) -> None:
+        self.calls[method] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def api_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _used_rows(self) -> int:
+        n = len(self._cells)
+        while n and not any(self._cells[n - 1]):
+            n -= 1
+        return n
+
+    def _write(self, row0: int, col0: int, values: Sequence[Sequence]) -> None:
+        for r, row in enumerate(values):
+            while len(self._cells) <= row0 + r:
+                self._cells.append([])
+            cells = self._cells[row0 + r]
+            for c, value in enumerate(row):
+                while len(cells) <= col0 + c:
+                    cells.append("")
+                cells[col0 + c] = "" if value is None else str(value)
+
+    # gspread Worksheet API -------------------------------------------------
+
+    def get_all_values(self) -> List[List[str]]:
+        self._hit("get_all_values")
+        rows = self._cells[:self._used_rows()]
+        width = max((len(r) for r in rows), default=0)
+        return [list(r) + [""] * (width - len(r)) for r in rows]
+
+    def clear(self) -> None:
+        self._hit("clear")
+        self._cells = []
+
+    def append_row(self, values: Sequence, value_input_option: str = "RAW") -> None:
+        self._hit("append_row")
+        self._write(self._used_rows(), 0, [values])
+
+    def append_rows(self, values: Sequence[Sequence], value_input_option: str = "RAW") -> None:
+        self._hit("append_rows")
+        self._write(self._used_rows(), 0, values)
+
+    def update(self, values: Sequence[Sequence], range_name: str = "A1", **kwargs) -> None:
+        # accept both update(values) and the older update(range, values) order
+        if isinstance(values, str):
+            values, range_name = range_name, values
+        self._hit("update")
+        r0, c0, _, _ = parse_range(range_name)
+        self._write(r0, c0, values)
+
+    def batch_update(self, data: Sequence[Dict], value_input_option: str = "RAW") -> None:
+        self._hit("batch_update")
+        for entry in data:
+            r0, c0, _, _ = parse_range(entry["range"])
+            self._write(r0, c0, entry["values"])
+
+    def batch_clear(self, ranges: Sequence[str]) -> None:
+        self._hit("batch_clear")
+        for a1 in ranges:
+            r0, c0, r1, c1 = parse_range(a1)
+            for r in range(r0, min(r1 + 1, len(self._cells))):
+                cells = self._cells[r]
+                for c in range(c0, min(c1 + 1, len(cells))):
+                    cells[c] = ""
+
+
+class FakeSpreadsheet:
+    def __init__(self, title: str, latency: float = 0.0):
+        self.title = title
+        self.id = title
+        self.latency = latency
+        self._worksheets: Dict[str, FakeWorksheet] = {}
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        try:
+            return self._worksheets[title]
+        except KeyError:
+            raise WorksheetNotFound(title)
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        return list(self._worksheets.values())
+
+    def add_worksheet(self, title: str, rows=1000, cols=26) -> FakeWorksheet:
+        ws = self._worksheets[title] = FakeWorksheet(title, self.latency)
+        return ws
+
+
+class FakeSheetsClient:
+    """gspread Client stand-in. open()/open_by_key() create the spreadsheet on first use."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._sheets: Dict[str, FakeSpreadsheet] = {}
+
+    def open(self, title: str) -> FakeSpreadsheet:
+        if title not in self._sheets:
+            self._sheets[title] = FakeSpreadsheet(title, self.latency)
+        return self._sheets[title]
+
+    open_by_key = open
+    create = open
@@ -0,0 +1,123 @@
+# app/fanout.py
+
+import asyncio
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceLatency:
+    """Running latency/error counters for a single scraper source."""
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, elapsed: float, failed: bool) -> None:
+        self.calls += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        if failed:
+            self.errors += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        avg = self.total_seconds / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(avg * 1000, 2),
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+class FanoutEngine:
+    """
+    Runs every (upc, source) pair concurrently.
+
+    A global semaphore caps the number of calls in flight, and each source
+    gets its own semaphore so one slow site cannot hog the whole budget.
+    Coroutine scrapers are awaited directly; plain ``@register`` functions
+    run on a bounded thread pool so they keep working unchanged. Pass a
+    long-lived ``executor`` to share one pool across engines (e.g. across
+    requests); otherwise each stream gets its own pool.
+    """
+
+    def __init__(
+        self,
+        scrapers: Dict[str, Callable[[str], Any]],
+        max_concurrency: int = 32,
+        per_source_limit: int = 4,
+        thread_workers: int = 16,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.scrapers = dict(scrapers)
+        self.max_concurrency = max_concurrency
+        self.per_source_limit = per_source_limit
+        self.thread_workers = thread_workers
+        self.executor = executor
+        self.latency: Dict[str, SourceLatency] = {
+            name: SourceLatency() for name in self.scrapers
+        }
+
+    async def _call(
+        self,
+        name: str,
+        fn: Callable[[str], Any],
+        upc: str,
+        global_sem: asyncio.Semaphore,
+        source_sem: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+    ) -> Tuple[str, str, Any]:
+        # per-source slot first: tasks queued behind a slow source must not
+        # sit on global slots the other sources could be using
+        async with source_sem, global_sem:
+            start = time.perf_counter()
+            failed = False
+            try:
+                if asyncio.iscoroutinefunction(fn):
+                    result = await fn(upc)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(executor, fn, upc)
+            except Exception as exc:
+                logger.warning(f"{name} failed for {upc}: {exc}")
+                failed = True
+                result = exc
+            self.latency[name].record(time.perf_counter() - start, failed)
+        return name, upc, result
+
+    async def stream(self, upcs: List[str]) -> AsyncIterator[Tuple[str, str, Any]]:
+        """
+        Yield ``(source, upc, result)`` as each call finishes.
+        A failed call yields the exception instead of a result.
+        """
+        global_sem = asyncio.Semaphore(self.max_concurrency)
+        source_sems = {
+            name: asyncio.Semaphore(self.per_source_limit) for name in self.scrapers
+        }
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.thread_workers)
+        tasks = [
+            asyncio.create_task(
+                self._call(name, fn, upc, global_sem, source_sems[name], executor)
+            )
+            for upc in upcs
+            for name, fn in self.scrapers.items()
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            # don't block the loop on stragglers if the consumer bailed early
+            if executor is not self.executor:
+                executor.shutdown(wait=False)
+
+    def latency_report(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self.latency.items()}
+
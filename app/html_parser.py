@@ -0,0 +1,336 @@
+# app/html_parser.py
+#
+# Pluggable HTML parsing for the scrapers.
+#
+#   soup = parse_html(resp.text)                      # default backend
+#   soup = parse_html(resp.text, backend="selectolax")
+#
+# Backends, fastest first:
+#   selectolax  - lexbor via selectolax; wrapped in FastNode, which supports
+#                 the BeautifulSoup calls the scrapers use (select,
+#                 select_one, find, find_all, get, has_attr, get_text, text...)
+#   lxml        - BeautifulSoup on the lxml tree builder (full bs4 API)
+#   html.parser - BeautifulSoup on the stdlib parser (full bs4 API, slowest)
+#
+# The default comes from HTML_PARSER_BACKEND ("lxml"). A backend that is not
+# installed falls back to the next one in the list above. The Desktop
+# scrapers import this module through source_scrapers/html_parser.py.
+
+import os
+import warnings
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional fast backend
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401  (only needed as a bs4 tree builder)
+    HAVE_LXML = True
+except ImportError:
+    HAVE_LXML = False
+
+BACKENDS = ("selectolax", "lxml", "html.parser")
+DEFAULT_BACKEND = os.getenv("HTML_PARSER_BACKEND", "lxml")
+
+# attributes bs4 returns as a list of tokens
+_MULTI_VALUED = {"class", "rel", "rev", "accept-charset", "headers", "accesskey"}
+_warned = set()
+
+
+def available_backends() -> List[str]:
+    found = []
+    if LexborHTMLParser is not None:
+        found.append("selectolax")
+    if HAVE_LXML:
+        found.append("lxml")
+    found.append("html.parser")
+    return found
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """The backend that will actually be used for `backend` (None = default)."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown HTML parser backend {backend!r}; expected one of {BACKENDS}")
+    available = available_backends()
+    if backend in available:
+        return backend
+    fallback = next(b for b in BACKENDS[BACKENDS.index(backend):] if b in available)
+    if backend not in _warned:
+        _warned.add(backend)
+        warnings.warn(f"HTML parser backend {backend!r} is not installed; using {fallback!r}")
+    return fallback
+
+
+def parse_html(markup: Union[str, bytes], backend: Optional[str] = None):
+    """Parse a page with the chosen backend. Returns a BeautifulSoup or a FastNode document."""
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        if isinstance(markup, bytes):
+            markup = markup.decode("utf-8", errors="replace")
+        return FastNode(LexborHTMLParser(markup), document=True)
+    return BeautifulSoup(markup, backend)
+
+
+# ----------------------------------------------------------------------
+# bs4-style matching
+# ----------------------------------------------------------------------
+
+def _value_matches(rule: Any, value: Optional[str], multi: bool) -> bool:
+    """bs4 attribute-filter semantics: True/None/str/regex/list/callable."""
+    if rule is True:
+        return value is not None
+    if rule is None or rule is False:
+        return value is None
+    if value is None:
+        return False
+    if isinstance(rule, (list, tuple, set)):
+        return any(_value_matches(r, value, multi) for r in rule)
+    # class="a b" matches "a", "b" and "a b"
+    candidates = value.split() + [value] if multi else [value]
+    if hasattr(rule, "search"):
+        return any(rule.search(c) for c in candidates)
+    if callable(rule):
+        return any(rule(c) for c in candidates)
+    return str(rule) in candidates
+
+
+def _name_matches(rule: Any, tag: str) -> bool:
+    if rule is None or rule is True:
+        return True
+    if isinstance(rule, str):
+        return tag == rule
+    if isinstance(rule, (list, tuple, set)):
+        return tag in rule
+    if hasattr(rule, "search"):
+        return rule.search(tag) is not None
+    return bool(rule(tag))
+
+
+def _text_matches(rule: Any, text: Optional[str]) -> bool:
+    if rule is True:
+        return text is not None
+    if text is None:
+        return False
+    if isinstance(rule, (list, tuple, set)):
+        return text in rule
+    if hasattr(rule, "search"):
+        return rule.search(text) is not None
+    if callable(rule):
+        return bool(rule(text))
+    return text == rule
+
+
+class FastText(str):
+    """A matched text node, like bs4's NavigableString: a str with .parent."""
+
+    def __new__(cls, text: str, parent: "FastNode"):
+        obj = super().__new__(cls, text)
+        obj.parent = parent
+        return obj
+
+
+class FastNode:
+    """
+    BeautifulSoup-compatible view of a selectolax node (or whole document).
+
+    Covers the Tag API the scrapers rely on. CSS selectors run natively in
+    lexbor; find/find_all filters are evaluated with bs4's matching rules.
+    """
+
+    __slots__ = ("_node", "_tree", "_document")
+
+    def __init__(self, node, document: bool = False):
+        self._document = document
+        self._tree = node if document else None
+        self._node = node.root if document else node
+
+    def _wrap(self, node) -> "FastNode":
+        return FastNode(node)
+
+    # -- identity ---------------------------------------------------------
+
+    @property
+    def name(self) -> str:
+        return "[document]" if self._document else self._node.tag
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FastNode) and self._node.mem_id == other._node.mem_id
+
+    def __hash__(self) -> int:
+        return self._node.mem_id
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return self.html
+
+    __str__ = __repr__
+
+    @property
+    def html(self) -> str:
+        return (self._tree if self._document else self._node).html or ""
+
+    def decode(self) -> str:
+        return self.html
+
+    # -- attributes -------------------------------------------------------
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        if self._document:
+            return {}
+        out = {}
+        for key, value in self._node.attributes.items():
+            value = "" if value is None else value
+            out[key] = value.split() if key in _MULTI_VALUED else value
+        return out
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attrs[key]
+
+    def has_attr(self, key: str) -> bool:
+        return not self._document and key in self._node.attributes
+
+    # -- text -------------------------------------------------------------
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    @property
+    def text(self) -> str:
+        return self._node.text(deep=True)
+
+    @property
+    def string(self) -> Optional[str]:
+        """Text of a node whose only content is text (bs4's .string), else None."""
+        if any(True for _ in self._node.iter()):
+            return None
+        return self._node.text(deep=True)
+
+    # -- navigation -------------------------------------------------------
+
+    @property
+    def parent(self) -> Optional["FastNode"]:
+        parent = None if self._document else self._node.parent
+        return self._wrap(parent) if parent is not None else None
+
+    @property
+    def children(self) -> Iterator["FastNode"]:
+        return (self._wrap(n) for n in self._node.iter())
+
+    def find_parent(self, name: Any = None, attrs: Optional[dict] = None, **kwargs) -> Optional["FastNode"]:
+        match = self._matcher(name, attrs, None, kwargs)
+        node = None if self._document else self._node.parent
+        while node is not None:
+            if match(node):
+                return self._wrap(node)
+            node = node.parent
+        return None
+
+    def __getattr__(self, tag: str) -> Optional["FastNode"]:
+        # soup.title / tag.span, as in bs4
+        if tag.startswith("_"):
+            raise AttributeError(tag)
+        return self.find(tag)
+
+    # -- CSS --------------------------------------------------------------
+
+    def select(self, selector: str, limit: Optional[int] = None) -> List["FastNode"]:
+        if self._document:
+            nodes = self._tree.css(selector)
+        else:
+            # lexbor includes the context node itself; bs4 only searches below it
+            me = self._node.mem_id
+            nodes = [n for n in self._node.css(selector) if n.mem_id != me]
+        if limit:
+            nodes = nodes[:limit]
+        return [self._wrap(n) for n in nodes]
+
+    def select_one(self, selector: str) -> Optional["FastNode"]:
+        if self._document:
+            node = self._tree.css_first(selector)
+            return self._wrap(node) if node is not None else None
+        found = self.select(selector, limit=1)
+        return found[0] if found else None
+
+    # -- find / find_all --------------------------------------------------
+
+    def _matcher(self, name, attrs, string, kwargs) -> Callable:
+        rules = dict(attrs) if isinstance(attrs, dict) else {}
+        if isinstance(attrs, str):
+            rules["class"] = attrs
+        if "class_" in kwargs:
+            rules["class"] = kwargs.pop("class_")
+        rules.update(kwargs)
+        rules = [(key, rule, key in _MULTI_VALUED) for key, rule in rules.items()]
+
+        def match(node) -> bool:
+            if node.tag.startswith("-") or not _name_matches(name, node.tag):
+                return False
+            node_attrs = node.attributes
+            for key, rule, multi in rules:
+                if not _value_matches(rule, node_attrs.get(key) if key in node_attrs else None, multi):
+                    return False
+            if string is not None:
+                return _text_matches(string, FastNode(node).string)
+            return True
+        return match
+
+    def _descendants(self, name, recursive: bool):
+        if not recursive:
+            return self._node.iter()
+        if isinstance(name, str) and name:
+            # narrow by tag in lexbor before filtering in Python
+            nodes = self._node.css(name)
+            if self._document:
+                return nodes
+            me = self._node.mem_id
+            return (n for n in nodes if n.mem_id != me)
+        it = self._node.traverse()
+        if not self._document:
+            next(it, None)  # traverse() starts with the node itself
+        return it
+
+    def find_all(self, name: Any = None, attrs: Optional[dict] = None, recursive: bool = True,
+                 string: Any = None, limit: Optional[int] = None, **kwargs) -> List[Union["FastNode", FastText]]:
+        if string is None and "text" in kwargs:
+            string = kwargs.pop("text")
+        kwargs.pop("text", None)
+        found: List[Union[FastNode, FastText]] = []
+
+        if string is not None and name is None and attrs is None and not kwargs:
+            # text-node search, e.g. find_all(string=re.compile("out of stock"))
+            for node in self._node.traverse(include_text=True):
+                if node.tag == "-text" and _text_matches(string, node.text_content):
+                    found.append(FastText(node.text_content, self._wrap(node.parent)))
+                    if limit and len(found) >= limit:
+                        break
+            return found
+
+        match = self._matcher(name, attrs, string, kwargs)
+        for node in self._descendants(name, recursive):
+            if match(node):
+                found.append(self._wrap(node))
+                if limit and len(found) >= limit:
+                    break
+        return found
+
+    findAll = find_all
+
+    def find(self, name: Any = None, attrs: Optional[dict] = None, recursive: bool = True,
+             string: Any = None, **kwargs) -> Optional[Union["FastNode", FastText]]:
+        found = self.find_all(name, attrs, recursive, string, limit=1, **kwargs)
+        return found[0] if found else None
+
+    def decompose(self) -> None:
+        if not self._document:
+            self._node.decompose()
@@ -3,12 +3,16 @@
 
 import time
 import random
+import asyncio
 import sys
 import logging
+import threading
 import yaml
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Tuple
 
 # ensure that print outputs never fail on Unicode
 if hasattr(sys.stdout, "reconfigure"):
@@ -25,6 +29,152 @@ user_agents: List[str] = config.get("user_agents", [])
 proxy_endpoints: List[str] = config.get("proxies", [])
 default_headers: Dict[str, str] = {"Accept-Language": "en-US,en;q=0.9"}
 
+class SessionPool:
+    """
+    Thread-safe pool of keep-alive sessions, one per (scheme://host, proxy).
+    Every fetch to the same host reuses the same urllib3 connection pool,
+    so only the first request pays the TCP+TLS handshake.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions: Dict[Tuple[str, Optional[str]], requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, proxy: Optional[str] = None) -> requests.Session:
+        parts = urlsplit(url)
+        key = (f"{parts.scheme}://{parts.netloc}", proxy)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._sessions[key] = session
+        return session
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Connection counters from the underlying urllib3 pools.
+        new = sockets opened (each paid a handshake), reused = requests
+        served on an already-open socket.
+        """
+        requests_made = 0
+        new_connections = 0
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            adapter = session.get_adapter("https://")
+            managers = [adapter.poolmanager, *adapter.proxy_manager.values()]
+            for manager in managers:
+                for pool_key in manager.pools.keys():
+                    pool = manager.pools.get(pool_key)
+                    if pool is None:
+                        continue
+                    requests_made += pool.num_requests
+                    new_connections += pool.num_connections
+        return {
+            "sessions": len(sessions),
+            "requests": requests_made,
+            "new_connections": new_connections,
+            "reused_connections": max(requests_made - new_connections, 0),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+session_pool = SessionPool(
+    pool_connections=int(config["http"].get("pool_connections", 10)),
+    pool_maxsize=int(config["http"].get("pool_maxsize", 20))
+)
+
+def connection_stats() -> Dict[str, int]:
+    return session_pool.stats()
+
+class TokenBucket:
+    """
+    Spaces request *starts* at `rate` per second with bursts up to `burst`.
+    reserve() hands out a slot and returns how long the caller must wait
+    for it, so threads and coroutines can share one bucket.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+class HostRateLimiter:
+    """One TokenBucket per host, plus a little start jitter to avoid lockstep bursts."""
+
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _delay(self, url: str) -> float:
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(host, TokenBucket(self.rate, self.burst))
+        delay = bucket.reserve()
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        return delay
+
+    def acquire(self, url: str) -> None:
+        delay = self._delay(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, url: str) -> None:
+        delay = self._delay(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+rate_limiter = HostRateLimiter(
+    rate=float(config["concurrency"].get("per_host_rate", 5)),
+    burst=int(config["concurrency"].get("per_host_burst", 5)),
+    jitter=float(config["concurrency"].get("start_jitter", 0.1))
+)
+
+def _request_headers(extra_headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    ua: str = random.choice(user_agents)
+    headers: Dict[str, str] = {**default_headers, "User-Agent": ua}
+    if extra_headers:
+        headers.update(extra_headers)
+    return headers
+
+def _pick_proxy() -> Optional[str]:
+    return random.choice(proxy_endpoints) if proxy_endpoints else None
+
+def _backoff(attempt: int) -> float:
+    return (float(config["http"]["backoff_factor"]) ** attempt) + random.random()
+
 def fetch_with_retries(
     url: str,
     extra_headers: Optional[Dict[str, str]] = None,
@@ -32,26 +182,22 @@ def fetch_with_retries(
 ):
     """
     Retrieve a URL, retrying on failure with exponential backoff,
-    rotating User-Agent and optional proxies.
+    rotating User-Agent and optional proxies. Without an explicit session
+    the shared per-host keep-alive pool is used.
     """
-    session = session or requests.Session()
     retries: int = int(config["http"]["max_retries"])
-    backoff_power: float = float(config["http"]["backoff_factor"])
     timeout: float = float(config["http"]["timeout"])
 
     for attempt in range(1, retries + 1):
-        ua: str = random.choice(user_agents)
-        headers: Dict[str, str] = {**default_headers, "User-Agent": ua}
-        if extra_headers:
-            headers.update(extra_headers)
+        headers = _request_headers(extra_headers)
 
-        proxy_cfg: Optional[Dict[str, str]] = None
-        if proxy_endpoints:
-            proxy: str = random.choice(proxy_endpoints)
-            proxy_cfg = {"http": proxy, "https": proxy}
+        proxy = _pick_proxy()
+        proxy_cfg = {"http": proxy, "https": proxy} if proxy else None
 
+        http = session or session_pool.get(url, proxy)
+        rate_limiter.acquire(url)
         try:
-            response = session.get(
+            response = http.get(
                 url,
                 headers=headers,
                 proxies=proxy_cfg,
@@ -60,12 +206,12 @@ def fetch_with_retries(
             if response.status_code == 200:
                 return response
 
-            wait = (backoff_power ** attempt) + random.random()
+            wait = _backoff(attempt)
             logging.warning(f"{response.status_code} from {url}, retrying in {wait:.1f}s")
             time.sleep(wait)
 
         except Exception as err:
-            wait = (backoff_power ** attempt) + random.random()
+            wait = _backoff(attempt)
             logging.error(f"{err} fetching {url}, retrying in {wait:.1f}s")
             time.sleep(wait)
 
@@ -79,6 +225,8 @@ def fetch_concurrent(
 ) -> List[tuple[str, Optional[requests.Response]]]:
     """
     Fetch multiple URLs in parallel using ThreadPoolExecutor.
+    Request starts are spaced per host by `rate_limiter`, so results are
+    collected as soon as they finish.
     Returns list of (url, response_or_None).
     """
     max_workers = max_workers or int(config["concurrency"]["max_workers"])
@@ -93,8 +241,78 @@ def fetch_concurrent(
             url = futures[future]
             response = future.result()
             results.append((url, response))
-            # jitter to avoid request bursts
-            time.sleep(random.uniform(0.1, 0.3))
+    return results
+
+async def fetch_with_retries_async(
+    url: str,
+    clients: Dict[Optional[str], Any],
+    extra_headers: Optional[Dict[str, str]] = None
+):
+    """
+    Async twin of fetch_with_retries. `clients` maps proxy -> httpx.AsyncClient
+    (httpx binds proxies per client, not per request).
+    """
+    retries: int = int(config["http"]["max_retries"])
+
+    for attempt in range(1, retries + 1):
+        headers = _request_headers(extra_headers)
+        proxy = _pick_proxy()
+        client = clients[proxy]
+
+        await rate_limiter.acquire_async(url)
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code == 200:
+                return response
+
+            wait = _backoff(attempt)
+            logging.warning(f"{response.status_code} from {url}, retrying in {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+        except Exception as err:
+            wait = _backoff(attempt)
+            logging.error(f"{err} fetching {url}, retrying in {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+    logging.error(f"Gave up on {url} after {retries} attempts")
+    return None
+
+async def fetch_concurrent_async(
+    urls: List[str],
+    max_workers: Optional[int] = None,
+    **kwargs: Any
+) -> List[tuple[str, Optional[Any]]]:
+    """
+    Fetch multiple URLs concurrently with httpx, at most `max_workers`
+    in flight, same retry/User-Agent/proxy behaviour as fetch_concurrent.
+    Returns list of (url, response_or_None) in completion order.
+    """
+    import httpx
+
+    max_workers = max_workers or int(config["concurrency"]["max_workers"])
+    timeout = float(config["http"]["timeout"])
+    limits = httpx.Limits(
+        max_connections=max_workers,
+        max_keepalive_connections=int(config["http"].get("pool_maxsize", 20))
+    )
+    proxies: List[Optional[str]] = list(proxy_endpoints) or [None]
+    clients = {
+        proxy: httpx.AsyncClient(proxy=proxy, timeout=timeout, limits=limits)
+        for proxy in proxies
+    }
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def worker(url: str):
+        async with semaphore:
+            return url, await fetch_with_retries_async(url, clients, **kwargs)
+
+    results: List[tuple[str, Optional[Any]]] = []
+    try:
+        for next_done in asyncio.as_completed([worker(url) for url in urls]):
+            results.append(await next_done)
+    finally:
+        for client in clients.values():
+            await client.aclose()
     return results
 
 def get_json(url: str) -> Optional[Dict[str, Any]]:
@@ -1,7 +1,8 @@
 ﻿from app.db import Base, engine
-from app.models import Webhook, WebhookLog  # ensure BOTH are imported
+from app.models import Webhook, WebhookLog, migrate_webhook_logs  # ensure BOTH are imported
 
 Base.metadata.create_all(bind=engine)
+migrate_webhook_logs(engine)
 
 print("âœ… Tables created.")
 
@@ -0,0 +1,97 @@
+# app/job_store.py
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional
+
+from app.schemas import WebhookExportResponse
+from app.settings import SUBSCRIPTIONS_DB
+
+
+class JobStore:
+    """
+    Status of background /scrape/ jobs, kept in the same SQLite file as the
+    subscriptions so any uvicorn worker can answer a poll for a job another
+    worker started. A job is "running" until finish() stores its result.
+    """
+
+    def __init__(self, path: str = SUBSCRIPTIONS_DB, max_finished: int = 1000):
+        self.path = path
+        self.max_finished = max_finished
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " result TEXT,"
+            " updated_at TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status ON scrape_jobs (status, updated_at)"
+        )
+        self._conn.commit()
+
+    def create(self, job_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO scrape_jobs (job_id, status, result, updated_at) VALUES (?, 'running', NULL, ?)",
+                (job_id, datetime.utcnow().isoformat())
+            )
+
+    def finish(self, job_id: str, status: str, result: WebhookExportResponse) -> None:
+        """Store the result and drop the oldest finished jobs beyond max_finished."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE scrape_jobs SET status = ?, result = ?, updated_at = ? WHERE job_id = ?",
+                (status, result.model_dump_json(), datetime.utcnow().isoformat(), job_id)
+            )
+            self._conn.execute(
+                "DELETE FROM scrape_jobs WHERE job_id IN ("
+                " SELECT job_id FROM scrape_jobs WHERE status != 'running'"
+                " ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_finished,)
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """{"status", "result"} for a job, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result FROM scrape_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, result = row
+        return {
+            "status": status,
+            "result": WebhookExportResponse(**json.loads(result)) if result else None,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared: Optional[JobStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """The process-wide job store, opened on first use (see get_subscription_store)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = JobStore(os.getenv("SUBSCRIPTIONS_DB", SUBSCRIPTIONS_DB))
+        return _shared
+
+
+def reset_job_store() -> None:
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+            _shared = None
@@ -1,9 +1,11 @@
-﻿from fastapi import FastAPI, HTTPException, Header, Request
+﻿from fastapi import FastAPI, HTTPException, Header, Query, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, UUID4, HttpUrl
 from typing import List
-import httpx
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import traceback
+import uuid
 
 from app.schemas import (
     SubscribeRequest,
@@ -12,12 +14,28 @@ from app.schemas import (
     WebhookExportResponse,
 )
 from app.services.scrapers.amazon_scraper import scrape_amazon
+from app.webhook_worker import get_http_client, close_http_client
+from app.fanout import FanoutEngine
+from app.scrape_cache import scrape_cache
+from app.subscription_store import SubscriptionExists, get_subscription_store
+from app.job_store import get_job_store
+from app.settings import SCRAPE_THREAD_WORKERS, SCRAPE_MAX_CONCURRENCY, SCRAPE_DEADLINE
 
 # Enable debug so uncaught errors return tracebacks
 app = FastAPI(debug=True)
 
-# In-memory store of subscriptions
-subscriptions: dict[UUID4, SubscribeRequest] = {}
+# Shared pool for the blocking scrapers: concurrent requests queue for these
+# threads instead of each one stalling the event loop
+scrape_executor = ThreadPoolExecutor(max_workers=SCRAPE_THREAD_WORKERS, thread_name_prefix="scrape")
+
+# Background scrape jobs: status and results live in the shared job store so
+# any worker can answer a poll; this dict only keeps this worker's tasks alive
+job_tasks: dict[str, asyncio.Task] = {}
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await close_http_client()
+    scrape_executor.shutdown(wait=False, cancel_futures=True)
 
 # Catch-all exception handler (returns JSON with traceback)
 @app.exception_handler(Exception)
@@ -31,69 +49,152 @@ async def all_exceptions(request: Request, exc: Exception):
 
 @app.post("/subscribe", response_model=SubscribeResponse)
 async def subscribe(req: SubscribeRequest):
-    if req.webhook_id in subscriptions:
+    try:
+        # the store opens its SQLite file on first use, so that runs off the loop too
+        await off_loop(lambda: get_subscription_store().add(req))
+    except SubscriptionExists:
         raise HTTPException(400, "webhook_id already registered")
-    subscriptions[req.webhook_id] = req
     return SubscribeResponse(
         status="success",
         webhook_id=req.webhook_id,
         threshold=req.threshold
     )
 
-@app.post("/scrape/", response_model=WebhookExportResponse)
-async def scrape_endpoint(
-    upcs: List[str],
-    x_webhook_id: UUID4 = Header(..., alias="X-Webhook-ID")
-):
-    # 1) Validate subscription
-    if x_webhook_id not in subscriptions:
-        raise HTTPException(404, "Subscription not found")
-    sub = subscriptions[x_webhook_id]
-
-    # 2) Scrape & filter by ROI
+async def collect_items(upcs: List[str], threshold: float, deadline: float):
+    """
+    Scrape UPCs concurrently on the shared pool and keep those meeting the
+    threshold. Stops waiting at the deadline and returns what finished:
+    (items, failed, timed_out). Scrapes already running in a thread are
+    left to finish on their own.
+    """
+    engine = FanoutEngine(
+        {"amazon": scrape_cache.wrap("amazon", scrape_amazon)},
+        max_concurrency=SCRAPE_MAX_CONCURRENCY,
+        per_source_limit=SCRAPE_MAX_CONCURRENCY,
+        executor=scrape_executor,
+    )
     items: List[ExportItem] = []
-    for upc in upcs:
-        snap = scrape_amazon(upc)
-        if snap.roi >= sub.threshold:
-            items.append(ExportItem(upc=snap.upc, price=snap.price, roi=snap.roi))
+    failed = done = 0
+
+    async def consume():
+        nonlocal failed, done
+        async for _, upc, snap in engine.stream(upcs):
+            done += 1
+            if isinstance(snap, Exception):
+                failed += 1
+            elif snap is not None and snap.roi >= threshold:
+                items.append(ExportItem(upc=snap.upc, price=snap.price, roi=snap.roi))
+
+    try:
+        await asyncio.wait_for(consume(), timeout=deadline)
+    except asyncio.TimeoutError:
+        pass
+    return items, failed, len(upcs) - done
+
+async def scrape_and_dispatch(upcs: List[str], sub: SubscribeRequest, deadline: float) -> WebhookExportResponse:
+    # 1) Scrape & filter by ROI
+    items, scrape_failed, timed_out = await collect_items(upcs, sub.threshold, deadline)
+    partial = f" ({timed_out} UPC(s) timed out, {scrape_failed} failed)" if timed_out or scrape_failed else ""
 
     if not items:
         return WebhookExportResponse(
-            status="no_items", dispatched=0, failed=0,
-            message="No items met the threshold"
+            status="no_items", dispatched=0, failed=scrape_failed, timed_out=timed_out,
+            message=f"No items met the threshold{partial}"
         )
 
-            # 3) Dispatch to subscriber URL
+    # 2) Dispatch to subscriber URL
     try:
         # force a pure Python str
         url = str(sub.url)
         print(f"Dispatching to URL (type={type(url)}): {url}")
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                url,
-                json={"items": [i.model_dump() for i in items]},
-                timeout=10.0
-            )
-            resp.raise_for_status()
+        resp = await get_http_client().post(
+            url,
+            json={"items": [i.model_dump() for i in items]},
+            timeout=10.0
+        )
+        resp.raise_for_status()
     except Exception as exc:
-        import traceback
         tb = traceback.format_exc()
         print("Dispatch exception:\n", tb)
         return WebhookExportResponse(
             status="failure",
             dispatched=0,
-            failed=len(items),
+            failed=len(items) + scrape_failed,
+            timed_out=timed_out,
             message=f"Dispatch error: {exc!r}"
         )
 
-    # Success
+    # Success (partial if some UPCs failed or missed the deadline)
     return WebhookExportResponse(
-        status="success",
+        status="partial" if partial else "success",
         dispatched=len(items),
-        failed=0,
-        message=f"{len(items)} item(s) dispatched"
+        failed=scrape_failed,
+        timed_out=timed_out,
+        message=f"{len(items)} item(s) dispatched{partial}"
+    )
+
+async def off_loop(fn, *args):
+    """
+    Run a blocking SQLite call on the loop's default thread pool. Not on
+    scrape_executor, so a poll never queues behind slow scrapes.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+async def run_scrape_job(job_id: str, upcs: List[str], sub: SubscribeRequest, deadline: float):
+    try:
+        result = await scrape_and_dispatch(upcs, sub, deadline)
+        status = "done"
+    except Exception as exc:
+        print(f"Scrape job {job_id} failed:\n", traceback.format_exc())
+        result = WebhookExportResponse(
+            status="failure", dispatched=0, failed=len(upcs), job_id=job_id,
+            message=f"Job error: {exc!r}"
+        )
+        status = "failed"
+    result.job_id = job_id
+    await off_loop(lambda: get_job_store().finish(job_id, status, result))
+    job_tasks.pop(job_id, None)
+
+@app.post("/scrape/", response_model=WebhookExportResponse)
+async def scrape_endpoint(
+    upcs: List[str],
+    x_webhook_id: UUID4 = Header(..., alias="X-Webhook-ID"),
+    background: bool = Query(False, description="Return a job id now and push results when done"),
+    deadline: float = Query(SCRAPE_DEADLINE, gt=0, le=600, description="Seconds to wait for scrapes"),
+):
+    # Validate subscription
+    sub = await off_loop(lambda: get_subscription_store().get(x_webhook_id))
+    if sub is None:
+        raise HTTPException(404, "Subscription not found")
+
+    if not background:
+        return await scrape_and_dispatch(upcs, sub, deadline)
+
+    job_id = uuid.uuid4().hex
+    await off_loop(lambda: get_job_store().create(job_id))
+    job_tasks[job_id] = asyncio.create_task(run_scrape_job(job_id, upcs, sub, deadline))
+    return WebhookExportResponse(
+        status="accepted", dispatched=0, failed=0, job_id=job_id,
+        message=f"Scraping {len(upcs)} UPC(s) in the background; results go to the webhook"
     )
+
+@app.get("/scrape/jobs/{job_id}", response_model=WebhookExportResponse)
+async def scrape_job_status(job_id: str):
+    job = await off_loop(lambda: get_job_store().get(job_id))
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    if job["status"] == "running":
+        return WebhookExportResponse(
+            status="running", dispatched=0, failed=0, job_id=job_id, message="Job still running"
+        )
+    return job["result"]
+
+@app.get("/scrape/cache/stats")
+async def scrape_cache_stats():
+    """Hit / miss / coalesced counters for the shared scrape result cache."""
+    return scrape_cache.stats()
+
 @app.post("/webhook-debug")
 async def webhook_debug(request: Request):
     """
@@ -1,7 +1,7 @@
-﻿from app.sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Text
-from app.sqlalchemy.dialects.postgresql import UUID
+﻿from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Text, Index, inspect, text
+from sqlalchemy.dialects.postgresql import UUID
 from app.db import Base
-from app import uuid
+import uuid
 from datetime import datetime
 
 class Webhook(Base):
@@ -22,5 +22,39 @@ class WebhookLog(Base):
     attempts    = Column(Integer, default=0)
     response    = Column(Text)
     timestamp   = Column(DateTime, default=datetime.utcnow)
+    # JSON body of the queued item, sent by app.webhook_worker
+    payload     = Column(Text)
+    # Set while the row is in the outbox (queued or awaiting a retry), NULL once settled
+    next_attempt_at = Column(DateTime, nullable=True)
+    # Claim token of the worker delivering the row (see app.webhook_worker)
+    claimed_by  = Column(String, nullable=True)
 
+    __table_args__ = (
+        Index("ix_webhook_logs_next_attempt_at", "next_attempt_at"),
+        # newest-first log pages per webhook (see webhook_export.fetch_log_page)
+        Index("ix_webhook_logs_webhook_id_timestamp", "webhook_id", "timestamp"),
+    )
 
+
+def migrate_webhook_logs(bind) -> list:
+    """
+    Bring a webhook_logs table created before the outbox columns up to date:
+    create_all() never alters an existing table, so add the missing columns
+    and indexes here. Returns the names of the columns added.
+    """
+    table = WebhookLog.__table__
+    if not inspect(bind).has_table(table.name):
+        table.create(bind)
+        return []
+    existing = {c["name"] for c in inspect(bind).get_columns(table.name)}
+    added = []
+    with bind.begin() as conn:
+        for column in (table.c.payload, table.c.next_attempt_at, table.c.claimed_by):
+            if column.name not in existing:
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=bind.dialect)}"
+                ))
+                added.append(column.name)
+    for index in table.indexes:
+        index.create(bind, checkfirst=True)
+    return added
@@ -2,12 +2,21 @@
 
 import asyncio
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 from app.schemas import PriceDeltaResponse, ExportItem
 from app.dependencies import get_db
-from app.settings import MIN_ROI
+from app.settings import (
+    MIN_ROI,
+    FANOUT_MAX_CONCURRENCY,
+    FANOUT_PER_SOURCE_LIMIT,
+    FANOUT_THREAD_WORKERS,
+    FANOUT_DISPATCH_BATCH,
+)
 from app.scraper_registry import registry
-from app.webhook_dispatcher import dispatch_items_to_webhook
+from app.fanout import FanoutEngine
+from app.scrape_cache import scrape_cache
+from app.webhook_dispatcher import dispatch_items_to_webhook, queue_items
+from app.subscription_store import SubscriptionStore, get_subscription_store
 
 
 def compute_delta(snapshot) -> PriceDeltaResponse:
@@ -23,23 +32,81 @@ def compute_delta(snapshot) -> PriceDeltaResponse:
     )
 
 
-def run_all_scrapers(webhook_id: UUID, upcs: List[str], db) -> dict:
-    export_items: list[ExportItem] = []
+async def run_all_scrapers_async(
+    webhook_id: Optional[UUID],
+    upcs: List[str],
+    db,
+    batch_size: int = FANOUT_DISPATCH_BATCH,
+    store: Optional[SubscriptionStore] = None,
+) -> dict:
+    """
+    Run the (upc, source) matrix concurrently and stream qualifying items
+    to the webhook queue in batches as they come in. With webhook_id=None
+    each batch goes to every subscriber whose ROI threshold it meets.
+    """
+    engine = FanoutEngine(
+        scrape_cache.wrap_all(registry),
+        max_concurrency=FANOUT_MAX_CONCURRENCY,
+        per_source_limit=FANOUT_PER_SOURCE_LIMIT,
+        thread_workers=FANOUT_THREAD_WORKERS,
+    )
+    pending: list[ExportItem] = []
+    dispatched = 0
+    failed = 0
+
+    def flush():
+        nonlocal dispatched, failed
+        if not pending:
+            return
+        if webhook_id is None:
+            dispatched += sum(dispatch_to_subscribers(pending, db, store or get_subscription_store()).values())
+        else:
+            result = dispatch_items_to_webhook(webhook_id, pending, db)
+            dispatched += result["dispatched"]
+            failed += result["failed"]
+        pending.clear()
+
+    async for name, upc, snapshot in engine.stream(upcs):
+        if snapshot is None or isinstance(snapshot, Exception):
+            continue
+        delta = compute_delta(snapshot)
+        if delta.arbitrage:
+            pending.append(ExportItem(
+                upc=upc,
+                price=delta.current_price,
+                roi=delta.delta_pct,
+                source=name
+            ))
+            if len(pending) >= batch_size:
+                flush()
+    flush()
+
+    return {
+        "status": "queued",
+        "dispatched": dispatched,
+        "failed": failed,
+        "message": f"{dispatched} items queued for webhook delivery",
+        "source_latency": engine.latency_report(),
+        "scrape_cache": scrape_cache.stats(),
+    }
+
+
+def dispatch_to_subscribers(items: List[ExportItem], db, store: SubscriptionStore) -> dict:
+    """
+    Queue each scored item for every subscriber whose ROI threshold it meets,
+    using the store's threshold index. Returns {webhook_id: items queued}.
+    """
+    queued = {}
+    for sub, matched in store.match(items):
+        count, _ = queue_items(sub.webhook_id, list(matched), db)
+        queued[str(sub.webhook_id)] = count
+    db.commit()
+    return queued
 
-    # For each UPC, run every registered scraper
-    for upc in upcs:
-        for name, scraper_fn in registry.items():
-            snapshot = scraper_fn(upc)
-            delta = compute_delta(snapshot)
-            if delta.arbitrage:
-                export_items.append(ExportItem(
-                    upc=upc,
-                    price=delta.current_price,
-                    roi=delta.delta_pct,
-                    source=name
-                ))
 
-    return dispatch_items_to_webhook(webhook_id, export_items, db)
+def run_all_scrapers(webhook_id: Optional[UUID], upcs: List[str], db) -> dict:
+    # Sync entry point for routers/CLI; the work itself runs concurrently
+    return asyncio.run(run_all_scrapers_async(webhook_id, upcs, db))
 
 
 # âœ… Add this async fan-out/fan-in version for Scout or batch mode
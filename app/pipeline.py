@@ -1,26 +1,127 @@
 # pipeline.py
 # ─────────────────────────────────────────────────
-from app.amazon import scrape_amazon
-from app.push_to_sheets import push_to_sheet, SHEET_ID
+# Amazon search → UPC enrichment → deal scoring → Sheets export, run as a
+# streaming pipeline (app.streaming): each stage works on a different page
+# or product at the same time, bounded queues between them apply
+# backpressure, and rows reach the sheet every `export_batch` products
+# instead of after the last page. A checkpoint keyed on the query and page
+# count records every page whose products have all been exported, so a run
+# that fails on page 27 resumes at the first unfinished page.
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def run_amazon_pipeline(query, worksheet="Amazon", max_pages=None):
+from app.amazon import iter_search_pages, enrich_hits, new_run_stats, print_run_stats
+from app.checkpoint import checkpoint_for
+from app.services.scout_dealscorer import score_deal
+from app.sheets_writer import SheetWriter, WorksheetNotFound
+from app.shared.upc_service import CsvUPCService
+from app.streaming import Stage, StreamPipeline
+from app.settings import AMAZON_DETAIL_WORKERS, PIPELINE_EXPORT_BATCH
+
+HEADERS = ["ASIN", "Title", "Price", "UPC", "Score", "Reason"]
+
+def open_tab(worksheet):
+    """The `worksheet` tab of the SPREADSHEET_ID sheet, created if missing."""
+    import gspread
+    sh = gspread.service_account("credentials.json").open_by_key(os.environ["SPREADSHEET_ID"])
+    try:
+        return sh.worksheet(worksheet)
+    except WorksheetNotFound:
+        return sh.add_worksheet(worksheet, rows=1000, cols=len(HEADERS))
+
+def score_product(prod):
+    prod.update(score_deal(prod))
+    return prod
+
+def format_row(prod):
+    # [ASIN, Title, $Price, UPC, Score, Reason]
+    return [prod["asin"], prod["title"], f"${prod['price']:.2f}", prod.get("upc") or "",
+            prod["score"], prod["reason"]]
+
+def run_amazon_pipeline(query, worksheet="Amazon", max_pages=None, ws=None, upc_service=None,
+                        workers=AMAZON_DETAIL_WORKERS, export_batch=PIPELINE_EXPORT_BATCH,
+                        checkpoint=None):
+    """
+    Scrape, enrich, score and export `query` results to the `worksheet` tab
+    (or to `ws`, any gspread-style worksheet). Returns the per-stage report.
+
+    Progress goes to `checkpoint` (by default checkpoint_for("amazon_pipeline",
+    query=..., max_pages=...)); calling again after a failure re-exports the
+    saved products and continues from the first page not fully exported.
+    The checkpoint is discarded once the final flush has written the sheet.
+    Products are exported once per ASIN.
+    """
     mode = "auto" if max_pages is None else max_pages
     print(f"🔍 Amazon → '{query}' (pages={mode})")
 
-    products = scrape_amazon(query, max_pages=max_pages)
-    if not products:
-        print("⚠️ No products found.")
-        return
+    if checkpoint is None:
+        checkpoint = checkpoint_for("amazon_pipeline", query=query, max_pages=max_pages)
+    ws = ws or open_tab(worksheet)
+    upc_service = upc_service or CsvUPCService()
+    writer = SheetWriter(ws, headers=HEADERS, key="ASIN")
+    run = new_run_stats()
 
-    # Format rows: [ASIN, Title, $Price, UPC]
-    rows = []
-    for p in products:
-        row = [p["asin"], p["title"], f"${p['price']:.2f}"]
-        if p.get("upc") is not None:
-            row.append(p["upc"] or "")
-        rows.append(row)
+    # ASIN -> scored product, shared with the checkpoint
+    exported = checkpoint.items
+    start_page = 1
+    if checkpoint.resumed:
+        max_pages = checkpoint.state.get("max_pages", max_pages)
+        start_page = checkpoint.state.get("last_page", 0) + 1
+        print(f"↩️ Resuming '{query}' at page {start_page} ({len(exported)} products exported)")
+        for prod in exported.values():
+            writer.add(format_row(prod))
 
-    push_to_sheet(SHEET_ID, rows, worksheet)
+    # page -> ASINs not yet exported, in page order; a page is finished when its set empties
+    open_pages = {}
+    lock = threading.Lock()
+
+    def pages():
+        for page, hits in iter_search_pages(query, max_pages, run, start_page):
+            with lock:
+                open_pages[page] = {p["asin"] for p in hits}
+                checkpoint.state["max_pages"] = run["max_pages"]
+            yield page, hits
+
+    def export(prod):
+        with lock:
+            if prod["asin"] not in exported:
+                exported[prod["asin"]] = prod
+                writer.add(format_row(prod))
+                if len(exported) % export_batch == 0:
+                    # partial flush: keep last run's rows that haven't come round yet
+                    writer.flush(prune=False)
+            for waiting in open_pages.values():
+                waiting.discard(prod["asin"])
+            finished = None
+            for page in list(open_pages):
+                if open_pages[page]:
+                    break
+                del open_pages[page]
+                finished = page
+            if finished is not None:
+                checkpoint.state["last_page"] = finished
+                checkpoint.save()
+        return prod
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pipeline = StreamPipeline(pages(), [
+            Stage("enrich", lambda page: enrich_hits(page[1], upc_service, pool, run), fan_out=True),
+            Stage("score", score_product),
+            Stage("export", export),
+        ])
+        pipeline.run()
+
+    if not exported:
+        print("⚠️ No products found.")
+        checkpoint.discard()
+        return pipeline.report()
+
+    writer.flush()
+    checkpoint.discard()
+    print_run_stats(run, len(exported))
+    print(pipeline.format_report())
+    return pipeline.report()
 
 if __name__ == "__main__":
     # ───── YOUR CONFIG ─────
@@ -35,4 +136,3 @@ if __name__ == "__main__":
     # ─────────────────────────
 
     run_amazon_pipeline(query, worksheet, max_pages)
-
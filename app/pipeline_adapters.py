@@ -1,20 +1,90 @@
 ﻿# app/services/pipeline_adapters.py
 
-import pipeline_adapters.py
-import pipeline_adapters.py
-from app import subprocess
-import pipeline_adapters.py
+import os
+import io
+import sys
+import json
+import queue
+import atexit
+import importlib
+import threading
+import contextlib
+import subprocess
+from typing import Any, Callable, Dict, Optional
 
 from app.schemas import PriceSnapshot
-from app.services.scraper_registry import register
+from app.scraper_registry import register
+from app.settings import PIPELINE_MODE, PIPELINE_WORKER_TIMEOUT
 
-# Compute our project root and pipelines folder
-ROOT_DIR     = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-PIPELINE_DIR = os.path.join(ROOT_DIR, "pipelines")
+# The run_<source>_pipeline.py scripts live next to this module
+PIPELINE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR     = os.path.dirname(PIPELINE_DIR)
 
-def run_pipeline(source: str, upc: str) -> PriceSnapshot:
+# source -> callable(upc) -> dict, imported once per process
+_entrypoints: Dict[str, Callable[[str], Dict[str, Any]]] = {}
+_entrypoints_lock = threading.Lock()
+# redirect_stdout swaps a process-wide handle, so main()-style pipelines run
+# one at a time. Only app.pipeline_worker processes wrap main(); in the app
+# those scripts go to their worker (see run_pipeline_inprocess).
+_stdout_lock = threading.Lock()
+
+
+def _as_dict(result: Any) -> Dict[str, Any]:
+    if hasattr(result, "model_dump"):
+        return result.model_dump()
+    return dict(result)
+
+
+def _wrap_main(main: Callable[[str], None]) -> Callable[[str], Dict[str, Any]]:
+    """Adapt a script-style main(upc) that prints JSON into a function returning a dict."""
+    def call(upc: str) -> Dict[str, Any]:
+        buf = io.StringIO()
+        with _stdout_lock, contextlib.redirect_stdout(buf):
+            main(upc)
+        lines = buf.getvalue().strip().splitlines()
+        if not lines:
+            raise ValueError("pipeline main() printed no JSON")
+        return json.loads(lines[-1])
+    return call
+
+
+def load_entrypoint(source: str) -> Callable[[str], Dict[str, Any]]:
+    """
+    Import app.run_<source>_pipeline once and return its entry function.
+    Prefers get_snapshot(upc); falls back to the script's main(upc).
     """
-    Runs: pipelines/run_<source>_pipeline.py <upc>
+    key = source.lower()
+    fn = _entrypoints.get(key)
+    if fn is not None:
+        return fn
+
+    with _entrypoints_lock:
+        if key not in _entrypoints:
+            module = importlib.import_module(f"app.run_{key}_pipeline")
+            get_snapshot = getattr(module, "get_snapshot", None)
+            if get_snapshot is not None:
+                _entrypoints[key] = lambda upc: _as_dict(get_snapshot(upc))
+            elif hasattr(module, "main"):
+                _entrypoints[key] = _wrap_main(module.main)
+            else:
+                raise AttributeError(
+                    f"app.run_{key}_pipeline has no get_snapshot() or main()"
+                )
+        return _entrypoints[key]
+
+
+def _to_snapshot(data: Dict[str, Any]) -> PriceSnapshot:
+    return PriceSnapshot(
+        upc=data["upc"],
+        price=data["price"],
+        previous_price=data.get("previous_price", data["price"]),
+        roi=data.get("roi", 0.0)
+    )
+
+
+def run_pipeline_subprocess(source: str, upc: str) -> Dict[str, Any]:
+    """
+    Runs: run_<source>_pipeline.py <upc> in a fresh interpreter.
     Expects JSON on stdout with at least "upc" and "price".
     """
     script = f"run_{source.lower()}_pipeline.py"
@@ -29,13 +99,140 @@ def run_pipeline(source: str, upc: str) -> PriceSnapshot:
         text=True,
         check=True
     )
-    data = json.loads(proc.stdout)
+    return json.loads(proc.stdout)
 
-    return PriceSnapshot(
-        upc=data["upc"],
-        price=data["price"],
-        previous_price=data.get("previous_price", data["price"])
-    )
+
+def has_snapshot_entrypoint(source: str) -> bool:
+    module = importlib.import_module(f"app.run_{source.lower()}_pipeline")
+    return hasattr(module, "get_snapshot")
+
+
+def run_pipeline_inprocess(source: str, upc: str) -> Dict[str, Any]:
+    """
+    Call the pipeline's get_snapshot() directly. main()-style scripts only
+    print their result, and capturing sys.stdout from a fan-out thread would
+    serialise them and pick up other threads' prints, so those run in the
+    source's warm worker process instead.
+    """
+    if has_snapshot_entrypoint(source):
+        return load_entrypoint(source)(upc)
+    return get_worker(source).call(upc)
+
+
+class PipelineWorker:
+    """
+    One warm interpreter per source, speaking line-delimited JSON
+    (see app/pipeline_worker.py). Restarted transparently if it dies, and
+    killed (then restarted on the next call) if a reply takes longer than
+    `timeout` seconds.
+    """
+
+    def __init__(self, source: str, timeout: float = PIPELINE_WORKER_TIMEOUT):
+        self.source = source.lower()
+        self.timeout = timeout
+        self.command = [sys.executable, "-m", "app.pipeline_worker", self.source]
+        self._proc = None
+        self._replies: Optional[queue.Queue] = None
+        self._lock = threading.Lock()
+
+    def _spawn(self):
+        self._proc = subprocess.Popen(
+            self.command,
+            cwd=ROOT_DIR,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        # A pipe read can't time out portably, so a reader thread feeds a queue
+        # that call() waits on; each process gets its own queue so a late reply
+        # from a killed worker never reaches its replacement.
+        self._replies = queue.Queue()
+        threading.Thread(
+            target=self._read_replies, args=(self._proc.stdout, self._replies),
+            name=f"{self.source}-pipeline-reader", daemon=True
+        ).start()
+
+    @staticmethod
+    def _read_replies(stdout, replies: queue.Queue):
+        for line in stdout:
+            replies.put(line)
+        replies.put("")
+
+    def call(self, upc: str) -> Dict[str, Any]:
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._spawn()
+            self._proc.stdin.write(json.dumps({"upc": upc}) + "\n")
+            self._proc.stdin.flush()
+            try:
+                line = self._replies.get(timeout=self.timeout)
+            except queue.Empty:
+                self.kill()
+                raise TimeoutError(
+                    f"{self.source} pipeline worker gave no reply within {self.timeout}s"
+                )
+            if not line:
+                self.close()
+                raise RuntimeError(f"{self.source} pipeline worker exited")
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise RuntimeError(f"{self.source} pipeline failed: {reply.get('error')}")
+        return reply["data"]
+
+    def close(self):
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+    def kill(self):
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+
+
+_workers: Dict[str, PipelineWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_worker(source: str) -> PipelineWorker:
+    key = source.lower()
+    with _workers_lock:
+        if key not in _workers:
+            _workers[key] = PipelineWorker(key)
+        return _workers[key]
+
+
+@atexit.register
+def shutdown_workers():
+    with _workers_lock:
+        for worker in _workers.values():
+            worker.close()
+        _workers.clear()
+
+
+def run_pipeline(source: str, upc: str, mode: str = PIPELINE_MODE) -> PriceSnapshot:
+    """
+    Run one source pipeline for a UPC.
+    mode: "inprocess" (default; main()-only scripts use their worker),
+    "worker" (warm process per source) or "subprocess" (fresh interpreter
+    per call, the legacy behaviour).
+    """
+    if mode == "inprocess":
+        data = run_pipeline_inprocess(source, upc)
+    elif mode == "worker":
+        data = get_worker(source).call(upc)
+    elif mode == "subprocess":
+        data = run_pipeline_subprocess(source, upc)
+    else:
+        raise ValueError(f"Unknown pipeline mode: {mode}")
+    return _to_snapshot(data)
 
 @register
 def amazon(upc: str) -> PriceSnapshot:
@@ -50,6 +247,3 @@ def walmart(upc: str) -> PriceSnapshot:
     return run_pipeline("walmart", upc)
 
 # â€¦and so on for FrontierCoop, DandH, PuzzleWarehouse, etc.
-
-
-
@@ -0,0 +1,42 @@
+# app/pipeline_worker.py
+#
+# Long-lived worker for one source pipeline. Started by
+# app.pipeline_adapters.PipelineWorker as:
+#
+#   python -m app.pipeline_worker <source>
+#
+# Protocol (one JSON object per line):
+#   stdin : {"upc": "012345678905"}
+#   stdout: {"ok": true, "data": {...}} or {"ok": false, "error": "..."}
+
+import sys
+import json
+
+from app.pipeline_adapters import load_entrypoint
+
+
+def serve(source: str, stdin=None, stdout=None) -> None:
+    stdin = stdin or sys.stdin
+    proto = stdout or sys.stdout
+    # keep stray prints from the pipeline out of the protocol stream
+    sys.stdout = sys.stderr
+
+    fn = load_entrypoint(source)
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            reply = {"ok": True, "data": fn(request["upc"])}
+        except Exception as exc:
+            reply = {"ok": False, "error": repr(exc)}
+        proto.write(json.dumps(reply) + "\n")
+        proto.flush()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m app.pipeline_worker <source>", file=sys.stderr)
+        sys.exit(1)
+    serve(sys.argv[1])
@@ -1,7 +1,7 @@
 ﻿#!/usr/bin/env python
-import run_amazon_pipeline.py
-import run_amazon_pipeline.py
-import run_amazon_pipeline.py
+import os
+import sys
+import json
 
 # 1) Make project root importable so `app/` resolves
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -11,9 +11,25 @@ sys.path.insert(0, ROOT)
 from app.services.scrapers.amazon_scraper import scrape_amazon
 from app.schemas import PriceSnapshot
 
+def _price(text) -> float:
+    # "1,299." + "99" from the result card comes through as "1,299..99"
+    return float(str(text).replace(",", "").replace("..", "."))
+
+def get_snapshot(upc: str) -> PriceSnapshot:
+    # in-process entry point used by app.pipeline_adapters: the first
+    # search result with a price becomes the snapshot
+    for item in scrape_amazon(upc):
+        if item.get("price"):
+            try:
+                price = _price(item["price"])
+            except ValueError:
+                continue
+            return PriceSnapshot(upc=upc, price=price, previous_price=price, roi=0.0)
+    raise LookupError(f"no priced Amazon result for UPC {upc}")
+
 def main(upc: str):
     # run the scraper
-    snapshot: PriceSnapshot = scrape_amazon(upc)
+    snapshot: PriceSnapshot = get_snapshot(upc)
     # model_dump() returns a dict with every field (upc, price, previous_price, roi)
     print(json.dumps(snapshot.model_dump()))
 
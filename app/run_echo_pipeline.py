@@ -0,0 +1,17 @@
+#!/usr/bin/env python
+# No-network pipeline used to measure adapter overhead and smoke-test
+# app.pipeline_adapters without hitting a retailer.
+import sys
+import json
+
+def get_snapshot(upc: str) -> dict:
+    return {"upc": upc, "price": 10.0, "previous_price": 12.5, "roi": 0.2}
+
+def main(upc: str):
+    print(json.dumps(get_snapshot(upc)))
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python run_echo_pipeline.py <UPC>", file=sys.stderr)
+        sys.exit(1)
+    main(sys.argv[1])
@@ -1,6 +1,6 @@
 ﻿from pydantic import BaseModel, UUID4, HttpUrl
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 # â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 # Subscription schemas
@@ -25,11 +25,19 @@ class ExportItem(BaseModel):
     price: float
     roi: float
 
+class WebhookExportRequest(BaseModel):
+    webhook_id: UUID4
+    items: List[ExportItem]
+
 class WebhookExportResponse(BaseModel):
     status: str
     dispatched: int
     failed: int
     message: str
+    # UPCs still being scraped when the request deadline passed
+    timed_out: int = 0
+    # Set when the scrape runs as a background job
+    job_id: Optional[str] = None
 
 # â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 # Webhook logs diagnostics schemas (if you need them)
@@ -49,6 +57,8 @@ class WebhookLogEntry(BaseModel):
 
 class WebhookLogsResponse(BaseModel):
     logs: List[WebhookLogEntry]
+    # Pass back as ?cursor= to fetch the next (older) page; None on the last page
+    next_cursor: Optional[str] = None
 
 # â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 # Priceâ€delta detection schemas
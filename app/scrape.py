@@ -21,4 +21,10 @@ def scrape_and_ingest(
     """
     return run_all_scrapers(webhook_id, upcs, db)
 
-
+@router.post("/broadcast", response_model=dict)
+def scrape_and_broadcast(upcs: List[str], db = Depends(get_db)):
+    """
+    Run all registered scrapers against each UPC and queue every
+    qualifying item for each subscriber whose ROI threshold it meets.
+    """
+    return run_all_scrapers(None, upcs, db)
@@ -0,0 +1,230 @@
+# app/scrape_cache.py
+
+import time
+import asyncio
+import threading
+import functools
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from app.settings import (
+    SCRAPE_CACHE_TTL,
+    SCRAPE_CACHE_NEGATIVE_TTL,
+    SCRAPE_CACHE_MAX_ENTRIES,
+)
+
+
+def is_not_found(result: Any = None, exc: BaseException = None) -> bool:
+    """A scraper that returns None or raises LookupError found nothing for the UPC."""
+    if exc is not None:
+        return isinstance(exc, LookupError)
+    return result is None
+
+
+class _Flight:
+    """A coroutine fetch in progress and the number of callers awaiting it."""
+
+    __slots__ = ("future", "task", "waiters")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.task = None
+        self.waiters = 1
+
+
+class SingleFlightCache:
+    """
+    Coalesces concurrent calls for the same (source, upc) into one fetch and
+    keeps the outcome for a short TTL.
+
+    Found results are cached for ``ttl`` seconds and not-found outcomes
+    (see is_not_found) for ``negative_ttl``. Other errors are shared with
+    the callers already waiting on that fetch but never cached.
+    Sync scrapers coalesce across threads (FanoutEngine runs them on a pool);
+    coroutine scrapers coalesce within the event loop, and a cancelled
+    caller only cancels the fetch when nobody else is waiting on it.
+    """
+
+    def __init__(
+        self,
+        ttl: float = SCRAPE_CACHE_TTL,
+        negative_ttl: float = SCRAPE_CACHE_NEGATIVE_TTL,
+        max_entries: int = SCRAPE_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        # key -> (expires_at, is_error, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, bool, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "negative_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Cache entries (callers hold the lock)
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self._counters["negative_hits" if entry[1] or entry[2] is None else "hits"] += 1
+        return entry
+
+    def _store(self, key: Hashable, result: Any = None, exc: BaseException = None) -> None:
+        if exc is not None and not is_not_found(exc=exc):
+            self._counters["errors"] += 1
+            return
+        ttl = self.negative_ttl if is_not_found(result, exc) else self.ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, exc is not None, exc if exc is not None else result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _unwrap(entry):
+        if entry[1]:
+            raise entry[2]
+        return entry[2]
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def call(self, source: str, fn: Callable[[str], Any], upc: str) -> Any:
+        key = (source, upc)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return self._unwrap(entry)
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counters["coalesced"] += 1
+                leader = False
+            else:
+                future = self._inflight[key] = Future()
+                self._counters["misses"] += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(upc)
+        except BaseException as exc:
+            with self._lock:
+                self._store(key, exc=exc)
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._store(key, result=result)
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    async def acall(self, source: str, fn: Callable[[str], Any], upc: str) -> Any:
+        key = (source, upc)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                return self._unwrap(entry)
+            flight = self._inflight.get(key)
+            if isinstance(flight, _Flight) and flight.future.get_loop() is loop:
+                self._counters["coalesced"] += 1
+                flight.waiters += 1
+            else:
+                self._counters["misses"] += 1
+                if flight is None:
+                    flight = self._inflight[key] = _Flight(loop.create_future())
+                    # the fetch is not owned by the first caller, so cancelling
+                    # that caller doesn't cancel it for everyone else waiting
+                    flight.task = loop.create_task(self._afetch(key, fn, upc, flight))
+                else:
+                    # a fetch running on another event loop can't be awaited here
+                    flight = None
+
+        if flight is None:
+            return await fn(upc)
+
+        try:
+            return await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0 and not flight.future.done()
+                if abandoned and self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            if abandoned:
+                flight.task.cancel()
+            raise
+
+    async def _afetch(self, key: Hashable, fn: Callable[[str], Any], upc: str, flight: "_Flight") -> None:
+        try:
+            result = await fn(upc)
+        except asyncio.CancelledError:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.future.cancel()
+            raise
+        except Exception as exc:
+            with self._lock:
+                self._store(key, exc=exc)
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.future.set_exception(exc)
+            # keep "exception was never retrieved" quiet when nobody else waited
+            flight.future.exception()
+            return
+        with self._lock:
+            self._store(key, result=result)
+            if self._inflight.get(key) is flight:
+                del self._inflight[key]
+        flight.future.set_result(result)
+
+    def wrap(self, source: str, fn: Callable[[str], Any]) -> Callable[[str], Any]:
+        """Cached version of a registry-style scraper (sync or async)."""
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def cached_async(upc: str):
+                return await self.acall(source, fn, upc)
+            return cached_async
+
+        @functools.wraps(fn)
+        def cached(upc: str):
+            return self.call(source, fn, upc)
+        return cached
+
+    def wrap_all(self, scrapers: Dict[str, Callable[[str], Any]]) -> Dict[str, Callable[[str], Any]]:
+        return {name: self.wrap(name, fn) for name, fn in scrapers.items()}
+
+    def invalidate(self, source: str = None, upc: str = None) -> None:
+        with self._lock:
+            if source is None and upc is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries
+                        if (source is None or k[0] == source) and (upc is None or k[1] == upc)]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._counters)
+            s["entries"] = len(self._entries)
+            s["inflight"] = len(self._inflight)
+        lookups = s["hits"] + s["negative_hits"] + s["misses"] + s["coalesced"]
+        s["hit_rate"] = round((lookups - s["misses"]) / lookups, 3) if lookups else 0.0
+        return s
+
+
+# Shared by /scrape/ and run_all_scrapers so overlapping requests share fetches
+scrape_cache = SingleFlightCache()
@@ -1,6 +1,9 @@
-﻿import scraper.pyquests
-from app.bs4 import BeautifulSoup
-import scraper.py
+﻿import re
+import sys
+import requests
+
+from app.html_parser import parse_html
+from app.checkpoint import checkpoint_for, write_rows_csv
 
 headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
@@ -22,29 +25,60 @@ def extract_items_from_page(soup, items):
         price = price_tag.text.replace("$", "") if price_tag else ""
         items[asin] = {"ASIN": asin, "Title": title, "Price": price}
 
-def scrape_amazon_category(base_url):
-    items = {}
+def scrape_amazon_category(base_url, checkpoint=None):
+    """
+    Walk every results page of a category. With a checkpoint the next page
+    URL and the items so far are saved after each page, so a failed walk
+    resumes from the page it stopped on.
+    """
+    if checkpoint is not None and checkpoint.done:
+        return list(checkpoint.items.values())
+
+    items = dict(checkpoint.items) if checkpoint is not None else {}
     page_url = base_url + "&s=date-desc-rank"
+    if checkpoint is not None and checkpoint.resumed:
+        page_url = checkpoint.state.get("page_url", page_url)
+        print(f"↩️ Resuming {base_url} at page {checkpoint.state.get('pages_done', 0) + 1} "
+              f"({len(items)} items so far)")
+
     while page_url:
-        resp = requests.get(page_url, headers=headers)
-        soup = BeautifulSoup(resp.text, "html.parser")
+        resp = requests.get(page_url, headers=headers, timeout=15)
+        # a block page must fail the walk, not end it as if it were the last page
+        resp.raise_for_status()
+        soup = parse_html(resp.text)
         extract_items_from_page(soup, items)
         next_btn = soup.select_one("ul.a-pagination li.a-last a")
         page_url = "https://www.amazon.com" + next_btn["href"] if next_btn else None
+
+        if checkpoint is not None:
+            checkpoint.items = items
+            checkpoint.state["page_url"] = page_url
+            checkpoint.state["pages_done"] = checkpoint.state.get("pages_done", 0) + 1
+            checkpoint.save()
+
+    if checkpoint is not None:
+        checkpoint.mark_done()
     return list(items.values())
 
-# Load URLs and run
-with open("category_urls.txt") as f:
-    urls = [u.strip() for u in f if u.strip()]
+def main(urls_file="category_urls.txt", out_csv="multi_category_asins.csv", fresh=False):
+    with open(urls_file) as f:
+        urls = [u.strip() for u in f if u.strip() and not u.startswith("#")]
+
+    checkpoints = [checkpoint_for("amazon_category", base_url=u) for u in urls]
+    if fresh:
+        for cp in checkpoints:
+            cp.discard()
 
-all_products = []
-for u in urls:
-    all_products += scrape_amazon_category(u)
+    all_products = []
+    for u, cp in zip(urls, checkpoints):
+        all_products += scrape_amazon_category(u, checkpoint=cp)
 
-# Write CSV
-with open("multi_category_asins.csv", "w", newline="", encoding="utf-8") as f:
-    w = csv.DictWriter(f, fieldnames=["ASIN", "Title", "Price"])
-    w.writeheader()
-    w.writerows(all_products)
+    # Write CSV (one row per ASIN, replaced atomically)
+    written = write_rows_csv(out_csv, all_products, ["ASIN", "Title", "Price"], key="ASIN")
+    for cp in checkpoints:
+        cp.discard()
+    print(f"✅ Scraped {written} Amazon items.")
 
-print(f"âœ… Scraped {len(all_products)} Amazon items.")
+if __name__ == "__main__":
+    # --fresh ignores checkpoints left by an interrupted run
+    main(fresh="--fresh" in sys.argv[1:])
@@ -1,33 +1,108 @@
 ﻿import pkgutil
 import importlib
 import logging
-from typing import Dict, Callable, Optional, List
+import threading
+from collections.abc import MutableMapping
+from typing import Dict, Callable, Optional, List, Iterator
 
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
-SCRAPER_REGISTRY: Dict[str, Callable] = {}
-
-for _, module_name, _ in pkgutil.iter_modules(__path__):
-    if not module_name.endswith("_scraper"):
-        continue
-    try:
-        module = importlib.import_module(f"{__name__}.{module_name}")
-    except Exception as e:
-        logger.warning(f"Skipping scraper {module_name}: {e}")
-        continue
-    for attr in dir(module):
-        if attr.startswith("scrape_"):
-            fn = getattr(module, attr)
-            if callable(fn):
-                key = attr.replace("scrape_", "").title().replace("_", "")
-                SCRAPER_REGISTRY[key] = fn
 
-def discover_scrapers(active_sources: Optional[List[str]] = None) -> Dict[str, Callable]:
-    if active_sources:
-        return {k: fn for k, fn in SCRAPER_REGISTRY.items() if k in active_sources}
-    return SCRAPER_REGISTRY
+def _scraper_modules() -> List[str]:
+    # Listing the package is cheap; nothing is imported here
+    return [name for _, name, _ in pkgutil.iter_modules(__path__) if name.endswith("_scraper")]
+
+
+def _source_key(name: str) -> str:
+    # "best_buy" (from scrape_best_buy or best_buy_scraper) -> "BestBuy"
+    return name.title().replace("_", "")
+
+
+def _source_modules() -> Dict[str, str]:
+    """Registry key -> module name, from file names alone."""
+    return {_source_key(name[:-len("_scraper")]): name for name in _scraper_modules()}
+
+
+class _LazyScraperRegistry(MutableMapping):
+    """
+    Name -> scrape_* function, importing scraper modules on first use.
+    Looking up "Amazon" imports only amazon_scraper, `in` answers from the
+    module file names without importing, and iterating imports every
+    *_scraper module once.
+    """
+
+    def __init__(self):
+        self._fns: Dict[str, Callable] = {}
+        self._imported: set = set()
+        self._all_loaded = False
+        self._lock = threading.RLock()
 
+    def _load_module(self, module_name: str) -> None:
+        with self._lock:
+            if module_name in self._imported:
+                return
+            self._imported.add(module_name)
+            try:
+                module = importlib.import_module(f"{__name__}.{module_name}")
+            except Exception as e:
+                logger.warning(f"Skipping scraper {module_name}: {e}")
+                return
+            for attr in dir(module):
+                if attr.startswith("scrape_"):
+                    fn = getattr(module, attr)
+                    if callable(fn):
+                        key = _source_key(attr[len("scrape_"):])
+                        # explicit registrations (e.g. test overrides) win
+                        self._fns.setdefault(key, fn)
 
+    def _load_all(self) -> None:
+        if self._all_loaded:
+            return
+        with self._lock:
+            for module_name in _scraper_modules():
+                self._load_module(module_name)
+            self._all_loaded = True
 
+    def __getitem__(self, key: str) -> Callable:
+        if key not in self._fns:
+            module_name = _source_modules().get(key)
+            if module_name is not None:
+                self._load_module(module_name)
+        return self._fns[key]
 
+    def __contains__(self, key: object) -> bool:
+        if key in self._fns:
+            return True
+        # once a module is imported (or failed to), _fns is the answer
+        module_name = _source_modules().get(key)
+        return module_name is not None and module_name not in self._imported
+
+    def __setitem__(self, key: str, fn: Callable) -> None:
+        self._fns[key] = fn
+
+    def __delitem__(self, key: str) -> None:
+        del self._fns[key]
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_all()
+        return iter(dict(self._fns))
+
+    def __len__(self) -> int:
+        self._load_all()
+        return len(self._fns)
+
+
+SCRAPER_REGISTRY: MutableMapping = _LazyScraperRegistry()
+
+def discover_scrapers(active_sources: Optional[List[str]] = None) -> Dict[str, Callable]:
+    if active_sources:
+        # only the requested scraper modules get imported
+        found = {}
+        for k in active_sources:
+            try:
+                found[k] = SCRAPER_REGISTRY[k]
+            except KeyError:
+                continue
+        return found
+    return SCRAPER_REGISTRY
@@ -1,7 +1,63 @@
 ﻿# app/settings.py
 
-import settings.py
+import os
 
 # Minimum ROI threshold for dispatching
 MIN_ROI = float(os.getenv("MIN_ROI", "0.25"))
 
+# Fan-out engine limits for run_all_scrapers
+FANOUT_MAX_CONCURRENCY = int(os.getenv("FANOUT_MAX_CONCURRENCY", "32"))
+FANOUT_PER_SOURCE_LIMIT = int(os.getenv("FANOUT_PER_SOURCE_LIMIT", "4"))
+FANOUT_THREAD_WORKERS = int(os.getenv("FANOUT_THREAD_WORKERS", "16"))
+FANOUT_DISPATCH_BATCH = int(os.getenv("FANOUT_DISPATCH_BATCH", "25"))
+
+# How app.pipeline_adapters runs source pipelines: inprocess | worker | subprocess
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "inprocess")
+# Seconds a "worker" mode pipeline may take to answer before it is killed and restarted
+PIPELINE_WORKER_TIMEOUT = float(os.getenv("PIPELINE_WORKER_TIMEOUT", "60"))
+
+# Outbox delivery worker (app/webhook_worker.py)
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "500"))
+WEBHOOK_MAX_ITEMS_PER_POST = int(os.getenv("WEBHOOK_MAX_ITEMS_PER_POST", "100"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "5"))
+WEBHOOK_BACKOFF_BASE = float(os.getenv("WEBHOOK_BACKOFF_BASE", "2.0"))
+WEBHOOK_BACKOFF_MAX = float(os.getenv("WEBHOOK_BACKOFF_MAX", "300"))
+WEBHOOK_CONCURRENCY = int(os.getenv("WEBHOOK_CONCURRENCY", "10"))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10.0"))
+# Seconds a worker holds a claimed batch before another worker may take it over
+WEBHOOK_CLAIM_SECONDS = float(os.getenv("WEBHOOK_CLAIM_SECONDS", "120"))
+
+# /scrape/ endpoint: shared scrape pool, per-request concurrency and deadline (seconds)
+SCRAPE_THREAD_WORKERS = int(os.getenv("SCRAPE_THREAD_WORKERS", "16"))
+SCRAPE_MAX_CONCURRENCY = int(os.getenv("SCRAPE_MAX_CONCURRENCY", "8"))
+SCRAPE_DEADLINE = float(os.getenv("SCRAPE_DEADLINE", "30"))
+
+# Single-flight result cache in front of the scrapers (app/scrape_cache.py), seconds
+SCRAPE_CACHE_TTL = float(os.getenv("SCRAPE_CACHE_TTL", "300"))
+SCRAPE_CACHE_NEGATIVE_TTL = float(os.getenv("SCRAPE_CACHE_NEGATIVE_TTL", "60"))
+SCRAPE_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "10000"))
+
+# SQLite file holding /subscribe registrations (app/subscription_store.py)
+SUBSCRIPTIONS_DB = os.getenv("SUBSCRIPTIONS_DB", "subscriptions.db")
+
+# Max rows per Google Sheets API call in app/sheets_writer.py
+SHEETS_CHUNK_ROWS = int(os.getenv("SHEETS_CHUNK_ROWS", "500"))
+
+# app.amazon.scrape_amazon detail-page enrichment: pool size and per-host requests/sec
+AMAZON_DETAIL_WORKERS = int(os.getenv("AMAZON_DETAIL_WORKERS", "4"))
+AMAZON_DETAIL_RATE = float(os.getenv("AMAZON_DETAIL_RATE", "2.0"))
+AMAZON_DETAIL_BURST = int(os.getenv("AMAZON_DETAIL_BURST", "2"))
+
+# Streaming pipelines (app/streaming.py): items buffered between stages, rows per partial Sheets flush
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+PIPELINE_EXPORT_BATCH = int(os.getenv("PIPELINE_EXPORT_BATCH", "200"))
+
+# Directory for resumable scrape checkpoints (app/checkpoint.py)
+SCRAPE_CHECKPOINT_DIR = os.getenv("SCRAPE_CHECKPOINT_DIR", ".scrape_checkpoints")
+
+# OCR product matching (app/vision/match_product.py): comma-separated catalog CSVs of
+# scraped products, results per lookup, fuzzy-scored candidates and postings read per query
+PRODUCT_CATALOG = os.getenv("PRODUCT_CATALOG", "product_catalog.csv")
+MATCH_TOP_K = int(os.getenv("MATCH_TOP_K", "10"))
+MATCH_CANDIDATES = int(os.getenv("MATCH_CANDIDATES", "64"))
+MATCH_POSTINGS_BUDGET = int(os.getenv("MATCH_POSTINGS_BUDGET", "10000"))
@@ -0,0 +1,302 @@
+# app/sheets_writer.py
+#
+# Buffered, diff-only writes to a Google Sheets worksheet. Rows are collected
+# in memory and flush() brings the tab in line with them using a handful of
+# chunked batch_update / append_rows / batch_clear calls instead of one
+# append_row round trip per product. Only rows that differ from the last
+# export are written; the last export is kept in memory and, if
+# snapshot_path is given, in a JSON file so the next run can diff without
+# reading the sheet back. Rows are compared as the strings the sheet reports,
+# but written with their original values so numbers stay numeric cells.
+#
+# Works with anything shaped like a gspread Worksheet, including
+# app.fake_sheets.FakeWorksheet for offline tests and benchmarks.
+
+import os
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from app.settings import SHEETS_CHUNK_ROWS
+
+try:
+    from gspread.exceptions import WorksheetNotFound
+except ImportError:  # gspread is only needed when talking to the real API
+    class WorksheetNotFound(Exception):
+        pass
+
+
+def open_worksheet(client, sheet_name: str, worksheet_name: str, rows: int = 1000, cols: int = 20):
+    """Open a tab by spreadsheet name, creating the tab if it does not exist."""
+    sh = client.open(sheet_name)
+    try:
+        return sh.worksheet(worksheet_name)
+    except WorksheetNotFound:
+        return sh.add_worksheet(title=worksheet_name, rows=str(rows), cols=str(cols))
+
+
+def column_letter(n: int) -> str:
+    """1 -> A, 27 -> AA"""
+    letters = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _cell(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _normalize(row: Sequence, width: int) -> List[str]:
+    """Cells as the sheet reports them: strings, padded/truncated to the header width."""
+    cells = [_cell(v) for v in row[:width]]
+    return cells + [""] * (width - len(cells))
+
+
+def _pad(row: Sequence, width: int) -> List[Any]:
+    """Cells as they are written: original values, None as "", padded/truncated to the header width."""
+    cells = ["" if v is None else v for v in row[:width]]
+    return cells + [""] * (width - len(cells))
+
+
+class SheetWriter:
+    """
+    Mirrors a list of rows into one worksheet with as few API calls as possible.
+
+    Args:
+        ws: gspread Worksheet (or FakeWorksheet)
+        headers: Column names for row 1; taken from the first dict row if omitted
+        key: Header of a column that identifies a product (ASIN, SKU, URL...).
+             Rows whose key is already on the sheet keep their position, so a
+             re-export only touches rows whose values changed. Without a key
+             rows are compared by position. Rows sharing a key (including a
+             blank one) are all kept, matched up in the order they appear.
+        snapshot_path: JSON file holding the last export for this tab
+        chunk_size: Max rows sent per API call
+    """
+
+    def __init__(
+        self,
+        ws,
+        headers: Optional[Sequence[str]] = None,
+        key: Optional[str] = None,
+        snapshot_path: Optional[str] = None,
+        chunk_size: int = SHEETS_CHUNK_ROWS,
+        value_input_option: str = "RAW",
+    ):
+        self.ws = ws
+        self.headers = list(headers) if headers else None
+        self.key = key
+        self.snapshot_path = snapshot_path
+        self.chunk_size = max(1, chunk_size)
+        self.value_input_option = value_input_option
+        # slot -> cells; a slot is the row number, or (key, nth row with that key)
+        self._rows: Dict[Any, List[Any]] = {}
+        self._key_counts: Dict[str, int] = {}
+        self._snapshot: Optional[List[List[str]]] = None
+        self.stats = {"api_calls": 0, "rows_written": 0, "rows_cleared": 0, "rows_unchanged": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+    # ------------------------------------------------------------------
+    # Buffering
+    # ------------------------------------------------------------------
+
+    def add(self, row: Union[Dict[str, Any], Sequence]) -> None:
+        if isinstance(row, dict):
+            if self.headers is None:
+                self.headers = list(row.keys())
+            row = [row.get(h, "") for h in self.headers]
+        elif self.headers is None:
+            raise ValueError("headers are required for list rows")
+        cells = _pad(row, len(self.headers))
+        if self.key is None:
+            self._rows[len(self._rows)] = cells
+        else:
+            key = _cell(cells[self._key_index])
+            nth = self._key_counts.get(key, 0)
+            self._key_counts[key] = nth + 1
+            self._rows[(key, nth)] = cells
+
+    def add_many(self, rows: Iterable) -> None:
+        for row in rows:
+            self.add(row)
+
+    @property
+    def _key_index(self) -> int:
+        return self.headers.index(self.key)
+
+    def _slots(self, rows: List[List[str]]) -> List[tuple]:
+        """(key, nth row with that key) for each sheet row, the same slots add() assigns"""
+        ki, counts, slots = self._key_index, {}, []
+        for row in rows:
+            key = row[ki] if ki < len(row) else ""
+            nth = counts.get(key, 0)
+            counts[key] = nth + 1
+            slots.append((key, nth))
+        return slots
+
+    # ------------------------------------------------------------------
+    # Snapshot of what the sheet currently holds
+    # ------------------------------------------------------------------
+
+    def _load_snapshot(self) -> List[List[str]]:
+        if self._snapshot is not None:
+            return self._snapshot
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                return json.load(f)["values"]
+        self.stats["api_calls"] += 1
+        return self.ws.get_all_values()
+
+    def _save_snapshot(self, values: List[List[str]]) -> None:
+        self._snapshot = values
+        if not self.snapshot_path:
+            return
+        tmp = f"{self.snapshot_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"values": values}, f)
+        os.replace(tmp, self.snapshot_path)
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _layout(self, old_rows: List[List[str]], prune: bool) -> List[List[Any]]:
+        """Order the buffered rows so rows already on the sheet stay where they are."""
+        if self.key is None:
+            rows = list(self._rows.values())
+            return rows + old_rows[len(rows):] if not prune else rows
+
+        old_slots = self._slots(old_rows)
+        wanted = dict(self._rows)
+        if not prune:
+            for k, row in zip(old_slots, old_rows):
+                wanted.setdefault(k, _normalize(row, len(self.headers)))
+
+        slots: List[Any] = []
+        placed = set()
+        for k in old_slots:
+            if k in wanted and k not in placed:
+                slots.append(k)
+                placed.add(k)
+            else:
+                slots.append(None)
+        fresh = iter([k for k in wanted if k not in placed])
+
+        # new keys fill vacated slots first, then go on the end
+        for i, k in enumerate(slots):
+            if k is None:
+                slots[i] = next(fresh, None)
+        slots.extend(fresh)
+
+        # more rows removed than added: move rows from the bottom into the gaps
+        while slots and slots[-1] is None:
+            slots.pop()
+        for i in range(len(slots)):
+            if i >= len(slots):
+                break
+            if slots[i] is None:
+                slots[i] = slots.pop()
+                while slots and slots[-1] is None:
+                    slots.pop()
+        return [wanted[k] for k in slots]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _call(self, method: str, *args, **kwargs):
+        self.stats["api_calls"] += 1
+        return getattr(self.ws, method)(*args, **kwargs)
+
+    def _append(self, rows: List[List[str]]) -> None:
+        for i in range(0, len(rows), self.chunk_size):
+            self._call("append_rows", rows[i:i + self.chunk_size],
+                       value_input_option=self.value_input_option)
+
+    def _update_ranges(self, changed: List[int], rows: List[List[str]]) -> None:
+        """Write sheet rows `changed` (1-based, sorted) as contiguous ranges, chunk_size rows per call."""
+        last_col = column_letter(len(self.headers))
+        batch, batch_rows = [], 0
+
+        def send():
+            nonlocal batch, batch_rows
+            if batch:
+                self._call("batch_update", batch, value_input_option=self.value_input_option)
+            batch, batch_rows = [], 0
+
+        start = 0
+        while start < len(changed):
+            end = start
+            while (end + 1 < len(changed) and changed[end + 1] == changed[end] + 1
+                   and end + 1 - start < self.chunk_size):
+                end += 1
+            first, last = changed[start], changed[end]
+            if batch_rows + (end - start + 1) > self.chunk_size:
+                send()
+            batch.append({"range": f"A{first}:{last_col}{last}",
+                          "values": [rows[r - 1] for r in range(first, last + 1)]})
+            batch_rows += end - start + 1
+            start = end + 1
+        send()
+
+    def flush(self, prune: bool = True) -> dict:
+        """
+        Bring the worksheet in line with the buffered rows.
+
+        prune=False keeps rows from the previous export that were not added
+        again (useful when flushing part-way through a run).
+        """
+        if self.headers is None:
+            return self.stats
+        width = len(self.headers)
+        header = _normalize(self.headers, width)
+        old = [_normalize(r, width) for r in self._load_snapshot()]
+
+        if not old or old[0] != header:
+            # first export or the columns changed: rewrite the tab
+            rows = self._layout([], prune=True)
+            if old:
+                self._call("clear")
+            self._append([header] + rows)
+            self.stats["rows_written"] += len(rows)
+            self._save_snapshot([header] + [_normalize(r, width) for r in rows])
+            return self.stats
+
+        old_rows = old[1:]
+        rows = self._layout(old_rows, prune)
+        grid = [header] + rows
+        seen = [_normalize(r, width) for r in rows]
+
+        changed = [i + 2 for i, row in enumerate(seen[:len(old_rows)]) if row != old_rows[i]]
+        self._update_ranges(changed, grid)
+        self._append(rows[len(old_rows):])
+        if len(old_rows) > len(rows):
+            self._call("batch_clear", [f"A{len(rows) + 2}:{column_letter(width)}{len(old_rows) + 1}"])
+            self.stats["rows_cleared"] += len(old_rows) - len(rows)
+
+        self.stats["rows_written"] += len(changed) + max(len(rows) - len(old_rows), 0)
+        self.stats["rows_unchanged"] += min(len(rows), len(old_rows)) - len(changed)
+        self._save_snapshot([header] + seen)
+        return self.stats
+
+
+def clear_rows(ws, snapshot_path: Optional[str] = None) -> None:
+    """Empty the tab and forget its snapshot, so the next export rewrites everything."""
+    ws.clear()
+    if snapshot_path and os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+
+
+def write_rows(ws, rows: Iterable, headers: Optional[Sequence[str]] = None,
+               key: Optional[str] = None, snapshot_path: Optional[str] = None) -> dict:
+    """One-shot export of `rows` (dicts or lists) to `ws`; returns the writer stats."""
+    writer = SheetWriter(ws, headers=headers, key=key, snapshot_path=snapshot_path)
+    writer.add_many(rows)
+    return writer.flush()
@@ -1,11 +1,13 @@
-﻿from app import subprocess
-from app import datetime
-from app import csv
-import sourcing_pipeline.py
-from app import ctypes
-from app import gspread
-from app.oauth2client.service_account import ServiceAccountCredentials
-from app.gspread.exceptions import SpreadsheetNotFound
+﻿import os
+import subprocess
+import datetime
+import csv
+import ctypes
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+from gspread.exceptions import SpreadsheetNotFound
+
+from app.sheets_writer import SheetWriter
 
 # 1) Authenticate with Google Sheets
 scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
@@ -59,22 +61,24 @@ for script in [
 ]:
     subprocess.run(["python", script], check=True)
 
-# 6) Push each CSV into its corresponding sheet tab
-def push_csv(tab_name, headers, csv_path):
+# 6) Push each CSV into its corresponding sheet tab.
+#    Rows are diffed against the previous run's snapshot and written in
+#    batches, so only new/changed products cost API calls.
+def push_csv(tab_name, headers, csv_path, key):
     ws = sheet.worksheet(tab_name)
-    ws.clear()
-    ws.append_row(headers)
+    writer = SheetWriter(ws, headers=headers, key=key,
+                         snapshot_path=f".sheet_snapshot_{SHEET_ID}_{tab_name}.json")
     with open(csv_path, encoding="utf-8") as f:
         reader = csv.reader(f)
         next(reader, None)
-        for row in reader:
-            ws.append_row(row)
+        writer.add_many(reader)
+    return writer.flush()
 
-push_csv("Amazon",  ["ASIN", "Title", "Price"],                     "multi_category_asins.csv")
-push_csv("Walmart", ["Title", "Price", "SKU", "Product URL", "Image URL"], "walmart_products.csv")
-push_csv("Target",  ["Title", "Price", "SKU", "Product URL"],        "target_products.csv")
-push_csv("Costco",  ["Title", "Price", "SKU", "Product URL"],        "costco_products.csv")
-push_csv("eBay",    ["Title", "Price", "Product URL"],               "ebay_products.csv")
+push_csv("Amazon",  ["ASIN", "Title", "Price"],                     "multi_category_asins.csv", key="ASIN")
+push_csv("Walmart", ["Title", "Price", "SKU", "Product URL", "Image URL"], "walmart_products.csv", key="Product URL")
+push_csv("Target",  ["Title", "Price", "SKU", "Product URL"],        "target_products.csv", key="Product URL")
+push_csv("Costco",  ["Title", "Price", "SKU", "Product URL"],        "costco_products.csv", key="Product URL")
+push_csv("eBay",    ["Title", "Price", "Product URL"],               "ebay_products.csv", key="Product URL")
 
 # 7) Write a timestamped log file
 now = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M")
@@ -0,0 +1,241 @@
+# app/streaming.py
+#
+# Staged streaming pipelines: a source generator feeds a chain of stages,
+# each running on its own worker thread(s) and connected by bounded queues.
+# A slow stage fills its input queue and blocks the stage before it
+# (backpressure), so memory stays bounded by the queue sizes instead of the
+# size of the result set, and every stage works on different items at the
+# same time. A stage error stops the pipeline at once; a source error (say a
+# blocked page) ends the stream instead, so items already produced still
+# pass through every stage before the error is raised.
+#
+#   pipeline = StreamPipeline(iter_pages(query), [
+#       Stage("enrich", enrich_page, fan_out=True),
+#       Stage("score", score_product, workers=2),
+#       Stage("export", export_row),
+#   ])
+#   pipeline.run()
+#   print(pipeline.format_report())
+
+import time
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.settings import PIPELINE_QUEUE_SIZE
+
+_DONE = object()
+_POLL = 0.1
+
+
+class _Stopped(Exception):
+    """Raised inside workers once the pipeline is shutting down."""
+
+
+class StageStats:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy = 0.0        # seconds spent inside the stage function
+        self.starved = 0.0     # seconds waiting for input
+        self.blocked = 0.0     # seconds waiting on a full downstream queue
+        self._lock = threading.Lock()
+
+    def add(self, **deltas) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                setattr(self, key, getattr(self, key) + value)
+
+    def as_dict(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "errors": self.errors,
+            "items_per_sec": round(self.items_out / elapsed, 2) if elapsed else 0.0,
+            "busy_sec": round(self.busy, 3),
+            "starved_sec": round(self.starved, 3),
+            "blocked_sec": round(self.blocked, 3),
+        }
+
+
+class Stage:
+    """
+    One step of a StreamPipeline.
+
+    Args:
+        name: Label used in the report
+        fn: Called with each item; returning None drops the item
+        workers: Threads running `fn` (items may be reordered when > 1)
+        queue_size: Capacity of this stage's input queue
+        fan_out: `fn` returns an iterable and each element is passed on
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int = 1,
+                 queue_size: int = PIPELINE_QUEUE_SIZE, fan_out: bool = False):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.fan_out = fan_out
+
+
+class StreamPipeline:
+    def __init__(self, source: Iterable, stages: List[Stage], output_queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.source = source
+        self.stages = stages
+        self.output_queue_size = output_queue_size
+        self.stats = [StageStats("source", 1)] + [StageStats(s.name, s.workers) for s in stages]
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    # ------------------------------------------------------------------
+    # Queue helpers that give up once the pipeline is stopping
+    # ------------------------------------------------------------------
+
+    def _put(self, q: queue.Queue, item: Any, stats: StageStats) -> None:
+        start = time.perf_counter()
+        while True:
+            try:
+                q.put(item, timeout=_POLL)
+                break
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Stopped()
+        stats.add(blocked=time.perf_counter() - start)
+
+    def _get(self, q: queue.Queue, stats: StageStats) -> Any:
+        start = time.perf_counter()
+        while True:
+            try:
+                item = q.get(timeout=_POLL)
+                break
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Stopped()
+        stats.add(starved=time.perf_counter() - start)
+        return item
+
+    def _fail(self, exc: BaseException) -> None:
+        if self._error is None:
+            self._error = exc
+        self._stop.set()
+
+    # ------------------------------------------------------------------
+    # Threads
+    # ------------------------------------------------------------------
+
+    def _run_source(self, out: queue.Queue) -> None:
+        stats = self.stats[0]
+        try:
+            it = iter(self.source)
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    break
+                stats.add(busy=time.perf_counter() - start, items_out=1)
+                self._put(out, item, stats)
+            self._put(out, _DONE, stats)
+        except _Stopped:
+            pass
+        except BaseException as exc:
+            if self._error is None:
+                self._error = exc
+            try:
+                self._put(out, _DONE, stats)
+            except _Stopped:
+                pass
+
+    def _run_stage(self, stage: Stage, stats: StageStats, inq: queue.Queue, out: queue.Queue,
+                   remaining: List[int], lock: threading.Lock) -> None:
+        try:
+            while True:
+                item = self._get(inq, stats)
+                if item is _DONE:
+                    # let sibling workers see it too; the last one out signals downstream
+                    inq.put(_DONE)
+                    with lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last:
+                        self._put(out, _DONE, stats)
+                    return
+                stats.add(items_in=1)
+                start = time.perf_counter()
+                try:
+                    result = stage.fn(item)
+                    results = list(result) if stage.fan_out and result is not None else [result]
+                except Exception:
+                    stats.add(errors=1, busy=time.perf_counter() - start)
+                    raise
+                stats.add(busy=time.perf_counter() - start)
+                for r in results:
+                    if r is not None:
+                        stats.add(items_out=1)
+                        self._put(out, r, stats)
+        except _Stopped:
+            pass
+        except BaseException as exc:
+            self._fail(exc)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def stream(self) -> Iterator[Any]:
+        """Start the stages and yield what the last stage produces."""
+        queues = [queue.Queue(maxsize=s.queue_size) for s in self.stages]
+        queues.append(queue.Queue(maxsize=self.output_queue_size))
+        threads = [threading.Thread(target=self._run_source, args=(queues[0],), daemon=True)]
+        for i, stage in enumerate(self.stages):
+            remaining, lock = [stage.workers], threading.Lock()
+            threads += [
+                threading.Thread(target=self._run_stage, daemon=True,
+                                 args=(stage, self.stats[i + 1], queues[i], queues[i + 1], remaining, lock))
+                for _ in range(stage.workers)
+            ]
+
+        sink = StageStats("output", 1)
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                try:
+                    item = self._get(queues[-1], sink)
+                except _Stopped:
+                    break
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            # consumer stopped early or a stage failed: unblock everyone
+            self._stop.set()
+            for t in threads:
+                t.join()
+            self.elapsed = time.perf_counter() - start
+        if self._error is not None:
+            raise self._error
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Run to completion, discarding the final stage's output; returns the report."""
+        for _ in self.stream():
+            pass
+        return self.report()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        return {s.name: s.as_dict(self.elapsed) for s in self.stats}
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<10}{'in':>8}{'out':>8}{'items/s':>10}{'busy s':>9}{'starved s':>11}{'blocked s':>11}"]
+        for name, s in self.report().items():
+            lines.append(f"{name:<10}{s['items_in']:>8}{s['items_out']:>8}{s['items_per_sec']:>10.1f}"
+                         f"{s['busy_sec']:>9.2f}{s['starved_sec']:>11.2f}{s['blocked_sec']:>11.2f}")
+        lines.append(f"total {self.elapsed:.2f}s")
+        return "\n".join(lines)
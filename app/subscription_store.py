@@ -0,0 +1,176 @@
+# app/subscription_store.py
+
+import os
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.schemas import SubscribeRequest
+from app.settings import SUBSCRIPTIONS_DB
+
+
+class SubscriptionExists(ValueError):
+    pass
+
+
+class SubscriptionStore:
+    """
+    Webhook subscriptions persisted in SQLite and shared by every worker
+    process that opens the same file.
+
+    Reads are served from an in-memory snapshot: a dict by webhook_id plus
+    the subscriptions sorted by ROI threshold. The snapshot is reloaded when
+    SQLite's data_version shows another connection wrote to the database,
+    or after a write through this store.
+    """
+
+    def __init__(self, path: str = SUBSCRIPTIONS_DB):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS subscriptions ("
+            " webhook_id TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " threshold REAL NOT NULL,"
+            " created_at TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_subscriptions_threshold ON subscriptions (threshold)"
+        )
+        self._conn.commit()
+        self._version = None
+        self._by_id: Dict[UUID, SubscribeRequest] = {}
+        self._thresholds: List[float] = []
+        self._by_threshold: List[SubscribeRequest] = []
+
+    # ------------------------------------------------------------------
+    # Read-through snapshot
+    # ------------------------------------------------------------------
+
+    def _data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _snapshot(self) -> None:
+        """Reload from disk if anything changed since the last load (caller holds the lock)."""
+        version = self._data_version()
+        if version == self._version:
+            return
+        rows = self._conn.execute(
+            "SELECT webhook_id, url, threshold FROM subscriptions ORDER BY threshold, webhook_id"
+        ).fetchall()
+        subs = [SubscribeRequest(webhook_id=UUID(w), url=u, threshold=t) for w, u, t in rows]
+        self._by_id = {s.webhook_id: s for s in subs}
+        self._by_threshold = subs
+        self._thresholds = [s.threshold for s in subs]
+        self._version = version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    # ------------------------------------------------------------------
+    # CRUD
+    # ------------------------------------------------------------------
+
+    def add(self, sub: SubscribeRequest) -> SubscribeRequest:
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT INTO subscriptions (webhook_id, url, threshold, created_at) VALUES (?, ?, ?, ?)",
+                        (str(sub.webhook_id), str(sub.url), sub.threshold, datetime.utcnow().isoformat())
+                    )
+            except sqlite3.IntegrityError:
+                raise SubscriptionExists(f"{sub.webhook_id} already registered")
+            # data_version only tracks other connections, so drop our own snapshot
+            self._version = None
+        return sub
+
+    def remove(self, webhook_id: UUID) -> bool:
+        with self._lock:
+            with self._conn:
+                cur = self._conn.execute("DELETE FROM subscriptions WHERE webhook_id = ?", (str(webhook_id),))
+            self._version = None
+        return cur.rowcount > 0
+
+    def get(self, webhook_id: UUID) -> Optional[SubscribeRequest]:
+        with self._lock:
+            self._snapshot()
+            return self._by_id.get(webhook_id)
+
+    def __contains__(self, webhook_id: UUID) -> bool:
+        return self.get(webhook_id) is not None
+
+    def __getitem__(self, webhook_id: UUID) -> SubscribeRequest:
+        sub = self.get(webhook_id)
+        if sub is None:
+            raise KeyError(webhook_id)
+        return sub
+
+    def all(self) -> List[SubscribeRequest]:
+        with self._lock:
+            self._snapshot()
+            return list(self._by_threshold)
+
+    # ------------------------------------------------------------------
+    # Threshold index
+    # ------------------------------------------------------------------
+
+    def subscribers_for(self, roi: float) -> List[SubscribeRequest]:
+        """Every subscription whose threshold is at or below `roi`."""
+        with self._lock:
+            self._snapshot()
+            return self._by_threshold[:bisect_right(self._thresholds, roi)]
+
+    def match(self, items: Iterable, key=lambda item: item.roi) -> List[Tuple[SubscribeRequest, Sequence]]:
+        """
+        Route a batch of scored items to subscribers.
+        Items are sorted by ROI once; each subscriber then takes the suffix
+        at or above its threshold (one bisect), instead of testing every
+        item against every subscriber. Subscribers with no items are omitted.
+        """
+        ranked = sorted(items, key=key)
+        rois = [key(item) for item in ranked]
+        with self._lock:
+            self._snapshot()
+            subs = self._by_threshold[:bisect_right(self._thresholds, rois[-1])] if rois else []
+        matches = []
+        for sub in subs:
+            start = bisect_left(rois, sub.threshold)
+            matches.append((sub, ranked[start:]))
+        return matches
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared: Optional[SubscriptionStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_subscription_store() -> SubscriptionStore:
+    """
+    The process-wide store, opened on first use so importing the app does
+    not create a database. SUBSCRIPTIONS_DB is read from the environment
+    at that point.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SubscriptionStore(os.getenv("SUBSCRIPTIONS_DB", SUBSCRIPTIONS_DB))
+        return _shared
+
+
+def reset_subscription_store() -> None:
+    """Close the shared store; the next get_subscription_store() reopens it."""
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+            _shared = None
@@ -0,0 +1,174 @@
+# test_amazon_scrape.py
+
+import os
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+from app.upc_service import CsvUPCService
+
+try:
+    import app.amazon as amazon
+except ImportError:
+    # app.amazon builds a cloudscraper session at import; nothing here touches the
+    # network, so a plain requests session stands in when cloudscraper isn't installed
+    sys.modules["cloudscraper"] = types.SimpleNamespace(create_scraper=requests.Session)
+    try:
+        import app.amazon as amazon
+    finally:
+        del sys.modules["cloudscraper"]
+
+RESULT = """<div data-component-type="s-search-result" data-asin="{asin}">
+<h2><a href="/dp/{asin}"><span>Item {asin}</span></a></h2>
+<span class="a-price"><span class="a-price-whole">9.</span><span class="a-price-fraction">99</span></span></div>"""
+
+
+def search_page(asins, pages=2):
+    pagination = "".join(f'<li class="a-normal"><a>{n}</a></li>' for n in range(1, pages + 1))
+    body = "".join(RESULT.format(asin=a) for a in asins)
+    return BeautifulSoup(f'<div class="s-main-slot">{body}</div><ul class="a-pagination">{pagination}</ul>',
+                         "html.parser")
+
+
+def test_known_asins_skip_detail_pages(monkeypatch, tmp_path):
+    pages = {1: ["A1", "A2", "A3"], 2: ["A4", "A5"]}
+    search_calls, detail_calls = [], []
+
+    def fake_search(query, page=1, retries=3):
+        search_calls.append(page)
+        return search_page(pages[page])
+
+    def fake_detail(path, retries=2):
+        detail_calls.append(path)
+        digits = "".join(ch for ch in path if ch.isdigit())
+        return BeautifulSoup(f'<div id="detailBullets_feature_div"><li>UPC : 00000000000{digits}</li></div>',
+                             "html.parser")
+
+    monkeypatch.setattr(amazon, "fetch_search_page", fake_search)
+    monkeypatch.setattr(amazon, "fetch_detail_page", fake_detail)
+    monkeypatch.setattr(amazon.time, "sleep", lambda s: None)
+    monkeypatch.setattr(amazon, "detail_rate_limiter", amazon.HostRateLimiter(rate=1000, burst=100))
+
+    cache = CsvUPCService(str(tmp_path / "upc_cache.csv"))
+    cache.update_cache([{"asin": "A2", "upc": "012345678905"}])
+
+    stats = {}
+    results = amazon.scrape_amazon("lego", upc_service=cache, workers=3, stats=stats)
+
+    assert [p["asin"] for p in results] == ["A1", "A2", "A3", "A4", "A5"]
+    assert results[1]["upc"] == "012345678905" and results[0]["upc"] == "000000000001"
+    assert search_calls == [1, 2]  # page 1 is fetched once for both counting and parsing
+    assert sorted(detail_calls) == ["/dp/A1", "/dp/A3", "/dp/A4", "/dp/A5"]
+    assert stats["detail_skipped"] == 1 and stats["pages_saved"] == 2 and stats["upcs_found"] == 4
+    assert cache.lookup("A5") == "000000000005"
+
+
+def test_failed_run_resumes_from_checkpoint(monkeypatch, tmp_path):
+    from app.checkpoint import checkpoint_for
+
+    search_calls, detail_calls = [], []
+    fail = {"search": 3, "detail": "/dp/P201"}
+
+    def fake_search(query, page=1, retries=3):
+        search_calls.append(page)
+        if page == fail.get("search"):
+            del fail["search"]
+            raise ConnectionError("blocked")
+        return search_page([f"P{page}0{i}" for i in range(3)], pages=4)
+
+    def fake_detail(path, retries=2):
+        detail_calls.append(path)
+        if path == fail.get("detail"):
+            del fail["detail"]
+            return None
+        return BeautifulSoup('<div id="detailBullets_feature_div"><li>UPC : 012345678905</li></div>',
+                             "html.parser")
+
+    monkeypatch.setattr(amazon, "fetch_search_page", fake_search)
+    monkeypatch.setattr(amazon, "fetch_detail_page", fake_detail)
+    monkeypatch.setattr(amazon.time, "sleep", lambda s: None)
+    monkeypatch.setattr(amazon, "detail_rate_limiter", amazon.HostRateLimiter(rate=1000, burst=100))
+    cache = CsvUPCService(str(tmp_path / "upc_cache.csv"))
+
+    def checkpoint():
+        return checkpoint_for("amazon_search", directory=str(tmp_path), query="lego", max_pages=None)
+
+    with pytest.raises(ConnectionError):
+        amazon.scrape_amazon("lego", upc_service=cache, checkpoint=checkpoint())
+    assert search_calls == [1, 2, 3]
+
+    cp = checkpoint()
+    assert cp.state["last_page"] == 2 and cp.pending == {"P201": "/dp/P201"}
+    results = amazon.scrape_amazon("lego", upc_service=cache, checkpoint=cp)
+
+    assert search_calls == [1, 2, 3, 3, 4]  # page count came from the checkpoint
+    assert detail_calls.count("/dp/P201") == 2 and detail_calls.count("/dp/P100") == 1
+    assert len(results) == 12 and all(p["upc"] == "012345678905" for p in results)
+
+    # kept until the caller has written the output; a repeat call just returns the items
+    assert checkpoint().done
+    assert len(amazon.scrape_amazon("lego", upc_service=cache, checkpoint=checkpoint())) == 12
+    assert search_calls == [1, 2, 3, 3, 4]
+    cp.discard()
+    assert not os.path.exists(cp.path)
+
+
+def test_pipeline_resumes_at_first_unexported_page(monkeypatch, tmp_path):
+    from app.checkpoint import checkpoint_for
+    from app.fake_sheets import FakeSheetsClient
+    from app.pipeline import run_amazon_pipeline
+    from app.sheets_writer import open_worksheet
+
+    search_calls, fail = [], {3}
+
+    def fake_search(query, page=1, retries=3):
+        search_calls.append(page)
+        if page in fail:
+            fail.discard(page)
+            raise ConnectionError("blocked")
+        # the last card repeats on the next page, as sponsored results do
+        return search_page([f"P{page}0{i}" for i in range(3)] + [f"P{page + 1}00"], pages=4)
+
+    monkeypatch.setattr(amazon, "fetch_search_page", fake_search)
+    monkeypatch.setattr(amazon.time, "sleep", lambda s: None)
+    cache = CsvUPCService(str(tmp_path / "upc_cache.csv"))
+    cache.update_cache([{"asin": f"P{p}0{i}", "upc": "012345678905"} for p in range(1, 6) for i in range(3)])
+    ws = open_worksheet(FakeSheetsClient(), "ProductResults", "Amazon")
+
+    def checkpoint():
+        return checkpoint_for("amazon_pipeline", directory=str(tmp_path), query="lego", max_pages=None)
+
+    with pytest.raises(ConnectionError):
+        run_amazon_pipeline("lego", ws=ws, upc_service=cache, checkpoint=checkpoint())
+    cp = checkpoint()
+    assert cp.state["last_page"] == 2 and cp.state["max_pages"] == 4 and len(cp.items) == 7
+
+    run_amazon_pipeline("lego", ws=ws, upc_service=cache, checkpoint=cp)
+    assert search_calls == [1, 2, 3, 3, 4]
+    asins = [row[0] for row in ws.get_all_values()[1:]]
+    assert sorted(asins) == sorted({f"P{p}0{i}" for p in range(1, 5) for i in range(3)} | {"P500"})
+    assert not os.path.exists(cp.path)
+
+
+def test_detail_requests_to_one_host_are_spaced(monkeypatch):
+    starts = []
+
+    def fake_detail(path, retries=2):
+        starts.append(time.monotonic())
+        return None
+
+    monkeypatch.setattr(amazon, "fetch_detail_page", fake_detail)
+    monkeypatch.setattr(amazon, "detail_rate_limiter", amazon.HostRateLimiter(rate=20, burst=1))
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        assert list(pool.map(amazon.detail_upc, [f"/dp/A{i}" for i in range(5)])) == [(None, False)] * 5
+
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    # five workers, but one request start per 1/20 s
+    assert min(gaps) > 0.04 and starts[-1] - starts[0] > 0.19
@@ -0,0 +1,60 @@
+# test_browser_pool.py
+
+import pytest
+
+from app.browser_pool import BrowserPool
+
+
+class StubDriver:
+    def __init__(self):
+        self.urls = []
+        self.quit_called = False
+        self.alive = True
+
+    def get(self, url):
+        self.urls.append(url)
+
+    @property
+    def page_source(self):
+        return f"<html>{self.urls[-1]}</html>"
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_reuses_recycles_and_replaces_drivers():
+    created = []
+    pool = BrowserPool(lambda: created.append(StubDriver()) or created[-1], size=1, max_pages=2)
+
+    with pool.lease() as browser:
+        browser.get("https://example.com/1")
+        assert browser.page_source == "<html>https://example.com/1</html>"
+    with pool.lease() as browser:
+        browser.get("https://example.com/2")
+    assert len(created) == 1 and created[0].quit_called  # page budget spent -> recycled
+
+    with pool.lease() as browser:
+        browser.get("https://example.com/3")
+    created[1].alive = False  # crashed while idle
+    with pool.lease() as browser:
+        assert browser.driver is created[2]
+
+    metrics = pool.metrics()
+    assert metrics["created"] == 3 and metrics["recycled"] == 1 and metrics["unhealthy"] == 1
+    pool.close()
+    assert created[2].quit_called
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+
+
+def test_amazon_selenium_uses_the_shared_pool():
+    for module in ("cloudscraper", "selenium", "undetected_chromedriver"):
+        pytest.importorskip(module)
+    import app.amazon_selenium as amazon_selenium
+
+    assert isinstance(amazon_selenium.browser_pool(), BrowserPool)
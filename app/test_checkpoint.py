@@ -0,0 +1,59 @@
+# test_checkpoint.py
+
+import csv
+
+import pytest
+import requests
+
+import app.scraper as scraper
+from app.checkpoint import checkpoint_for, write_rows_csv
+
+
+class FakeResponse:
+    def __init__(self, text, status=200):
+        self.text, self.status_code = text, status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} block page")
+
+
+def category_page(n, last):
+    cards = "".join(
+        f'<div><a href="/dp/B{n:04d}{i:05d}">Item {n}-{i}</a><span class="a-price-whole">{n}.</span></div>'
+        for i in range(3)
+    )
+    nxt = "" if n == last else f'<ul class="a-pagination"><li class="a-last"><a href="/s?page={n + 1}">Next</a></li></ul>'
+    return f"<html><body>{cards}{nxt}</body></html>"
+
+
+def test_category_walk_resumes_after_block(monkeypatch, tmp_path):
+    fetched, blocked = [], {4}
+
+    def fake_get(url, headers=None, timeout=None):
+        page = int(url.split("page=")[1]) if "page=" in url else 1
+        fetched.append(page)
+        if page in blocked:
+            blocked.discard(page)
+            return FakeResponse("<html>Robot check</html>", status=503)
+        return FakeResponse(category_page(page, last=6))
+
+    monkeypatch.setattr(scraper.requests, "get", fake_get)
+    cp = checkpoint_for("amazon_category", directory=str(tmp_path), base_url="https://www.amazon.com/s?k=x")
+
+    with pytest.raises(requests.HTTPError):
+        scraper.scrape_amazon_category("https://www.amazon.com/s?k=x", checkpoint=cp)
+    assert fetched == [1, 2, 3, 4]
+
+    # a new process would build the same checkpoint from the same parameters
+    cp = checkpoint_for("amazon_category", directory=str(tmp_path), base_url="https://www.amazon.com/s?k=x")
+    assert cp.resumed and cp.state["pages_done"] == 3 and len(cp.items) == 9
+    items = scraper.scrape_amazon_category("https://www.amazon.com/s?k=x", checkpoint=cp)
+    assert fetched == [1, 2, 3, 4, 4, 5, 6]
+    assert len(items) == len({i["ASIN"] for i in items}) == 18
+
+    out = tmp_path / "asins.csv"
+    for _ in range(2):
+        assert write_rows_csv(str(out), items + items[:5], ["ASIN", "Title", "Price"], key="ASIN") == 18
+    with open(out, newline="", encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == 18
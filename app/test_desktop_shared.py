@@ -0,0 +1,29 @@
+# test_desktop_shared.py
+#
+# The Desktop release imports html_parser and browser_pool flat from
+# Dealvoy_Desktop_Release/source_scrapers/. Those names must resolve to the
+# app modules rather than to a second copy of the code.
+
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+DESKTOP = ROOT / "Dealvoy_Desktop_Release" / "source_scrapers"
+
+
+@pytest.mark.parametrize("module", ["html_parser", "browser_pool"])
+def test_desktop_import_is_the_app_module(module):
+    # a fresh interpreter with only the Desktop directory on sys.path, as the scrapers run
+    probe = (f"import {module}, sys\n"
+             f"print({module} is sys.modules['app.{module}'], {module}.__file__)\n")
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=DESKTOP, capture_output=True, text=True)
+
+    assert proc.returncode == 0, proc.stderr
+    same, path = proc.stdout.split()
+    assert same == "True"
+    assert Path(path) == ROOT / "app" / f"{module}.py"
+
@@ -0,0 +1,122 @@
+# test_fanout.py
+
+import asyncio
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+import app.orchestrator as orchestrator
+from app.fanout import FanoutEngine
+from app.schemas import SubscribeRequest
+from app.subscription_store import SubscriptionStore
+
+
+def test_stream_covers_full_matrix_and_reports_errors():
+    def good(upc):
+        return f"good-{upc}"
+
+    async def also_good(upc):
+        return f"async-{upc}"
+
+    def bad(upc):
+        raise RuntimeError("blocked")
+
+    engine = FanoutEngine({"good": good, "async": also_good, "bad": bad})
+
+    async def run():
+        return [r async for r in engine.stream(["1", "2"])]
+
+    results = asyncio.run(run())
+    assert len(results) == 6
+    assert ("good", "1", "good-1") in results
+    assert ("async", "2", "async-2") in results
+    assert all(isinstance(r, RuntimeError) for name, _, r in results if name == "bad")
+
+    report = engine.latency_report()
+    assert report["good"]["calls"] == 2
+    assert report["bad"]["errors"] == 2
+
+
+def test_per_source_limit_is_respected():
+    lock = threading.Lock()
+    in_flight = {"now": 0, "peak": 0}
+
+    def slow(upc):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return upc
+
+    engine = FanoutEngine({"slow": slow}, per_source_limit=2, thread_workers=8)
+
+    async def run():
+        return [r async for r in engine.stream([str(i) for i in range(10)])]
+
+    assert len(asyncio.run(run())) == 10
+    assert in_flight["peak"] <= 2
+
+
+def test_slow_source_does_not_starve_fast_one():
+    finished = {}
+
+    async def slow(upc):
+        await asyncio.sleep(0.5)
+        return upc
+
+    async def fast(upc):
+        await asyncio.sleep(0.01)
+        return upc
+
+    engine = FanoutEngine({"slow": slow, "fast": fast}, max_concurrency=4, per_source_limit=2)
+
+    async def run():
+        start = time.perf_counter()
+        async for name, _, _ in engine.stream([str(i) for i in range(20)]):
+            finished[name] = time.perf_counter() - start
+
+    asyncio.run(run())
+    # 20 fast calls two at a time; before, queued slow tasks held the global slots
+    assert finished["fast"] < 0.5
+
+
+def test_run_skips_not_found_snapshots(monkeypatch):
+    def found(upc):
+        return SimpleNamespace(upc=upc, price=5.0, previous_price=10.0)
+
+    def not_found(upc):
+        return None
+
+    sent = []
+    monkeypatch.setattr(orchestrator, "registry", {"found": found, "missing": not_found})
+    monkeypatch.setattr(orchestrator.scrape_cache, "wrap_all", dict)
+    monkeypatch.setattr(orchestrator, "dispatch_items_to_webhook",
+                        lambda webhook_id, items, db: sent.extend(items) or {"dispatched": len(items), "failed": 0})
+
+    result = asyncio.run(orchestrator.run_all_scrapers_async("hook", ["1", "2"], db=None))
+    assert result["dispatched"] == 2
+    assert sorted(item.upc for item in sent) == ["1", "2"]
+
+
+def test_broadcast_routes_items_by_subscriber_threshold(monkeypatch, tmp_path):
+    def scraper(upc):
+        # ROI 0.25 for UPC "1", 0.75 for "2"
+        return SimpleNamespace(upc=upc, price=10.0 - 5.0 * (upc == "2") - 2.5 * (upc == "1"), previous_price=10.0)
+
+    store = SubscriptionStore(str(tmp_path / "subs.db"))
+    low = store.add(SubscribeRequest(webhook_id=uuid.uuid4(), url="http://low.test/", threshold=0.2))
+    high = store.add(SubscribeRequest(webhook_id=uuid.uuid4(), url="http://high.test/", threshold=0.5))
+    queued = {}
+    monkeypatch.setattr(orchestrator, "registry", {"src": scraper})
+    monkeypatch.setattr(orchestrator.scrape_cache, "wrap_all", dict)
+    monkeypatch.setattr(orchestrator, "queue_items",
+                        lambda webhook_id, items, db: queued.update({webhook_id: sorted(i.upc for i in items)})
+                        or (len(items), 0))
+
+    result = asyncio.run(orchestrator.run_all_scrapers_async(
+        None, ["1", "2"], db=SimpleNamespace(commit=lambda: None), store=store))
+    assert queued == {low.webhook_id: ["1", "2"], high.webhook_id: ["2"]}
+    assert result["dispatched"] == 3
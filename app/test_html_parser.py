@@ -0,0 +1,67 @@
+# test_html_parser.py
+
+import re
+
+import pytest
+
+from app.html_parser import available_backends, parse_html, resolve_backend
+
+PAGE = """<html><head><title>Lego set</title></head><body>
+<div class="s-main-slot">
+  <div data-component-type="s-search-result" data-asin="B001" class="s-result-item sg-col">
+    <h2><a href="/dp/B001"><span> Lego Castle </span></a></h2>
+    <span class="a-price"><span class="a-price-whole">19.</span><span class="a-price-fraction">99</span></span>
+    <img class="s-image" src="/img/1.jpg">
+  </div>
+  <div data-component-type="s-search-result" data-asin="B002" class="s-result-item">
+    <h2><a href="/dp/B002" title="Ship"><span>Lego Ship</span></a></h2>
+    <p class="stock-msg">Currently <b>out of stock</b></p>
+  </div>
+</div>
+<table id="productDetails"><tr><th>UPC</th><td>012345678905</td></tr></table>
+</body></html>"""
+
+
+def signature(result):
+    """Backend-neutral view of a find/select result"""
+    if result is None:
+        return None
+    if isinstance(result, list):
+        return [signature(r) for r in result]
+    if isinstance(result, (str, bool)):
+        parent = getattr(result, "parent", None)
+        return (str(result), parent.name if parent is not None else None)
+    return (result.name, result.get_text(strip=True), sorted((k, str(v)) for k, v in result.attrs.items()))
+
+
+QUERIES = [
+    lambda s: s.select("div.s-main-slot div[data-component-type='s-search-result']"),
+    lambda s: s.select_one("h2 a span"),
+    lambda s: [c.select_one("h2 a").get("href") for c in s.select("div[data-asin]")],
+    lambda s: [c["data-asin"] for c in s.find_all("div", class_="s-result-item")],
+    lambda s: s.find_all("div", class_=re.compile(r"result")),
+    lambda s: s.find("span", class_=re.compile(r"price-whole")),
+    lambda s: s.find_all("a", href=True),
+    lambda s: s.find("a", title=True),
+    lambda s: s.find("img", {"class": "s-image"}),
+    lambda s: s.find_all("div", attrs={"data-asin": re.compile(r"^B00")}),
+    lambda s: s.find_all(string=re.compile(r"out of stock", re.I)),
+    lambda s: s.find("b", string=re.compile("stock")),
+    lambda s: s.find("th").find_parent("table").get("id"),
+    lambda s: s.select_one("div[data-asin]").find_all("span", recursive=False),
+    lambda s: [s.title.get_text(), s.find("td").text, s.find("h2").get_text(" ", strip=True)],
+    lambda s: s.find("img").has_attr("src") and not s.find("img").has_attr("alt"),
+]
+
+
+@pytest.mark.parametrize("backend", [b for b in available_backends() if b != "html.parser"])
+def test_backend_matches_html_parser(backend):
+    reference, fast = parse_html(PAGE, "html.parser"), parse_html(PAGE, backend)
+    for n, query in enumerate(QUERIES):
+        assert signature(query(fast)) == signature(query(reference)), f"query {n}"
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        resolve_backend("regex")
+    assert resolve_backend("html.parser") == "html.parser"
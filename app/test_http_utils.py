@@ -0,0 +1,111 @@
+# test_http_utils.py
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import app.http_utils as http_utils
+from app.http_utils import SessionPool
+
+
+@pytest.fixture
+def server():
+    """Local keep-alive HTTP server; yields (port, request arrival times)"""
+    arrivals = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            arrivals.append(time.monotonic())
+            body = b"ok"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_address[1], arrivals
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = SessionPool()
+    monkeypatch.setattr(http_utils, "session_pool", pool)
+    monkeypatch.setattr(http_utils, "proxy_endpoints", [])
+    monkeypatch.setattr(http_utils, "rate_limiter", http_utils.HostRateLimiter(rate=1000, burst=100))
+    yield pool
+    pool.close()
+
+
+def test_sessions_are_shared_per_host_and_proxy():
+    pool = SessionPool()
+    session = pool.get("https://shop.test/a")
+    assert pool.get("https://shop.test/b?page=2") is session
+    assert pool.get("http://shop.test/a") is not session
+    assert pool.get("https://other.test/a") is not session
+    proxied = pool.get("https://shop.test/a", proxy="http://proxy1:8080")
+    assert proxied is not session
+    assert pool.get("https://shop.test/c", proxy="http://proxy1:8080") is proxied
+    pool.close()
+
+
+def test_connections_are_reused_per_host(pool, server):
+    port, arrivals = server
+    for n in range(5):
+        assert http_utils.fetch_with_retries(f"http://127.0.0.1:{port}/item/{n}").text == "ok"
+
+    assert http_utils.connection_stats() == {
+        "sessions": 1, "requests": 5, "new_connections": 1, "reused_connections": 4,
+    }
+
+    # a second host name for the same server gets its own session and socket
+    for n in range(3):
+        http_utils.fetch_with_retries(f"http://localhost:{port}/item/{n}")
+    assert http_utils.connection_stats() == {
+        "sessions": 2, "requests": 8, "new_connections": 2, "reused_connections": 6,
+    }
+    assert len(arrivals) == 8
+
+
+def _assert_spaced(arrivals, interval):
+    arrivals = sorted(arrivals)
+    gaps = [b - a for a, b in zip(arrivals, arrivals[1:])]
+    assert min(gaps) > interval * 0.8, gaps
+
+
+def test_request_starts_to_one_host_are_spaced(pool, server, monkeypatch):
+    port, arrivals = server
+    monkeypatch.setattr(http_utils, "rate_limiter", http_utils.HostRateLimiter(rate=20, burst=1))
+
+    results = http_utils.fetch_concurrent([f"http://127.0.0.1:{port}/item/{n}" for n in range(5)], max_workers=5)
+    assert len(results) == 5 and all(resp.status_code == 200 for _, resp in results)
+    # five workers in flight, but one request start per 1/20 s
+    _assert_spaced(arrivals, 0.05)
+
+
+def test_async_request_starts_to_one_host_are_spaced(pool, server, monkeypatch):
+    port, arrivals = server
+    monkeypatch.setattr(http_utils, "rate_limiter", http_utils.HostRateLimiter(rate=20, burst=1))
+
+    urls = [f"http://127.0.0.1:{port}/item/{n}" for n in range(5)]
+    results = asyncio.run(http_utils.fetch_concurrent_async(urls, max_workers=5))
+    assert sorted(url for url, _ in results) == urls and all(resp.status_code == 200 for _, resp in results)
+    _assert_spaced(arrivals, 0.05)
+
+
+def test_hosts_have_separate_buckets():
+    limiter = http_utils.HostRateLimiter(rate=1, burst=2)
+    assert [limiter._delay("https://shop.test/x") for _ in range(2)] == [0.0, 0.0]
+    assert limiter._delay("https://shop.test/y") > 0.9
+    assert limiter._delay("https://other.test/x") == 0.0
@@ -0,0 +1,74 @@
+# test_pipeline_adapters.py
+
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+import app.pipeline_adapters as pipeline_adapters
+from app.pipeline_adapters import PipelineWorker
+
+# Speaks the app/pipeline_worker.py protocol; "slow" never answers in time
+STUB_WORKER = r"""
+import os, sys, json, time
+for line in sys.stdin:
+    upc = json.loads(line)["upc"]
+    if upc == "slow":
+        time.sleep(30)
+    print(json.dumps({"ok": True, "data": {"upc": upc, "price": 1.0, "pid": os.getpid()}}), flush=True)
+"""
+
+
+def test_worker_times_out_and_restarts():
+    worker = PipelineWorker("stub", timeout=0.5)
+    worker.command = [sys.executable, "-c", STUB_WORKER]
+    try:
+        first = worker.call("012345678905")
+        assert first["upc"] == "012345678905"
+
+        hung = worker._proc
+        with pytest.raises(TimeoutError):
+            worker.call("slow")
+        # the hung process was killed rather than left holding the pipe
+        assert hung.poll() is not None and worker._proc is None
+
+        again = worker.call("036000291452")
+        assert again["upc"] == "036000291452" and again["pid"] != first["pid"]
+    finally:
+        worker.close()
+
+
+def test_main_style_pipelines_run_in_their_worker(monkeypatch):
+    printer = types.ModuleType("app.run_printer_pipeline")
+    printer.main = lambda upc: pytest.fail("main() must not run in the app process")
+    monkeypatch.setitem(sys.modules, "app.run_printer_pipeline", printer)
+    calls = []
+    monkeypatch.setattr(pipeline_adapters, "get_worker",
+                        lambda source: SimpleNamespace(call=lambda upc: calls.append((source, upc))
+                                                       or {"upc": upc, "price": 3.0}))
+
+    snapshot = pipeline_adapters.run_pipeline("printer", "012345678905", mode="inprocess")
+    assert snapshot.price == 3.0 and calls == [("printer", "012345678905")]
+
+    # get_snapshot() pipelines are still plain function calls
+    assert pipeline_adapters.run_pipeline("echo", "036000291452", mode="inprocess").roi == 0.2
+    assert len(calls) == 1
+
+
+def test_amazon_pipeline_returns_a_snapshot_inprocess(monkeypatch):
+    import app.run_amazon_pipeline as run_amazon_pipeline
+
+    monkeypatch.setattr(run_amazon_pipeline, "scrape_amazon", lambda upc: [
+        {"asin": "B000000001", "price": None},
+        {"asin": "B000000002", "price": "1,299..99"},
+    ])
+    monkeypatch.delitem(pipeline_adapters._entrypoints, "amazon", raising=False)
+
+    snapshot = pipeline_adapters.run_pipeline("amazon", "012345678905", mode="inprocess")
+    assert snapshot.upc == "012345678905"
+    assert snapshot.price == snapshot.previous_price == 1299.99 and snapshot.roi == 0.0
+
+    monkeypatch.setattr(run_amazon_pipeline, "scrape_amazon", lambda upc: [])
+    with pytest.raises(LookupError):
+        pipeline_adapters.run_pipeline("amazon", "036000291452", mode="inprocess")
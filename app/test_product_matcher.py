@@ -0,0 +1,54 @@
+# test_product_matcher.py
+
+from app.upc_service import CsvUPCService
+from app.vision.match_product import ProductMatcher
+from app.vision.product_index import ProductIndex, TrigramIndex
+
+
+def test_matcher_indexes_scraped_catalog(tmp_path):
+    catalog = tmp_path / "product_catalog.csv"
+    catalog.write_text(
+        "ASIN,Title,Price,UPC,Brand,Model\n"
+        "B001,Apple iPhone 15 Pro 128GB Black Titanium,$999.00,194253434567,Apple,A3108\n"
+        "B002,Samsung Galaxy S24 Ultra 256GB,$1199.00,,Samsung,SM-S928U\n"
+        "B003,LEGO Star Wars Millennium Falcon 75257,$159.99,673419304511,LEGO,75257\n",
+        encoding="utf-8",
+    )
+    # B002 was scraped without a UPC; the ASIN cache has it
+    upcs = CsvUPCService(str(tmp_path / "upc_cache.csv"))
+    upcs.update_cache([{"asin": "B002", "upc": "887276752471"}])
+
+    matcher = ProductMatcher(tmp_path, catalog="product_catalog.csv", upc_service=upcs)
+    assert len(matcher.index) == 3
+
+    # exact hash lookups: UPC with an EAN-13 leading zero, model with other punctuation
+    assert matcher.match_by_upc("0887276752471")["product"]["asin"] == "B002"
+    assert matcher.match_by_upc("000000000000") is None
+    model = matcher.match_by_model("sm s928u")
+    assert model[0]["match_type"] == "model_exact" and model[0]["product"]["asin"] == "B002"
+
+    # OCR fragment with character errors still finds the title
+    names = matcher.match_by_name("MILLENNIUM FALC0N 75257", threshold=60)
+    assert names[0]["product"]["asin"] == "B003" and names[0]["confidence"] >= 90
+    assert matcher.match_by_brand("SAMSUNG")[0]["product"]["asin"] == "B002"
+
+    best = matcher.top_k("iphone 15 pro", k=2)
+    assert best[0]["product"]["asin"] == "B001" and len(best) <= 2
+
+
+def test_top_k_limits_results_and_postings_read():
+    index = ProductIndex(
+        {"name": f"Wireless Speaker {i:05d}", "brand": "Sony", "model": f"SRS{i:05d}"} for i in range(5000)
+    )
+    brand = index.top_k("sony", "brand", k=3)
+    assert len(brand) == 3 and all(p["brand"] == "Sony" for p, _ in brand)
+
+    hits = index.top_k("wireless speaker 04217", "name", k=5)
+    assert hits[0][0]["name"] == "Wireless Speaker 04217" and hits[0][1] == 100
+    assert index.top_k("srs04217", "model", k=1)[0][0]["model"] == "SRS04217"
+
+    # common trigrams are skipped once the budget is spent, the rare ones decide
+    trigrams = TrigramIndex()
+    for i in range(5000):
+        trigrams.add(i, f"wireless speaker {i:05d}")
+    assert trigrams.candidates("wireless speaker 04217", limit=1, budget=100)[0][0] == 4217
@@ -0,0 +1,119 @@
+# test_scrape_cache.py
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.scrape_cache import SingleFlightCache
+
+
+def test_concurrent_calls_share_one_fetch_and_repeats_hit_cache():
+    cache = SingleFlightCache(ttl=60)
+    calls = []
+
+    def fetch(upc):
+        calls.append(upc)
+        time.sleep(0.1)
+        return {"upc": upc}
+
+    cached = cache.wrap("amazon", fetch)
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(cached, ["1"] * 5))
+    assert calls == ["1"]
+    assert all(r == {"upc": "1"} for r in results)
+
+    assert cached("1") == {"upc": "1"}
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["coalesced"] == 4 and stats["hits"] == 1
+
+
+def test_not_found_is_cached_briefly_and_errors_are_not():
+    cache = SingleFlightCache(ttl=60, negative_ttl=0.05)
+    calls = []
+
+    def fetch(upc):
+        calls.append(upc)
+        if upc == "missing":
+            raise LookupError(upc)
+        if upc == "boom":
+            raise RuntimeError(upc)
+        return upc
+
+    for _ in range(2):
+        with pytest.raises(LookupError):
+            cache.call("src", fetch, "missing")
+        with pytest.raises(RuntimeError):
+            cache.call("src", fetch, "boom")
+    assert calls.count("missing") == 1 and calls.count("boom") == 2
+    assert cache.stats()["negative_hits"] == 1
+
+    time.sleep(0.06)
+    with pytest.raises(LookupError):
+        cache.call("src", fetch, "missing")
+    assert calls.count("missing") == 2
+
+
+def test_async_scrapers_coalesce_on_the_loop():
+    cache = SingleFlightCache(ttl=60)
+    calls = []
+
+    async def fetch(upc):
+        calls.append(upc)
+        await asyncio.sleep(0.05)
+        return upc
+
+    cached = cache.wrap("async_src", fetch)
+
+    async def run():
+        return await asyncio.gather(*(cached("9") for _ in range(4)))
+
+    assert asyncio.run(run()) == ["9"] * 4
+    assert calls == ["9"]
+
+
+def test_cancelling_the_first_caller_leaves_the_fetch_to_waiters():
+    cache = SingleFlightCache(ttl=60)
+    calls = []
+
+    async def fetch(upc):
+        calls.append(upc)
+        await asyncio.sleep(0.1)
+        return upc
+
+    async def run():
+        first = asyncio.ensure_future(cache.acall("src", fetch, "7"))
+        second = asyncio.ensure_future(cache.acall("src", fetch, "7"))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "7"
+    assert calls == ["7"]
+    assert cache.stats()["inflight"] == 0
+
+
+def test_cancelling_the_only_caller_cancels_the_fetch():
+    cache = SingleFlightCache(ttl=60)
+    finished = []
+
+    async def fetch(upc):
+        await asyncio.sleep(0.1)
+        finished.append(upc)
+        return upc
+
+    async def run():
+        caller = asyncio.ensure_future(cache.acall("src", fetch, "7"))
+        await asyncio.sleep(0.02)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0.15)
+        # a later call starts a fresh fetch instead of joining the dead one
+        return await cache.acall("src", fetch, "7")
+
+    assert asyncio.run(run()) == "7"
+    assert finished == ["7"]
@@ -0,0 +1,84 @@
+# test_scrape_endpoint.py
+
+import time
+import uuid
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main as main
+from app.job_store import JobStore, reset_job_store
+from app.subscription_store import reset_subscription_store
+
+
+def fake_scrape(upc):
+    time.sleep(1.0 if upc == "slow" else 0.2)
+    if upc == "missing":
+        return None
+    return SimpleNamespace(upc=upc, price=10.0, roi=0.5)
+
+
+@pytest.fixture(autouse=True)
+def subscriptions_db(monkeypatch, tmp_path):
+    monkeypatch.setenv("SUBSCRIPTIONS_DB", str(tmp_path / "subs.db"))
+    reset_subscription_store()
+    reset_job_store()
+    yield
+    reset_subscription_store()
+    reset_job_store()
+
+
+def setup(monkeypatch, tmp_path):
+    received = []
+
+    def receiver(request):
+        received.append(request)
+        return httpx.Response(200)
+
+    main.scrape_cache.invalidate()
+    monkeypatch.setattr(main, "scrape_amazon", fake_scrape)
+    monkeypatch.setattr(main, "get_http_client",
+                        lambda: httpx.AsyncClient(transport=httpx.MockTransport(receiver)))
+    webhook_id = str(uuid.uuid4())
+    client = TestClient(main.app)
+    client.post("/subscribe", json={"webhook_id": webhook_id, "url": "http://hook.test/", "threshold": 0.1})
+    return client, {"X-Webhook-ID": webhook_id}, received
+
+
+def test_scrapes_run_concurrently_and_deadline_returns_partial(monkeypatch, tmp_path):
+    client, headers, received = setup(monkeypatch, tmp_path)
+
+    start = time.perf_counter()
+    body = client.post("/scrape/", json=["1", "2", "3", "4"], headers=headers).json()
+    assert body["status"] == "success" and body["dispatched"] == 4
+    assert time.perf_counter() - start < 0.7
+
+    body = client.post("/scrape/?deadline=0.5", json=["1", "slow"], headers=headers).json()
+    assert body["status"] == "partial"
+    assert body["dispatched"] == 1 and body["timed_out"] == 1
+    assert len(received) == 2
+
+
+def test_background_job_returns_immediately_and_reports_result(monkeypatch, tmp_path):
+    client, headers, received = setup(monkeypatch, tmp_path)
+    # the app's shutdown hook closes the scrape pool; give it a private one
+    monkeypatch.setattr(main, "scrape_executor", ThreadPoolExecutor(max_workers=4))
+
+    with client:
+        body = client.post("/scrape/?background=true", json=["1", "2", "missing"], headers=headers).json()
+        assert body["status"] == "accepted" and body["job_id"]
+
+        for _ in range(50):
+            status = client.get(f"/scrape/jobs/{body['job_id']}").json()
+            if status["status"] != "running":
+                break
+            time.sleep(0.05)
+    assert status["status"] == "success" and status["dispatched"] == 2
+    assert len(received) == 1
+    # another worker polling the same database sees the finished job
+    other_worker = JobStore(str(tmp_path / "subs.db"))
+    assert other_worker.get(body["job_id"])["result"].dispatched == 2
+    assert other_worker.get("unknown") is None
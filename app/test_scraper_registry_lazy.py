@@ -0,0 +1,75 @@
+# test_scraper_registry_lazy.py
+
+import sys
+
+import pytest
+
+import app.services.scrapers as scrapers
+
+PACKAGE = scrapers.__name__
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    """Fresh lazy registry over a package holding foo_scraper and bar_scraper"""
+    for name in ("foo", "bar"):
+        (tmp_path / f"{name}_scraper.py").write_text(
+            f"async def scrape_{name}():\n    return [{{'source': '{name}'}}]\n"
+        )
+    monkeypatch.setattr(scrapers, "__path__", [str(tmp_path)])
+    fresh = scrapers._LazyScraperRegistry()
+    monkeypatch.setattr(scrapers, "SCRAPER_REGISTRY", fresh)
+    yield fresh
+    for name in ("foo", "bar"):
+        sys.modules.pop(f"{PACKAGE}.{name}_scraper", None)
+
+
+def test_lookup_imports_only_matching_module(registry):
+    fn = registry["Foo"]
+
+    assert fn.__name__ == "scrape_foo"
+    assert f"{PACKAGE}.foo_scraper" in sys.modules
+    assert f"{PACKAGE}.bar_scraper" not in sys.modules
+
+
+def test_iterating_registers_every_module(registry):
+    assert sorted(registry) == ["Bar", "Foo"]
+    assert len(registry) == 2
+    assert f"{PACKAGE}.bar_scraper" in sys.modules
+
+
+def test_discover_scrapers_imports_requested_sources_only(registry):
+    found = scrapers.discover_scrapers(["Foo"])
+
+    assert list(found) == ["Foo"]
+    assert f"{PACKAGE}.bar_scraper" not in sys.modules
+
+
+def test_explicit_registration_survives_lazy_load(registry):
+    async def override():
+        return []
+
+    registry["Foo"] = override
+    list(registry)
+
+    assert registry["Foo"] is override
+    assert registry["Bar"].__name__ == "scrape_bar"
+
+
+def test_membership_answers_without_importing(registry):
+    assert "Foo" in registry
+    assert "Nope" not in registry
+    assert f"{PACKAGE}.foo_scraper" not in sys.modules
+    assert f"{PACKAGE}.bar_scraper" not in sys.modules
+    with pytest.raises(KeyError):
+        registry["Nope"]
+    assert f"{PACKAGE}.bar_scraper" not in sys.modules
+
+
+def test_delete_after_lazy_load(registry):
+    registry["Foo"]
+    del registry["Foo"]
+
+    # the module is already imported, so the key is not re-registered
+    assert "Foo" not in registry
+    assert sorted(registry) == ["Bar"]
@@ -0,0 +1,111 @@
+# test_sheets_writer.py
+
+import random
+
+from app.fake_sheets import FakeSheetsClient
+from app.sheets_writer import SheetWriter, clear_rows, open_worksheet, write_rows
+
+HEADERS = ["ASIN", "Title", "Price"]
+
+
+def export(ws, rows, **kwargs):
+    writer = SheetWriter(ws, headers=HEADERS, chunk_size=50, **kwargs)
+    writer.add_many(rows)
+    return writer.flush()
+
+
+def test_reexports_only_write_changed_rows(tmp_path):
+    rng = random.Random(7)
+    ws = open_worksheet(FakeSheetsClient(), "ProductResults", "Amazon")
+    snapshot = str(tmp_path / "amazon.json")
+    rows = {f"B{n:05d}": [f"B{n:05d}", f"item {n}", "9.99"] for n in range(500)}
+
+    stats = export(ws, rows.values(), key="ASIN", snapshot_path=snapshot)
+    assert stats["api_calls"] == 1 + 11  # empty-sheet read + 501 rows in chunks of 50
+    assert "append_row" not in ws.calls
+
+    for _ in range(5):
+        for asin in rng.sample(sorted(rows), 40):
+            del rows[asin]
+        for asin in rng.sample(sorted(rows), 30):
+            rows[asin][2] = f"{rng.uniform(1, 50):.2f}"
+        for n in range(rng.randint(0, 60)):
+            asin = f"N{rng.randint(0, 10**6):06d}"
+            rows[asin] = [asin, "new", "1.00"]
+
+        before = ws.api_calls
+        export(ws, rows.values(), key="ASIN", snapshot_path=snapshot)
+        # snapshot on disk means no read-back, just a few batched writes
+        assert 1 <= ws.api_calls - before <= 4
+        assert ws.calls["get_all_values"] == 1
+        values = ws.get_all_values()
+        ws.calls["get_all_values"] -= 1
+        assert values[0] == HEADERS
+        assert sorted(values[1:]) == sorted(rows.values())
+
+    before = ws.api_calls
+    stats = export(ws, rows.values(), key="ASIN", snapshot_path=snapshot)
+    assert ws.api_calls == before and stats["rows_written"] == 0
+
+
+def test_positional_diff_and_header_change():
+    ws = open_worksheet(FakeSheetsClient(), "ProductResults", "Walmart")
+    export(ws, [["a", "x", "1"], ["b", "y", "2"], ["c", "z", "3"]])
+    export(ws, [["a", "x", "1"], ["b", "y", "5"]])
+    assert ws.get_all_values() == [HEADERS, ["a", "x", "1"], ["b", "y", "5"]]
+    assert ws.calls["batch_update"] == 1 and ws.calls["batch_clear"] == 1
+
+    writer = SheetWriter(ws)
+    writer.add({"UPC": "012345678905", "Price": 3.5})
+    writer.flush()
+    assert ws.get_all_values() == [["UPC", "Price"], ["012345678905", "3.5"]]
+
+
+def test_empty_export_resets_snapshot(tmp_path):
+    # export_to_google_sheets: rows, then nothing, then the same rows again
+    ws = open_worksheet(FakeSheetsClient(), "ProductResults", "LegoSearch")
+    snapshot = str(tmp_path / "lego.json")
+    rows = [{"ASIN": "B1", "Title": "Set 1", "Price": "9.99"}, {"ASIN": "B2", "Title": "Set 2", "Price": "19.99"}]
+
+    write_rows(ws, rows, key="ASIN", snapshot_path=snapshot)
+    clear_rows(ws, snapshot)
+    assert ws.get_all_values() == []
+
+    stats = write_rows(ws, rows, key="ASIN", snapshot_path=snapshot)
+    assert stats["rows_written"] == 2 and stats["rows_unchanged"] == 0
+    assert ws.get_all_values()[1:] == [["B1", "Set 1", "9.99"], ["B2", "Set 2", "19.99"]]
+
+
+def test_numbers_are_written_as_numbers(tmp_path):
+    ws = open_worksheet(FakeSheetsClient(), "ProductResults", "Export")
+    sent = []
+    for method in ("append_rows", "batch_update"):
+        real = getattr(ws, method)
+        setattr(ws, method, lambda values, *a, _real=real, **kw: sent.append(values) or _real(values, *a, **kw))
+
+    snapshot = str(tmp_path / "export.json")
+    write_rows(ws, [{"UPC": "012345678905", "Price": 19.99, "ROI": 0.35}], key="UPC", snapshot_path=snapshot)
+    assert sent[-1][1] == ["012345678905", 19.99, 0.35]
+
+    write_rows(ws, [{"UPC": "012345678905", "Price": 17.5, "ROI": 0.35}], key="UPC", snapshot_path=snapshot)
+    assert sent[-1][0]["values"] == [["012345678905", 17.5, 0.35]]
+    # unchanged numbers compare equal to the strings in the snapshot
+    assert write_rows(ws, [{"UPC": "012345678905", "Price": 17.5, "ROI": 0.35}],
+                      key="UPC", snapshot_path=snapshot)["rows_written"] == 0
+
+
+def test_blank_and_repeated_keys_keep_every_row(tmp_path):
+    ws = open_worksheet(FakeSheetsClient(), "ProductResults", "Walmart")
+    snapshot = str(tmp_path / "walmart.json")
+    rows = [["", "No URL 1", "1"], ["B1", "Set 1", "2"], ["", "No URL 2", "3"], ["B1", "Set 1 again", "4"]]
+
+    export(ws, rows, key="ASIN", snapshot_path=snapshot)
+    assert ws.get_all_values()[1:] == rows
+
+    rows[2][2] = "5"
+    stats = export(ws, rows, key="ASIN", snapshot_path=snapshot)
+    assert stats["rows_written"] == 1 and stats["rows_unchanged"] == 3
+    assert ws.get_all_values()[1:] == rows
+
+    stats = export(ws, rows[:3], key="ASIN", snapshot_path=snapshot)
+    assert ws.get_all_values()[1:] == rows[:3] and stats["rows_cleared"] == 1
@@ -0,0 +1,85 @@
+# test_streaming.py
+
+import time
+import threading
+
+import pytest
+
+from app.streaming import Stage, StreamPipeline
+
+
+def test_stages_overlap_and_count():
+    def slow(delay):
+        def fn(x):
+            time.sleep(delay)
+            return x
+        return fn
+
+    pipeline = StreamPipeline(range(20), [
+        Stage("split", lambda x: [x, x + 100], fan_out=True),
+        Stage("a", slow(0.01)),
+        Stage("b", slow(0.01), workers=2),
+        Stage("drop_odd", lambda x: x if x % 2 == 0 else None),
+    ])
+    start = time.perf_counter()
+    out = sorted(pipeline.stream())
+    elapsed = time.perf_counter() - start
+
+    assert out == sorted(x for n in range(20) for x in (n, n + 100) if x % 2 == 0)
+    # run back to back the two 10 ms stages would need 0.8 s
+    assert elapsed < 0.7
+    report = pipeline.report()
+    assert report["source"]["items_out"] == 20
+    assert report["split"]["items_out"] == report["b"]["items_in"] == 40
+    assert report["drop_odd"]["items_out"] == 20
+
+
+def test_backpressure_bounds_items_in_flight():
+    produced, consumed = [0], [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def source():
+        for n in range(200):
+            with lock:
+                produced[0] += 1
+                peak[0] = max(peak[0], produced[0] - consumed[0])
+            yield n
+
+    def slow_sink(x):
+        time.sleep(0.001)
+        with lock:
+            consumed[0] += 1
+        return x
+
+    StreamPipeline(source(), [Stage("double", lambda x: x * 2, queue_size=4),
+                              Stage("sink", slow_sink, queue_size=4)],
+                   output_queue_size=4).run()
+    # queues of 4 + one item held by each thread, never the whole stream
+    assert consumed[0] == 200 and peak[0] <= 4 * 3 + 3
+
+
+def test_stage_error_stops_pipeline():
+    def boom(x):
+        if x == 5:
+            raise ValueError("bad item")
+        return x
+
+    pipeline = StreamPipeline(iter(range(10_000)), [Stage("boom", boom), Stage("pass", lambda x: x)])
+    with pytest.raises(ValueError):
+        pipeline.run()
+    assert pipeline.report()["boom"]["errors"] == 1
+    assert pipeline.report()["source"]["items_out"] < 10_000
+
+
+def test_source_error_drains_produced_items():
+    def source():
+        yield from range(5)
+        raise ConnectionError("blocked")
+
+    seen = []
+    pipeline = StreamPipeline(source(), [Stage("slow", lambda x: time.sleep(0.02) or x),
+                                         Stage("sink", seen.append)])
+    with pytest.raises(ConnectionError):
+        pipeline.run()
+    assert seen == [0, 1, 2, 3, 4]
@@ -0,0 +1,47 @@
+# test_subscription_store.py
+
+import random
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas import SubscribeRequest
+from app.subscription_store import SubscriptionStore, SubscriptionExists
+
+
+def make_sub(threshold):
+    return SubscribeRequest(webhook_id=uuid.uuid4(), url="http://hook.test/", threshold=threshold)
+
+
+def test_subscriptions_persist_and_other_workers_see_writes(tmp_path):
+    path = str(tmp_path / "subs.db")
+    worker_a, worker_b = SubscriptionStore(path), SubscriptionStore(path)
+    sub = make_sub(0.2)
+
+    assert worker_b.get(sub.webhook_id) is None  # warms b's snapshot
+    worker_a.add(sub)
+    assert worker_b.get(sub.webhook_id) == sub
+    with pytest.raises(SubscriptionExists):
+        worker_b.add(sub)
+
+    worker_b.remove(sub.webhook_id)
+    assert sub.webhook_id not in worker_a
+    worker_a.add(make_sub(0.3))
+    assert len(SubscriptionStore(path).all()) == 1
+
+
+def test_match_agrees_with_nested_loop(tmp_path):
+    rng = random.Random(3)
+    store = SubscriptionStore(str(tmp_path / "subs.db"))
+    subs = [store.add(make_sub(round(rng.uniform(0, 1), 2))) for _ in range(40)]
+    items = [SimpleNamespace(upc=str(n), roi=round(rng.uniform(0, 1), 2)) for n in range(200)]
+
+    expected = {
+        sub.webhook_id: sorted(item.upc for item in items if item.roi >= sub.threshold)
+        for sub in subs
+    }
+    expected = {k: v for k, v in expected.items() if v}
+    got = {sub.webhook_id: sorted(item.upc for item in matched) for sub, matched in store.match(items)}
+    assert got == expected
+    assert store.match([]) == []
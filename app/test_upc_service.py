@@ -0,0 +1,31 @@
+# test_upc_service.py
+
+from app.upc_service import CsvUPCService, UPCStore
+
+
+def test_csv_is_imported_once_and_lookups_go_both_ways(tmp_path):
+    csv_path = tmp_path / "upc_cache.csv"
+    csv_path.write_text("asin,upc\nB001,012345678905\nB002,012345678905\n", encoding="utf8")
+
+    svc = CsvUPCService(str(csv_path))
+    assert svc.lookup("B001") == "012345678905"
+    assert sorted(svc.store.lookup_asins("012345678905")) == ["B001", "B002"]
+
+    # update_cache keeps known ASINs and adds new ones
+    svc.update_cache([{"asin": "B001", "upc": "999"}, {"asin": "B003", "upc": "036000291452"}, {"asin": None}])
+    assert svc.lookup_many(["B001", "B003", "B404"]) == {"B001": "012345678905", "B003": "036000291452"}
+
+    # a second service reads the database, not the CSV
+    csv_path.write_text("asin,upc\n", encoding="utf8")
+    assert CsvUPCService(str(csv_path)).lookup("B003") == "036000291452"
+
+
+def test_upsert_many_overwrites_and_batches(tmp_path):
+    store = UPCStore(str(tmp_path / "upc.db"))
+    assert store.upsert_many([(f"A{i}", f"{i:012d}") for i in range(1200)]) == 1200
+    store.upsert_many([("A1", "111111111111")])
+    found = store.lookup_many(f"A{i}" for i in range(1200))
+    assert len(found) == 1200 and found["A1"] == "111111111111"
+    assert store.lookup_asins_many(["111111111111", "000000000002"]) == {
+        "111111111111": ["A1"], "000000000002": ["A2"]}
+    store.close()
@@ -0,0 +1,30 @@
+# test_webhook_export.py
+
+import uuid
+
+from app.schemas import ExportItem
+from app.webhook_dispatcher import queue_items
+from app.webhook_export import fetch_log_page
+from app.test_webhook_worker import make_session_factory
+
+
+def test_keyset_pages_cover_every_row_once_newest_first():
+    Session = make_session_factory()
+    db = Session()
+    webhook_id, other_id = uuid.uuid4(), uuid.uuid4()
+    # one bulk insert -> identical timestamps, so paging relies on the id tie-break
+    queued, failed = queue_items(webhook_id, [ExportItem(upc=str(n), price=1.0, roi=0.5) for n in range(7)], db)
+    queue_items(other_id, [ExportItem(upc="x", price=1.0, roi=0.5)], db)
+    db.commit()
+    assert (queued, failed) == (7, 0)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        logs, cursor = fetch_log_page(db, webhook_id, 3, cursor)
+        seen += [log.item_upc for log in logs]
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == [str(n) for n in reversed(range(7))]
+    db.close()
@@ -0,0 +1,180 @@
+# test_webhook_worker.py
+
+import json
+import uuid
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.orchestrator as orchestrator
+from app.db import Base
+from app.models import Webhook, WebhookLog, migrate_webhook_logs
+from app.schemas import SubscribeRequest
+from app.subscription_store import get_subscription_store, reset_subscription_store
+from app.webhook_worker import WebhookDeliveryWorker, QUEUED_STATUS, subscription_endpoints
+
+
+def make_session_factory():
+    engine = create_engine("sqlite://", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def queue(db, webhook_id, upcs):
+    for upc in upcs:
+        db.add(WebhookLog(webhook_id=webhook_id, item_upc=upc, status=QUEUED_STATUS, attempts=0,
+                          response="queued", payload=json.dumps({"upc": upc, "price": 1.0, "roi": 0.5}),
+                          next_attempt_at=datetime.utcnow()))
+
+
+def test_groups_per_webhook_retries_and_settles_in_bulk():
+    Session = make_session_factory()
+    ok_id, flaky_id, unknown_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    db = Session()
+    db.add_all([Webhook(id=ok_id, name="ok", endpoint="http://receiver/ok", active=True),
+                Webhook(id=flaky_id, name="flaky", endpoint="http://receiver/flaky", active=True)])
+    queue(db, ok_id, ["1", "2", "3"])
+    queue(db, flaky_id, ["4"])
+    queue(db, unknown_id, ["5"])
+    db.commit()
+    db.close()
+
+    posts = []
+
+    def receiver(request):
+        posts.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200 if request.url.path == "/ok" else 503)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(receiver)) as client:
+            worker = WebhookDeliveryWorker(session_factory=Session, client=client)
+            settled = await worker.drain()
+            return worker, settled
+
+    worker, settled = asyncio.run(run())
+    assert settled == 5
+    assert sorted(path for path, _ in posts) == ["/flaky", "/ok"]
+    ok_body = next(body for path, body in posts if path == "/ok")
+    assert [item["upc"] for item in ok_body["items"]] == ["1", "2", "3"]
+
+    db = Session()
+    rows = {row.item_upc: row for row in db.query(WebhookLog).all()}
+    assert all(rows[u].status == 200 and rows[u].next_attempt_at is None for u in "123")
+    assert rows["4"].status == QUEUED_STATUS and rows["4"].attempts == 1
+    assert rows["4"].next_attempt_at > datetime.utcnow()
+    assert rows["5"].status == 404 and rows["5"].next_attempt_at is None
+    db.close()
+
+    report = worker.report()
+    assert report["delivered"] == 3 and report["retried"] == 1 and report["failed"] == 1
+
+
+def test_legacy_table_is_migrated_and_old_queued_rows_delivered(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    hook_id = uuid.uuid4()
+    with engine.begin() as conn:
+        # webhook_logs as created before the outbox columns existed
+        conn.execute(text("CREATE TABLE webhooks (id CHAR(32) PRIMARY KEY, name VARCHAR, endpoint VARCHAR, active BOOLEAN)"))
+        conn.execute(text("CREATE TABLE webhook_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, webhook_id CHAR(32),"
+                          " item_upc VARCHAR NOT NULL, status INTEGER, attempts INTEGER, response TEXT, timestamp DATETIME)"))
+        conn.execute(text("INSERT INTO webhooks VALUES (:id, 'old', 'http://receiver/old', 1)"), {"id": hook_id.hex})
+        conn.execute(text("INSERT INTO webhook_logs (webhook_id, item_upc, status, attempts, response)"
+                          " VALUES (:id, '042', 202, 0, 'queued')"), {"id": hook_id.hex})
+
+    assert migrate_webhook_logs(engine) == ["payload", "next_attempt_at", "claimed_by"]
+    assert migrate_webhook_logs(engine) == []
+
+    posts = []
+
+    def receiver(request):
+        posts.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(receiver)) as client:
+            return await WebhookDeliveryWorker(session_factory=sessionmaker(bind=engine), client=client).drain()
+
+    assert asyncio.run(run()) == 1
+    assert posts[0]["items"] == [{"upc": "042"}]
+
+
+def test_concurrent_workers_deliver_each_row_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'outbox.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    hook_id = uuid.uuid4()
+    db = Session()
+    db.add(Webhook(id=hook_id, name="hook", endpoint="http://receiver/hook", active=True))
+    queue(db, hook_id, [str(n) for n in range(200)])
+    db.commit()
+    db.close()
+
+    delivered = []
+
+    async def receiver(request):
+        await asyncio.sleep(0.01)
+        delivered.extend(item["upc"] for item in json.loads(request.content)["items"])
+        return httpx.Response(200)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(receiver)) as client:
+            workers = [WebhookDeliveryWorker(session_factory=Session, client=client, batch_size=15,
+                                             max_items_per_post=5) for _ in range(4)]
+            return await asyncio.gather(*(w.drain() for w in workers))
+
+    assert sum(asyncio.run(run())) == 200
+    assert sorted(delivered, key=int) == [str(n) for n in range(200)]
+
+
+def test_broadcast_rows_reach_subscriber_urls(monkeypatch, tmp_path):
+    monkeypatch.setenv("SUBSCRIPTIONS_DB", str(tmp_path / "subs.db"))
+    reset_subscription_store()
+    store = get_subscription_store()
+    sub = store.add(SubscribeRequest(webhook_id=uuid.uuid4(), url="http://subscriber.test/hook", threshold=0.4))
+    gone = uuid.uuid4()
+    store.add(SubscribeRequest(webhook_id=gone, url="http://deactivated.test/", threshold=0.0))
+
+    def scraper(upc):
+        # ROI 0.5 for "1", 0.3 for "2"
+        return SimpleNamespace(upc=upc, price=5.0 if upc == "1" else 7.0, previous_price=10.0)
+
+    monkeypatch.setattr(orchestrator, "registry", {"src": scraper})
+    monkeypatch.setattr(orchestrator.scrape_cache, "wrap_all", dict)
+    Session = make_session_factory()
+    db = Session()
+    # a webhooks row that was switched off wins over the subscription
+    db.add(Webhook(id=gone, name="off", endpoint="http://deactivated.test/", active=False))
+    db.commit()
+    try:
+        asyncio.run(orchestrator.run_all_scrapers_async(None, ["1", "2"], db))
+    finally:
+        db.close()
+
+    posts = []
+
+    def receiver(request):
+        posts.append((str(request.url), json.loads(request.content)))
+        return httpx.Response(200)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(receiver)) as client:
+            worker = WebhookDeliveryWorker(session_factory=Session, client=client,
+                                           resolve_endpoints=subscription_endpoints)
+            return await worker.drain()
+
+    try:
+        assert asyncio.run(run()) == 3
+    finally:
+        reset_subscription_store()
+    assert [(url, [i["upc"] for i in body["items"]]) for url, body in posts] == \
+        [("http://subscriber.test/hook", ["1"])]
+    db = Session()
+    rows = db.query(WebhookLog).filter(WebhookLog.webhook_id == sub.webhook_id).all()
+    assert [row.status for row in rows] == [200]
+    db.close()
@@ -1,26 +1,122 @@
-﻿import csv, os
-
-class CsvUPCService:
-    def __init__(self, path='upc_cache.csv'):
-        self.path = path
-        self.cache = {}
-        if os.path.exists(self.path):
-            with open(self.path, newline='', encoding='utf8') as f:
-                reader = csv.DictReader(f)
-                for r in reader:
-                    self.cache[r['asin']] = r['upc']
-
-    def lookup(self, asin):
-        return self.cache.get(asin)
-
-    def update_cache(self, items):
-        # items: list of dicts with 'asin' and 'upc'
-        existing = set(self.cache)
-        with open(self.path, 'a', newline='', encoding='utf8') as f:
-            writer = csv.writer(f)
-            for itm in items:
-                a, u = itm.get('asin'), itm.get('upc')
-                if a and u and a not in existing:
-                    writer.writerow([a, u])
-        # reload cache
-        self.__init__(self.path)
+﻿import csv, os, sqlite3, threading
+
+
+class UPCStore:
+    """
+    ASIN <-> UPC mapping backed by an indexed SQLite file.
+    The database is opened on first use, so constructing a store is free;
+    lookups hit the primary key (asin) or the upc index instead of a dict
+    loaded from the whole cache file.
+    """
+
+    def __init__(self, path='upc_cache.db'):
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS asin_upc ("
+                        " asin TEXT PRIMARY KEY,"
+                        " upc TEXT NOT NULL)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_asin_upc_upc ON asin_upc (upc)")
+                    self._conn = conn
+        return self._conn
+
+    def lookup(self, asin):
+        with self._lock:
+            row = self.conn.execute("SELECT upc FROM asin_upc WHERE asin = ?", (asin,)).fetchone()
+        return row[0] if row else None
+
+    def lookup_asins(self, upc):
+        """All ASINs mapped to a UPC (one UPC can list under several ASINs)"""
+        with self._lock:
+            rows = self.conn.execute("SELECT asin FROM asin_upc WHERE upc = ?", (upc,)).fetchall()
+        return [r[0] for r in rows]
+
+    def _lookup_in(self, sql, keys):
+        keys = list(dict.fromkeys(k for k in keys if k))
+        rows = []
+        with self._lock:
+            # stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows += self.conn.execute(sql.format(','.join('?' * len(chunk))), chunk).fetchall()
+        return rows
+
+    def lookup_many(self, asins):
+        """{asin: upc} for the ASINs that are known"""
+        return dict(self._lookup_in("SELECT asin, upc FROM asin_upc WHERE asin IN ({})", asins))
+
+    def lookup_asins_many(self, upcs):
+        """{upc: [asin, ...]} for the UPCs that are known"""
+        found = {}
+        for asin, upc in self._lookup_in("SELECT asin, upc FROM asin_upc WHERE upc IN ({})", upcs):
+            found.setdefault(upc, []).append(asin)
+        return found
+
+    def upsert_many(self, pairs, overwrite=True):
+        """
+        Store (asin, upc) pairs in one transaction.
+        overwrite=False keeps the UPC already recorded for an ASIN.
+        Returns the number of rows written.
+        """
+        rows = [(a, u) for a, u in pairs if a and u]
+        if overwrite:
+            sql = ("INSERT INTO asin_upc (asin, upc) VALUES (?, ?) "
+                   "ON CONFLICT (asin) DO UPDATE SET upc = excluded.upc")
+        else:
+            sql = "INSERT OR IGNORE INTO asin_upc (asin, upc) VALUES (?, ?)"
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(sql, rows)
+            return self.conn.total_changes - before
+
+    def import_csv(self, csv_path, overwrite=False):
+        """One-shot import of an asin,upc CSV (the old upc_cache.csv format)"""
+        with open(csv_path, newline='', encoding='utf8') as f:
+            reader = csv.DictReader(f)
+            return self.upsert_many(((r.get('asin'), r.get('upc')) for r in reader), overwrite=overwrite)
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM asin_upc").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CsvUPCService:
+    """
+    Drop-in replacement for the old CSV-backed cache. Data lives in a
+    UPCStore next to the CSV (upc_cache.csv -> upc_cache.db); an existing
+    CSV is imported the first time the store is created.
+    """
+
+    def __init__(self, path='upc_cache.csv'):
+        self.path = path
+        db_path = os.path.splitext(path)[0] + '.db'
+        migrate = not os.path.exists(db_path) and os.path.exists(path)
+        self.store = UPCStore(db_path)
+        if migrate:
+            self.store.import_csv(path)
+
+    def lookup(self, asin):
+        return self.store.lookup(asin)
+
+    def lookup_many(self, asins):
+        return self.store.lookup_many(asins)
+
+    def update_cache(self, items):
+        # items: list of dicts with 'asin' and 'upc'; known ASINs are kept as-is
+        self.store.upsert_many(((itm.get('asin'), itm.get('upc')) for itm in items), overwrite=False)
@@ -10,16 +10,48 @@ import requests
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from difflib import SequenceMatcher
 
-try:
-    from fuzzywuzzy import fuzz, process
-    FUZZYWUZZY_AVAILABLE = True
-except ImportError:
-    FUZZYWUZZY_AVAILABLE = False
+from app.settings import MATCH_TOP_K, PRODUCT_CATALOG
+from app.vision.product_index import ProductIndex, load_catalog
+
+# Used when no scraped catalog is available (demo / first run)
+SAMPLE_PRODUCTS = [
+    {
+        "name": "Apple iPhone 15 Pro",
+        "brand": "Apple",
+        "upc": "194253434567",
+        "model": "A3108",
+        "price": "$999.00",
+        "category": "Electronics"
+    },
+    {
+        "name": "Samsung Galaxy S24",
+        "brand": "Samsung", 
+        "upc": "887276742113",
+        "model": "SM-S921U",
+        "price": "$799.00",
+        "category": "Electronics"
+    },
+    {
+        "name": "Nike Air Max 270",
+        "brand": "Nike",
+        "upc": "193655626234",
+        "model": "AH8050",
+        "price": "$150.00",
+        "category": "Footwear"
+    },
+    {
+        "name": "Adidas Ultraboost 22",
+        "brand": "Adidas",
+        "upc": "195751473897",
+        "model": "GZ0127",
+        "price": "$180.00",
+        "category": "Footwear"
+    }
+]
 
 class ProductMatcher:
-    def __init__(self, project_path="."):
+    def __init__(self, project_path=".", catalog=None, upc_service=None, index: Optional[ProductIndex] = None):
         self.project_path = Path(project_path)
         self.vision_dir = self.project_path / "app" / "vision"
         self.vision_dir.mkdir(parents=True, exist_ok=True)
@@ -28,150 +60,93 @@ class ProductMatcher:
         self.match_results_dir = self.vision_dir / "match_results"
         self.match_results_dir.mkdir(parents=True, exist_ok=True)
         
-        # Load product database (stub for now)
-        self.product_db = self._load_product_database()
+        # Load product database (indexed scraped catalog)
+        self.index = index if index is not None else self._load_product_database(catalog, upc_service)
         
-    def _load_product_database(self) -> List[Dict]:
-        """Load local product database (expandable)"""
-        # This would eventually connect to your scraper database
-        sample_products = [
-            {
-                "name": "Apple iPhone 15 Pro",
-                "brand": "Apple",
-                "upc": "194253434567",
-                "model": "A3108",
-                "price": "$999.00",
-                "category": "Electronics"
-            },
-            {
-                "name": "Samsung Galaxy S24",
-                "brand": "Samsung", 
-                "upc": "887276742113",
-                "model": "SM-S921U",
-                "price": "$799.00",
-                "category": "Electronics"
-            },
-            {
-                "name": "Nike Air Max 270",
-                "brand": "Nike",
-                "upc": "193655626234",
-                "model": "AH8050",
-                "price": "$150.00",
-                "category": "Footwear"
-            },
-            {
-                "name": "Adidas Ultraboost 22",
-                "brand": "Adidas",
-                "upc": "195751473897",
-                "model": "GZ0127",
-                "price": "$180.00",
-                "category": "Footwear"
-            }
-        ]
+    def _load_product_database(self, catalog=None, upc_service=None) -> ProductIndex:
+        """Index the scraped catalog CSVs (PRODUCT_CATALOG), or the sample products if there are none"""
+        if catalog is None:
+            catalog = [c.strip() for c in PRODUCT_CATALOG.split(",") if c.strip()]
+        elif isinstance(catalog, (str, Path)):
+            catalog = [catalog]
+        paths = [p if Path(p).is_absolute() else self.project_path / p for p in catalog]
+        paths = [str(p) for p in paths if Path(p).is_file()]
         
-        return sample_products
+        if not paths:
+            print("⚠️ [ProductMatcher] No product catalog found, using sample products")
+            return ProductIndex(SAMPLE_PRODUCTS)
+        
+        index = load_catalog(paths, upc_service=upc_service)
+        print(f"🗂️ [ProductMatcher] Indexed {len(index)} products from {len(paths)} catalog file(s)")
+        return index
+    
+    def _match(self, product: Dict, match_type: str, confidence: int, field: str, value: str) -> Dict:
+        return {
+            "product": product,
+            "match_type": match_type,
+            "confidence": confidence,
+            "matched_field": field,
+            "matched_value": value
+        }
     
     def match_by_upc(self, upc: str) -> Optional[Dict]:
-        """Exact UPC matching"""
+        """Exact UPC matching (hash lookup)"""
         if not upc:
             return None
-            
-        # Clean UPC (remove spaces, dashes)
-        clean_upc = re.sub(r'[^0-9]', '', upc)
         
-        for product in self.product_db:
-            if product.get("upc") == clean_upc:
-                return {
-                    "product": product,
-                    "match_type": "upc_exact",
-                    "confidence": 100,
-                    "matched_field": "upc",
-                    "matched_value": upc
-                }
+        products = self.index.by_upc(upc)
+        if products:
+            return self._match(products[0], "upc_exact", 100, "upc", upc)
         
         return None
     
-    def match_by_brand(self, brand: str, threshold: int = 80) -> List[Dict]:
-        """Fuzzy brand matching"""
-        if not brand or not FUZZYWUZZY_AVAILABLE:
+    def match_by_brand(self, brand: str, threshold: int = 80, limit: int = MATCH_TOP_K) -> List[Dict]:
+        """Fuzzy brand matching, best `limit` products"""
+        if not brand:
             return []
-            
-        matches = []
         
-        for product in self.product_db:
-            product_brand = product.get("brand", "")
-            if product_brand:
-                similarity = fuzz.ratio(brand.upper(), product_brand.upper())
-                if similarity >= threshold:
-                    matches.append({
-                        "product": product,
-                        "match_type": "brand_fuzzy",
-                        "confidence": similarity,
-                        "matched_field": "brand",
-                        "matched_value": brand
-                    })
-        
-        # Sort by confidence
-        matches.sort(key=lambda x: x["confidence"], reverse=True)
-        return matches
+        return [
+            self._match(product, "brand_fuzzy", score, "brand", brand)
+            for product, score in self.index.top_k(brand, "brand", k=limit, threshold=threshold)
+        ]
     
-    def match_by_name(self, text: str, threshold: int = 70) -> List[Dict]:
-        """Fuzzy product name matching"""
-        if not text or not FUZZYWUZZY_AVAILABLE:
+    def match_by_name(self, text: str, threshold: int = 70, limit: int = MATCH_TOP_K) -> List[Dict]:
+        """Fuzzy product name matching, best `limit` products"""
+        if not text:
             return []
-            
-        matches = []
-        
-        for product in self.product_db:
-            product_name = product.get("name", "")
-            if product_name:
-                similarity = fuzz.partial_ratio(text.upper(), product_name.upper())
-                if similarity >= threshold:
-                    matches.append({
-                        "product": product,
-                        "match_type": "name_fuzzy",
-                        "confidence": similarity,
-                        "matched_field": "name",
-                        "matched_value": text
-                    })
         
-        # Sort by confidence
-        matches.sort(key=lambda x: x["confidence"], reverse=True)
-        return matches
+        return [
+            self._match(product, "name_fuzzy", score, "name", text)
+            for product, score in self.index.top_k(text, "name", k=limit, threshold=threshold)
+        ]
     
-    def match_by_model(self, model: str, threshold: int = 85) -> List[Dict]:
-        """Exact or fuzzy model matching"""
+    def match_by_model(self, model: str, threshold: int = 85, limit: int = MATCH_TOP_K) -> List[Dict]:
+        """Exact or fuzzy model matching, best `limit` products"""
         if not model:
             return []
-            
-        matches = []
         
-        for product in self.product_db:
-            product_model = product.get("model", "")
-            if product_model:
-                # Try exact match first
-                if model.upper() == product_model.upper():
-                    matches.append({
-                        "product": product,
-                        "match_type": "model_exact",
-                        "confidence": 100,
-                        "matched_field": "model",
-                        "matched_value": model
-                    })
-                elif FUZZYWUZZY_AVAILABLE:
-                    similarity = fuzz.ratio(model.upper(), product_model.upper())
-                    if similarity >= threshold:
-                        matches.append({
-                            "product": product,
-                            "match_type": "model_fuzzy", 
-                            "confidence": similarity,
-                            "matched_field": "model",
-                            "matched_value": model
-                        })
+        return [
+            self._match(product, "model_exact" if score == 100 else "model_fuzzy", score, "model", model)
+            for product, score in self.index.top_k(model, "model", k=limit, threshold=threshold)
+        ]
+    
+    def top_k(self, text: str, k: int = 5, threshold: int = 60) -> List[Dict]:
+        """Best `k` products for one raw OCR string, trying it as UPC, model, name and brand"""
+        matches = []
+        if len(re.sub(r"[^0-9]", "", text or "")) >= 8:  # long enough to be a barcode
+            match = self.match_by_upc(text)
+            if match:
+                matches.append(match)
+        matches += self.match_by_model(text, threshold=max(threshold, 80), limit=k)
+        matches += self.match_by_name(text, threshold=threshold, limit=k)
+        matches += self.match_by_brand(text, threshold=max(threshold, 75), limit=k)
         
-        # Sort by confidence
-        matches.sort(key=lambda x: x["confidence"], reverse=True)
-        return matches
+        best: Dict[Tuple, Dict] = {}
+        for match in matches:
+            key = tuple(match["product"].values())
+            if key not in best or match["confidence"] > best[key]["confidence"]:
+                best[key] = match
+        return sorted(best.values(), key=lambda m: m["confidence"], reverse=True)[:k]
     
     def query_amazon_scraper(self, search_term: str) -> Optional[Dict]:
         """Query local Amazon scraper endpoint (stub)"""
@@ -251,8 +226,8 @@ class ProductMatcher:
         for text_data in product_texts:
             text = text_data["value"]
             if len(text) > 3:  # Skip very short text
-                matches = self.match_by_name(text, threshold=60)
-                all_matches.extend(matches[:2])  # Limit to top 2 matches
+                matches = self.match_by_name(text, threshold=60, limit=2)
+                all_matches.extend(matches)  # Limit to top 2 matches
                 search_queries.append(text)
         
         # 5. Remove duplicates and sort by confidence
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+🗂️ Product Index - In-memory catalog index for OCR product matching
+Exact UPC/model lookups go through hash maps; fuzzy name, brand and model
+lookups first pull candidates from a character-trigram inverted index and
+only fuzzy-score those, so a lookup costs the same on 1k or 1M products.
+
+    index = load_catalog(["product_catalog.csv"])
+    index.by_upc("0194253434567")          # exact, leading zeros ignored
+    index.top_k("iphone 15 pro", "name", k=5)
+"""
+
+import csv
+import re
+from array import array
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.settings import MATCH_CANDIDATES, MATCH_POSTINGS_BUDGET
+
+try:
+    from rapidfuzz import fuzz
+    FUZZY_BACKEND = "rapidfuzz"
+except ImportError:
+    try:
+        from fuzzywuzzy import fuzz
+        FUZZY_BACKEND = "fuzzywuzzy"
+    except ImportError:
+        fuzz = None
+        FUZZY_BACKEND = "difflib"
+
+FIELDS = ("name", "brand", "upc", "model", "price", "category", "asin")
+
+# catalog CSV headers accepted for each field (scraper output uses ASIN/Title/Price/UPC)
+COLUMN_ALIASES = {
+    "name": ("name", "title", "product", "product name", "product_name"),
+    "brand": ("brand", "manufacturer"),
+    "upc": ("upc", "gtin", "ean", "barcode"),
+    "model": ("model", "model number", "model_number", "mpn", "part number"),
+    "price": ("price",),
+    "category": ("category",),
+    "asin": ("asin",),
+}
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+# ----------------------------------------------------------------------
+# Normalisation and scoring
+# ----------------------------------------------------------------------
+
+def normalize_text(text: str) -> str:
+    """Lowercase, punctuation to single spaces: 'Apple iPhone-15 PRO' -> 'apple iphone 15 pro'"""
+    return _NON_ALNUM.sub(" ", (text or "").lower()).strip()
+
+
+def normalize_upc(upc: str) -> str:
+    """Digits only, leading zeros dropped, so UPC-A, EAN-13 and GTIN-14 forms agree"""
+    return re.sub(r"[^0-9]", "", upc or "").lstrip("0")
+
+
+def normalize_model(model: str) -> str:
+    """'sm-s921u' and 'SM S921U' both become 'SMS921U'"""
+    return re.sub(r"[^0-9A-Z]", "", (model or "").upper())
+
+
+def trigrams(text: str) -> set:
+    """Character trigrams of normalized text, padded so short words still index"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def ratio(a: str, b: str) -> int:
+    if fuzz is not None:
+        return int(round(fuzz.ratio(a, b)))
+    return int(round(100 * SequenceMatcher(None, a, b).ratio()))
+
+
+def partial_ratio(a: str, b: str) -> int:
+    """Best ratio of the shorter string against same-length windows of the longer one"""
+    if fuzz is not None:
+        return int(round(fuzz.partial_ratio(a, b)))
+    shorter, longer = (a, b) if len(a) <= len(b) else (b, a)
+    if not shorter:
+        return 0
+    best = 0.0
+    for i, j, _ in SequenceMatcher(None, shorter, longer).get_matching_blocks():
+        start = max(j - i, 0)
+        r = SequenceMatcher(None, shorter, longer[start:start + len(shorter)]).ratio()
+        if r > 0.995:
+            return 100
+        best = max(best, r)
+    return int(round(100 * best))
+
+
+# ----------------------------------------------------------------------
+# Indexes
+# ----------------------------------------------------------------------
+
+def _ids(found, limit: Optional[int] = None) -> List[int]:
+    """Keys held by one doc store the bare id; shared keys hold an array of ids"""
+    if isinstance(found, int):
+        return [found]
+    return list(found[:limit] if limit is not None else found)
+
+
+class TrigramIndex:
+    """
+    Inverted index trigram -> array of doc ids.
+
+    candidates() counts shared trigrams by walking the rarest postings first
+    and stops once `budget` ids have been read, so very common trigrams
+    ("ion", " pr") never turn a lookup into a catalog scan.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = defaultdict(lambda: array("I"))
+
+    def add(self, doc_id: int, text: str) -> None:
+        for gram in trigrams(text):
+            self._postings[gram].append(doc_id)
+
+    def candidates(self, text: str, limit: int = MATCH_CANDIDATES,
+                   budget: int = MATCH_POSTINGS_BUDGET) -> List[Tuple[int, int]]:
+        """Up to `limit` (doc_id, shared_trigrams) pairs, most shared first"""
+        lists = sorted((self._postings[g] for g in trigrams(text) if g in self._postings), key=len)
+        counts: Counter = Counter()
+        read = 0
+        for ids in lists:
+            if read and read + len(ids) > budget:
+                break
+            counts.update(ids[:budget])
+            read += len(ids)
+        return counts.most_common(limit)
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+
+class ProductIndex:
+    """
+    Catalog of products with exact and fuzzy lookups.
+
+    Rows are stored as tuples in FIELDS order and only turned into dicts for
+    results. UPC, model and brand keys live in hash maps; names, distinct brands and
+    distinct models each get a TrigramIndex for fuzzy candidate generation.
+    """
+
+    def __init__(self, products: Iterable[Dict] = ()):
+        self._rows: List[tuple] = []
+        self._upc: Dict[str, object] = {}
+        # brand/model key -> key id; key id -> doc id(s); key id -> key
+        self._key_ids: Dict[str, Dict[str, int]] = {"brand": {}, "model": {}}
+        self._docs: Dict[str, List] = {"brand": [], "model": []}
+        self._keys: Dict[str, List[str]] = {"brand": [], "model": []}
+        self._fuzzy: Dict[str, TrigramIndex] = {"name": TrigramIndex(), "brand": TrigramIndex(),
+                                                "model": TrigramIndex()}
+        self.add_many(products)
+
+    def _add_key(self, field: str, key: str, doc_id: int) -> None:
+        key_id = self._key_ids[field].get(key)
+        if key_id is None:
+            key_id = self._key_ids[field][key] = len(self._keys[field])
+            self._keys[field].append(key)
+            self._docs[field].append(doc_id)
+            self._fuzzy[field].add(key_id, key)
+        elif isinstance(self._docs[field][key_id], int):
+            self._docs[field][key_id] = array("I", (self._docs[field][key_id], doc_id))
+        else:
+            self._docs[field][key_id].append(doc_id)
+
+    def add(self, product: Dict) -> int:
+        row = tuple(str(product.get(f) or "").strip() for f in FIELDS)
+        doc_id = len(self._rows)
+        self._rows.append(row)
+        name, brand, upc, model = (normalize_text(row[0]), normalize_text(row[1]),
+                                   normalize_upc(row[2]), normalize_model(row[3]))
+
+        if upc:
+            found = self._upc.get(upc)
+            if found is None:
+                self._upc[upc] = doc_id
+            elif isinstance(found, int):
+                self._upc[upc] = array("I", (found, doc_id))
+            else:
+                found.append(doc_id)
+        if model:
+            self._add_key("model", model, doc_id)
+        if brand:
+            self._add_key("brand", brand, doc_id)
+        if name:
+            self._fuzzy["name"].add(doc_id, name)
+        return doc_id
+
+    def add_many(self, products: Iterable[Dict]) -> int:
+        count = 0
+        for product in products:
+            self.add(product)
+            count += 1
+        return count
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def product(self, doc_id: int) -> Dict:
+        return dict(zip(FIELDS, self._rows[doc_id]))
+
+    # -- exact ------------------------------------------------------------
+
+    def by_upc(self, upc: str) -> List[Dict]:
+        found = self._upc.get(normalize_upc(upc))
+        return [self.product(i) for i in _ids(found)] if found is not None else []
+
+    def by_model(self, model: str) -> List[Dict]:
+        key_id = self._key_ids["model"].get(normalize_model(model))
+        return [self.product(i) for i in _ids(self._docs["model"][key_id])] if key_id is not None else []
+
+    # -- fuzzy ------------------------------------------------------------
+
+    def top_k(self, query: str, field: str = "name", k: int = 10, threshold: int = 0,
+              candidates: int = MATCH_CANDIDATES) -> List[Tuple[Dict, int]]:
+        """
+        Best `k` (product, score 0-100) pairs for `query` against one field.
+
+        name:  partial ratio, so OCR fragments match longer titles
+        brand: ratio against distinct brands, expanded to their products
+        model: ratio against distinct models (an exact key always ranks first)
+        upc:   exact only
+        """
+        if field == "upc":
+            return [(p, 100) for p in self.by_upc(query)[:k]]
+        if field not in self._fuzzy:
+            raise ValueError(f"unknown match field {field!r}; expected one of name, brand, model, upc")
+        query = normalize_model(query) if field == "model" else normalize_text(query)
+        if not query:
+            return []
+
+        if field == "name":
+            key_of, scorer = (lambda i: normalize_text(self._rows[i][0])), partial_ratio
+        else:
+            keys = self._keys[field]
+            key_of, scorer = keys.__getitem__, ratio
+        scored = [(scorer(query, key_of(i)), i) for i, _ in self._fuzzy[field].candidates(query, candidates)]
+        scored.sort(key=lambda s: (-s[0], s[1]))
+
+        if field == "name":
+            return [(self.product(i), s) for s, i in scored[:k] if s >= threshold]
+
+        exact = self._key_ids[field].get(query)
+        if exact is not None:
+            scored = [(100, exact)] + [s for s in scored if s[1] != exact]
+        # list each matching key's products until k are found
+        results: List[Tuple[Dict, int]] = []
+        for score, key_id in scored:
+            if score < threshold or len(results) >= k:
+                break
+            for doc_id in _ids(self._docs[field][key_id], k - len(results)):
+                results.append((self.product(doc_id), score))
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "products": len(self._rows),
+            "upcs": len(self._upc),
+            "models": len(self._keys["model"]),
+            "brands": len(self._keys["brand"]),
+            "name_trigrams": len(self._fuzzy["name"]),
+        }
+
+
+# ----------------------------------------------------------------------
+# Catalog loading
+# ----------------------------------------------------------------------
+
+def _column_map(headers: Iterable[str]) -> Dict[str, str]:
+    """field -> CSV header, matched case-insensitively against COLUMN_ALIASES"""
+    lookup = {h.strip().lower(): h for h in headers if h}
+    found = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lookup:
+                found[field] = lookup[alias]
+                break
+    return found
+
+
+def iter_catalog_csv(path: str) -> Iterable[Dict]:
+    """Products from a scraped-catalog CSV, with headers mapped onto FIELDS"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = _column_map(reader.fieldnames or [])
+        for row in reader:
+            yield {field: row.get(header) for field, header in columns.items()}
+
+
+def _fill_upcs(products: Iterable[Dict], upc_service, batch: int = 1000) -> Iterable[Dict]:
+    """Add UPCs from the ASIN->UPC cache to products scraped without one"""
+    pending: List[Dict] = []
+
+    def flush():
+        known = upc_service.lookup_many(p["asin"] for p in pending)
+        for p in pending:
+            p["upc"] = known.get(p["asin"]) or p.get("upc")
+        yield from pending
+        pending.clear()
+
+    for product in products:
+        if product.get("asin") and not product.get("upc"):
+            pending.append(product)
+            if len(pending) >= batch:
+                yield from flush()
+        else:
+            yield product
+    if pending:
+        yield from flush()
+
+
+def load_catalog(paths: Iterable[str], upc_service=None, index: Optional[ProductIndex] = None) -> ProductIndex:
+    """
+    Build a ProductIndex from catalog CSVs (scraper / sheet exports).
+    With `upc_service` (app.upc_service.CsvUPCService or UPCStore), products
+    that only carry an ASIN get their UPC from the cache.
+    """
+    index = index if index is not None else ProductIndex()
+    for path in paths:
+        products = iter_catalog_csv(path)
+        if upc_service is not None:
+            products = _fill_upcs(products, upc_service)
+        index.add_many(products)
+    return index
@@ -1,32 +1,46 @@
 ﻿from app.models import WebhookLog
-from app.schemas import ItemDispatchPayload
-from app.sqlalchemy.orm import Session
+from app.schemas import ExportItem
+from sqlalchemy.orm import Session
+from datetime import datetime
 from uuid import UUID
 
+def queue_items(webhook_id: UUID, items: list[ExportItem], db: Session) -> tuple[int, int]:
+    """
+    Insert one outbox row per item with a single executemany.
+    Items without a UPC are skipped and counted as failed.
+    Returns (queued, failed); the caller commits.
+    """
+    now = datetime.utcnow()
+    mappings = [
+        {
+            "webhook_id": webhook_id,
+            "item_upc": item.upc,
+            "status": 202,
+            "attempts": 0,
+            "response": "queued",
+            "payload": item.model_dump_json(),
+            "timestamp": now,
+            "next_attempt_at": now,  # picked up by app.webhook_worker
+        }
+        for item in items if getattr(item, "upc", None)
+    ]
+    if mappings:
+        db.bulk_insert_mappings(WebhookLog, mappings)
+    return len(mappings), len(items) - len(mappings)
+
+
 def dispatch_items_to_webhook(
     webhook_id: UUID,
-    items: list[ItemDispatchPayload],
+    items: list[ExportItem],
     db: Session
 ) -> dict:
-    dispatched = 0
-    failed = 0
-
-    for item in items:
-        try:
-            log_entry = WebhookLog(
-                webhook_id=webhook_id,
-                item_upc=item.upc,
-                status=202,
-                attempts=0,
-                response="queued"
-            )
-            db.add(log_entry)
-            dispatched += 1
-        except Exception as e:
-            print(f"Failed to dispatch {item.upc}: {e}")
-            failed += 1
-
-    db.commit()
+    try:
+        dispatched, failed = queue_items(webhook_id, items, db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to dispatch {len(items)} items: {e}")
+        dispatched, failed = 0, len(items)
 
     return {
         "status": "queued",
@@ -34,5 +48,3 @@ def dispatch_items_to_webhook(
         "failed": failed,
         "message": f"{dispatched} items queued for webhook delivery"
     }
-
-
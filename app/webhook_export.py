@@ -1,10 +1,14 @@
 ﻿from fastapi import APIRouter, Depends, HTTPException, Query
-from app.sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
+import base64
 
 from app.db import get_db
 from app.models import WebhookLog
+from app.webhook_dispatcher import queue_items
 from app.schemas import (
     WebhookExportRequest,
     WebhookExportResponse,
@@ -27,22 +31,7 @@ def export_items(
     request: WebhookExportRequest,
     db: Session = Depends(get_db),
 ):
-    dispatched, failed = 0, 0
-
-    for item in request.items:
-        log_entry = WebhookLog(
-            webhook_id=request.webhook_id,
-            item_upc=item.upc,
-            status=202,
-            attempts=0,
-            response="queued"
-        )
-        try:
-            db.add(log_entry)
-            dispatched += 1
-        except Exception as e:
-            failed += 1
-
+    dispatched, failed = queue_items(request.webhook_id, request.items, db)
     db.commit()
 
     return WebhookExportResponse(
@@ -56,30 +45,62 @@ def export_items(
 # GET /logs â€” fetch recent delivery logs for a webhook
 # â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 
+def encode_cursor(log: WebhookLog) -> str:
+    raw = f"{log.timestamp.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        ts, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(log_id)
+    except Exception:
+        raise HTTPException(400, detail="Invalid cursor")
+
+
+def fetch_log_page(
+    db: Session,
+    webhook_id: UUID,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[WebhookLog], Optional[str]]:
+    """
+    Newest-first page of logs using keyset pagination on (timestamp, id):
+    each page seeks past the last row of the previous one through the
+    (webhook_id, timestamp) index, so deep pages cost the same as the first.
+    """
+    query = db.query(WebhookLog).filter(WebhookLog.webhook_id == webhook_id)
+    if cursor:
+        ts, log_id = decode_cursor(cursor)
+        # (timestamp, id) < (ts, log_id), written so the index can seek on timestamp <= ts
+        query = query.filter(
+            WebhookLog.timestamp <= ts,
+            or_(WebhookLog.timestamp < ts, WebhookLog.id < log_id),
+        )
+    logs = (
+        query.order_by(WebhookLog.timestamp.desc(), WebhookLog.id.desc())
+             .limit(limit + 1)
+             .all()
+    )
+    next_cursor = encode_cursor(logs[limit - 1]) if len(logs) > limit else None
+    return logs[:limit], next_cursor
+
+
 @router.get(
     "/logs",
     response_model=WebhookLogsResponse,
-    summary="Fetch recent webhook delivery logs",
+    summary="Fetch webhook delivery logs, newest first, one page at a time",
 )
 def get_webhook_logs(
     webhook_id: UUID,
-    limit: int = Query(25, gt=0, le=100),
+    limit: int = Query(25, gt=0, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
-    logs = (
-        db.query(WebhookLog)
-          .filter(WebhookLog.webhook_id == webhook_id)
-          .order_by(WebhookLog.timestamp.desc())
-          .limit(limit)
-          .all()
-    )
-    if not logs:
+    logs, next_cursor = fetch_log_page(db, webhook_id, limit, cursor)
+    if not logs and cursor is None:
         raise HTTPException(404, detail=f"No logs found for webhook_id {webhook_id}")
     return WebhookLogsResponse(
-        logs=[WebhookLogEntry.model_validate(log, from_attributes=True) for log in logs]
-
-
+        logs=[WebhookLogEntry.model_validate(log, from_attributes=True) for log in logs],
+        next_cursor=next_cursor,
     )
-
-
-
@@ -0,0 +1,326 @@
+# app/webhook_worker.py
+#
+# Outbox-driven webhook delivery. Rows queued in webhook_logs by
+# app.webhook_dispatcher / app.webhook_export (next_attempt_at set) are
+# pulled in batches, grouped into one POST per webhook, sent over a shared
+# pooled client, and settled with bulk updates. Failures are retried with
+# exponential backoff until WEBHOOK_MAX_ATTEMPTS is reached.
+#
+# Each batch is claimed with a single UPDATE (claim token plus a lease in
+# next_attempt_at), so several workers can poll the same table without
+# delivering a row twice; rows held by a worker that dies become due again
+# when the lease runs out. Rows queued before the outbox columns existed
+# (next_attempt_at NULL, response "queued") count as due.
+#
+# Broadcast rows (app.orchestrator.dispatch_to_subscribers) are keyed by
+# /subscribe webhook_ids, which live in the SubscriptionStore rather than
+# the webhooks table; main() resolves those through subscription_endpoints.
+#
+#   python -m app.webhook_worker            # poll forever
+#   python -m app.webhook_worker --once     # drain what is due and exit
+
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from sqlalchemy import and_, or_
+
+from app.db import SessionLocal, engine
+from app.models import Webhook, WebhookLog, migrate_webhook_logs
+from app.subscription_store import SubscriptionStore, get_subscription_store
+from app.settings import (
+    WEBHOOK_BATCH_SIZE,
+    WEBHOOK_MAX_ITEMS_PER_POST,
+    WEBHOOK_MAX_ATTEMPTS,
+    WEBHOOK_BACKOFF_BASE,
+    WEBHOOK_BACKOFF_MAX,
+    WEBHOOK_CONCURRENCY,
+    WEBHOOK_TIMEOUT,
+    WEBHOOK_CLAIM_SECONDS,
+)
+
+QUEUED_STATUS = 202
+TRANSPORT_ERROR_STATUS = 0
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Process-wide pooled client for outbound webhook POSTs."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=WEBHOOK_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=WEBHOOK_CONCURRENCY * 2,
+                max_keepalive_connections=WEBHOOK_CONCURRENCY,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def backoff_delay(attempts: int, base: float = WEBHOOK_BACKOFF_BASE,
+                  cap: float = WEBHOOK_BACKOFF_MAX) -> float:
+    """Exponential backoff with jitter for the retry after `attempts` tries."""
+    delay = min(base * (2 ** max(attempts - 1, 0)), cap)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def db_endpoints(db, webhook_ids: Iterable) -> Dict:
+    """webhook_id -> endpoint URL for active webhooks."""
+    rows = (
+        db.query(Webhook.id, Webhook.endpoint)
+          .filter(Webhook.id.in_(list(webhook_ids)), Webhook.active.is_(True))
+          .all()
+    )
+    return {row.id: row.endpoint for row in rows if row.endpoint}
+
+
+def subscription_endpoints(db, webhook_ids: Iterable, store: Optional[SubscriptionStore] = None) -> Dict:
+    """
+    db_endpoints, plus subscriber URLs from the SubscriptionStore for ids
+    with no webhooks row at all (a deactivated webhook stays undeliverable).
+    """
+    ids = set(webhook_ids)
+    endpoints = db_endpoints(db, ids)
+    missing = ids - set(endpoints)
+    if missing:
+        missing -= {row.id for row in db.query(Webhook.id).filter(Webhook.id.in_(list(missing))).all()}
+        store = store or get_subscription_store()
+        for webhook_id in missing:
+            sub = store.get(webhook_id)
+            if sub is not None:
+                endpoints[webhook_id] = str(sub.url)
+    return endpoints
+
+
+class WebhookDeliveryWorker:
+    """
+    Delivers queued webhook_logs rows.
+
+    Args:
+        session_factory: Callable returning a SQLAlchemy session
+        client: httpx.AsyncClient to post with (defaults to the shared pool)
+        resolve_endpoints: (db, webhook_ids) -> {webhook_id: url}
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        client: Optional[httpx.AsyncClient] = None,
+        resolve_endpoints: Callable = db_endpoints,
+        batch_size: int = WEBHOOK_BATCH_SIZE,
+        max_items_per_post: int = WEBHOOK_MAX_ITEMS_PER_POST,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        concurrency: int = WEBHOOK_CONCURRENCY,
+        claim_seconds: float = WEBHOOK_CLAIM_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.client = client
+        self.resolve_endpoints = resolve_endpoints
+        self.batch_size = batch_size
+        self.max_items_per_post = max_items_per_post
+        self.max_attempts = max_attempts
+        self.concurrency = concurrency
+        self.claim_seconds = claim_seconds
+        self.stats = {"delivered": 0, "retried": 0, "failed": 0, "posts": 0, "elapsed": 0.0}
+
+    # ------------------------------------------------------------------
+    # Database side (sync, run in a thread)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _due(now: datetime):
+        return or_(
+            WebhookLog.next_attempt_at <= now,
+            and_(WebhookLog.next_attempt_at.is_(None), WebhookLog.response == "queued"),
+        )
+
+    def _fetch_due(self) -> tuple:
+        """Claim up to batch_size due rows for this worker and load them."""
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            ids = [
+                row.id for row in
+                db.query(WebhookLog.id)
+                  .filter(self._due(now))
+                  .order_by(WebhookLog.next_attempt_at, WebhookLog.id)
+                  .limit(self.batch_size)
+                  .all()
+            ]
+            if not ids:
+                return [], {}
+            # re-checking the due condition in the UPDATE means a row another
+            # worker claimed in the meantime is skipped rather than taken twice
+            token = uuid.uuid4().hex
+            (db.query(WebhookLog)
+               .filter(WebhookLog.id.in_(ids), self._due(now))
+               .update({WebhookLog.claimed_by: token,
+                        WebhookLog.next_attempt_at: now + timedelta(seconds=self.claim_seconds)},
+                       synchronize_session=False))
+            db.commit()
+            rows = (
+                db.query(WebhookLog.id, WebhookLog.webhook_id, WebhookLog.item_upc,
+                         WebhookLog.payload, WebhookLog.attempts)
+                  .filter(WebhookLog.claimed_by == token)
+                  .order_by(WebhookLog.id)
+                  .all()
+            )
+            endpoints = self.resolve_endpoints(db, {row.webhook_id for row in rows}) if rows else {}
+            return rows, endpoints
+        finally:
+            db.close()
+
+    def _settle(self, updates: List[dict]) -> None:
+        if not updates:
+            return
+        db = self.session_factory()
+        try:
+            db.bulk_update_mappings(WebhookLog, updates)
+            db.commit()
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _item(row) -> dict:
+        if row.payload:
+            return json.loads(row.payload)
+        return {"upc": row.item_upc}
+
+    async def _post(self, client, sem, url: str, webhook_id, rows: list) -> tuple:
+        body = {"webhook_id": str(webhook_id), "items": [self._item(row) for row in rows]}
+        async with sem:
+            try:
+                resp = await client.post(url, json=body)
+            except httpx.HTTPError as exc:
+                return rows, TRANSPORT_ERROR_STATUS, f"error: {exc!r}"
+        if resp.is_success:
+            return rows, resp.status_code, "delivered"
+        return rows, resp.status_code, f"error: HTTP {resp.status_code} {resp.text[:200]}"
+
+    def _outcome(self, row, status: int, message: str, now: datetime) -> dict:
+        attempts = (row.attempts or 0) + 1
+        if message == "delivered":
+            self.stats["delivered"] += 1
+            return {"id": row.id, "status": status, "attempts": attempts,
+                    "response": message, "next_attempt_at": None, "claimed_by": None}
+        # 4xx other than 408/429 will not get better by retrying
+        permanent = 400 <= status < 500 and status not in (408, 429)
+        if permanent or attempts >= self.max_attempts:
+            self.stats["failed"] += 1
+            return {"id": row.id, "status": status, "attempts": attempts,
+                    "response": message, "next_attempt_at": None, "claimed_by": None}
+        self.stats["retried"] += 1
+        return {"id": row.id, "status": QUEUED_STATUS, "attempts": attempts,
+                "response": f"retrying: {message}", "claimed_by": None,
+                "next_attempt_at": now + timedelta(seconds=backoff_delay(attempts))}
+
+    async def run_once(self) -> int:
+        """Deliver one batch of due rows; returns how many rows were settled."""
+        start = time.perf_counter()
+        rows, endpoints = await asyncio.to_thread(self._fetch_due)
+        if not rows:
+            return 0
+
+        groups = defaultdict(list)
+        for row in rows:
+            groups[row.webhook_id].append(row)
+
+        client = self.client or get_http_client()
+        sem = asyncio.Semaphore(self.concurrency)
+        now = datetime.utcnow()
+        updates, posts = [], []
+        for webhook_id, group in groups.items():
+            url = endpoints.get(webhook_id)
+            if url is None:
+                updates += [{"id": row.id, "status": 404, "attempts": (row.attempts or 0) + 1,
+                             "response": "error: no active endpoint for webhook",
+                             "next_attempt_at": None, "claimed_by": None} for row in group]
+                self.stats["failed"] += len(group)
+                continue
+            for i in range(0, len(group), self.max_items_per_post):
+                posts.append(self._post(client, sem, url, webhook_id, group[i:i + self.max_items_per_post]))
+
+        for sent, status, message in await asyncio.gather(*posts):
+            updates += [self._outcome(row, status, message, now) for row in sent]
+        self.stats["posts"] += len(posts)
+
+        await asyncio.to_thread(self._settle, updates)
+        self.stats["elapsed"] += time.perf_counter() - start
+        return len(updates)
+
+    async def drain(self) -> int:
+        """Deliver batches until nothing is due."""
+        total = 0
+        while True:
+            settled = await self.run_once()
+            if not settled:
+                return total
+            total += settled
+
+    async def run(self, poll_interval: float = 1.0, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            if not await self.run_once():
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def report(self) -> dict:
+        s = dict(self.stats)
+        settled = s["delivered"] + s["failed"]
+        s["deliveries_per_sec"] = round(s["delivered"] / s["elapsed"], 1) if s["elapsed"] else 0.0
+        s["settled"] = settled
+        return s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver queued webhook items")
+    parser.add_argument("--once", action="store_true", help="drain due rows and exit")
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds between polls when idle")
+    args = parser.parse_args()
+
+    added = migrate_webhook_logs(engine)
+    if added:
+        print(f"Added webhook_logs columns: {', '.join(added)}")
+    worker = WebhookDeliveryWorker(resolve_endpoints=subscription_endpoints)
+
+    async def go():
+        try:
+            if args.once:
+                await worker.drain()
+            else:
+                await worker.run(args.poll)
+        finally:
+            await close_http_client()
+
+    try:
+        asyncio.run(go())
+    except KeyboardInterrupt:
+        pass
+    print(worker.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,30 @@ import gspread
 from google.oauth2.service_account import Credentials
 from app.services.scrapers.amazon_scraper import scrape_amazon
 from app.services.walmart_scraper import scrape_walmart_product
+from app.sheets_writer import clear_rows, open_worksheet, write_rows
 
-def export_to_google_sheets(data: list[dict], sheet_name: str, worksheet_name: str = "Sheet1"):
+def export_to_google_sheets(data: list[dict], sheet_name: str, worksheet_name: str = "Sheet1",
+                            client=None, key: str = None, snapshot_path: str = None):
     """
     Exports a list of dicts to a Google Sheet.
     - data: List of product dicts.
     - sheet_name: Name of the Google Sheet.
     - worksheet_name: Name of the worksheet/tab.
+    - client: gspread client to use (e.g. app.fake_sheets.FakeSheetsClient); defaults to credentials.json.
+    - key: Column identifying a product, so re-exports only rewrite changed rows.
+    - snapshot_path: JSON file remembering the last export for diffing.
+    Returns the writer stats (API calls, rows written/unchanged/cleared).
     """
-    creds = Credentials.from_service_account_file("credentials.json", scopes=[
-        "https://www.googleapis.com/auth/spreadsheets"
-    ])
-    gc = gspread.authorize(creds)
-    sh = gc.open(sheet_name)
-    try:
-        ws = sh.worksheet(worksheet_name)
-    except gspread.WorksheetNotFound:
-        ws = sh.add_worksheet(title=worksheet_name, rows="100", cols="20")
-    ws.clear()
-    if data:
-        headers = list(data[0].keys())
-        ws.append_row(headers)
-        for row in data:
-            ws.append_row([row.get(h, "") for h in headers])
+    if client is None:
+        creds = Credentials.from_service_account_file("credentials.json", scopes=[
+            "https://www.googleapis.com/auth/spreadsheets"
+        ])
+        client = gspread.authorize(creds)
+    ws = open_worksheet(client, sheet_name, worksheet_name, rows=100, cols=20)
+    if not data:
+        clear_rows(ws, snapshot_path)
+        return None
+    return write_rows(ws, data, key=key, snapshot_path=snapshot_path)
 
 def main():
     # Scrape Amazon
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Pipeline adapter benchmark
+Measures per-UPC overhead of app.pipeline_adapters in each mode:
+subprocess (fresh interpreter per call), worker (warm process per source)
+and inprocess (direct function call).
+
+    python scripts/bench_pipeline_adapters.py --source echo --upcs 50
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from app.pipeline_adapters import run_pipeline, shutdown_workers
+
+MODES = ("subprocess", "worker", "inprocess")
+
+
+def bench(source: str, mode: str, upcs: list) -> float:
+    start = time.perf_counter()
+    for upc in upcs:
+        run_pipeline(source, upc, mode=mode)
+    return (time.perf_counter() - start) / len(upcs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default="echo")
+    parser.add_argument("--upcs", type=int, default=50)
+    args = parser.parse_args()
+
+    upcs = [f"{i:012d}" for i in range(args.upcs)]
+    # warm up imports / worker so the first call isn't counted
+    for mode in MODES:
+        run_pipeline(args.source, upcs[0], mode=mode)
+
+    baseline = None
+    print(f"{'mode':<12}{'ms/upc':>10}{'speedup':>10}")
+    for mode in MODES:
+        per_upc = bench(args.source, mode, upcs)
+        baseline = baseline or per_upc
+        print(f"{mode:<12}{per_upc * 1000:>10.2f}{baseline / per_upc:>9.1f}x")
+    shutdown_workers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+OCR product matching benchmark
+Indexes --products synthetic catalog rows with app.vision.product_index and
+times UPC, model, brand and noisy-name lookups (p50/p95 per query type, and
+how often the source product is in the top k). The old linear scan is timed
+on a --scan-sample slice and scaled to the full catalog for comparison.
+
+    python scripts/bench_product_matcher.py --products 1000000 --queries 300
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from app.vision.product_index import FUZZY_BACKEND, ProductIndex, normalize_text, partial_ratio
+
+BRANDS = ["Apple", "Samsung", "Nike", "Adidas", "LEGO", "Hasbro", "Mattel", "Sony", "Bose", "Dyson",
+          "KitchenAid", "Ninja", "Hamilton Beach", "Crayola", "Melissa & Doug", "Funko", "Logitech",
+          "Anker", "Philips", "Braun", "Oral-B", "Gillette", "Energizer", "Duracell", "Coleman"]
+NOUNS = ["Speaker", "Headphones", "Blender", "Action Figure", "Building Set", "Running Shoe", "Charger",
+         "Toothbrush", "Razor", "Lantern", "Puzzle", "Board Game", "Keyboard", "Mouse", "Air Fryer",
+         "Coffee Maker", "Vacuum", "Doll", "Marker Set", "Battery Pack", "Backpack", "Water Bottle"]
+ADJECTIVES = ["Wireless", "Portable", "Deluxe", "Pro", "Mini", "Ultra", "Classic", "Smart", "Compact",
+              "Rechargeable", "Kids", "Premium", "Outdoor", "Digital", "Cordless", "Waterproof"]
+COLORS = ["Black", "White", "Red", "Blue", "Silver", "Green", "Pink", "Graphite", "Navy", "Gold"]
+
+
+def synthetic_catalog(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(count):
+        brand = rng.choice(BRANDS)
+        model = f"{brand[:2].upper()}{rng.randint(100, 99999)}{rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ')}"
+        yield {
+            "name": f"{brand} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {model} "
+                    f"{rng.choice(COLORS)} {rng.randint(1, 64)} Pack",
+            "brand": brand,
+            "upc": f"{rng.randint(10**10, 10**11 - 1)}{i % 10}",
+            "model": model,
+            "price": f"${rng.randint(5, 500)}.{rng.randint(0, 99):02d}",
+            "category": "Benchmark",
+            "asin": f"B{i:09d}",
+        }
+
+
+def ocr_noise(text: str, rng: random.Random) -> str:
+    """A fragment of the title with a couple of OCR-style character errors"""
+    words = text.split()
+    start = rng.randint(0, max(0, len(words) - 4))
+    chars = list(" ".join(words[start:start + rng.randint(3, 5)]).upper())
+    confusions = {"O": "0", "0": "O", "I": "1", "1": "I", "S": "5", "B": "8", "E": "F"}
+    for _ in range(2):
+        j = rng.randrange(len(chars))
+        chars[j] = confusions.get(chars[j], chars[j])
+    return "".join(chars)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def time_queries(fn, queries):
+    times, hits = [], 0
+    for query, field, expected in queries:
+        start = time.perf_counter()
+        found = fn(query)
+        times.append(time.perf_counter() - start)
+        hits += any(p[field] == expected for p, _ in found)
+    return times, hits
+
+
+def linear_scan(products, text):
+    """The previous ProductMatcher.match_by_name: score every product"""
+    text = normalize_text(text)
+    return sorted(((partial_ratio(text, normalize_text(p["name"])), p) for p in products),
+                  key=lambda s: -s[0])[:10]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--scan-sample", type=int, default=2000, help="products scored by the linear baseline")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = ProductIndex(synthetic_catalog(args.products))
+    print(f"🗂️ indexed {len(index)} products in {time.perf_counter() - start:.1f}s  {index.stats()}")
+    print(f"   fuzzy scorer: {FUZZY_BACKEND}")
+
+    rng = random.Random(11)
+    picks = [index.product(rng.randrange(len(index))) for _ in range(args.queries)]
+    suites = {
+        "upc": ([("0" + p["upc"], "asin", p["asin"]) for p in picks], lambda q: index.top_k(q, "upc", args.k)),
+        "model": ([(p["model"].lower(), "asin", p["asin"]) for p in picks],
+                  lambda q: index.top_k(q, "model", args.k)),
+        "brand": ([(p["brand"].upper(), "brand", p["brand"]) for p in picks],
+                  lambda q: index.top_k(q, "brand", args.k)),
+        "name": ([(ocr_noise(p["name"], rng), "asin", p["asin"]) for p in picks],
+                 lambda q: index.top_k(q, "name", args.k)),
+    }
+    print(f"  {'lookup':<8}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'in top k':>10}")
+    for name, (queries, fn) in suites.items():
+        times, hits = time_queries(fn, queries)
+        print(f"  {name:<8}{percentile(times, .5) * 1000:>9.3f}{percentile(times, .95) * 1000:>9.3f}"
+              f"{max(times) * 1000:>9.3f}{hits:>6}/{len(queries)}")
+
+    sample = [index.product(i) for i in range(min(args.scan_sample, len(index)))]
+    queries = suites["name"][0][:20]
+    start = time.perf_counter()
+    for query, _, _ in queries:
+        linear_scan(sample, query)
+    per_query = (time.perf_counter() - start) / len(queries) * len(index) / len(sample)
+    print(f"  linear name scan (scaled to {len(index)} products): {per_query * 1000:.0f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
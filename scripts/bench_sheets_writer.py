@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Google Sheets export benchmark (offline)
+Exports --rows products to an in-memory fake worksheet whose every API call
+sleeps --latency seconds, comparing the old append_row-per-product loop with
+app.sheets_writer on a first export and on a re-export where --changed of
+the rows moved price.
+
+    python scripts/bench_sheets_writer.py --rows 2000 --latency 0.02
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from app.fake_sheets import FakeSheetsClient
+from app.sheets_writer import SheetWriter, open_worksheet
+
+HEADERS = ["ASIN", "Title", "Price"]
+
+
+def per_row(ws, rows):
+    """The previous exporters: clear, then one append_row per product"""
+    ws.clear()
+    ws.append_row(HEADERS)
+    for row in rows:
+        ws.append_row(row)
+
+
+def batched(ws, rows, snapshot):
+    writer = SheetWriter(ws, headers=HEADERS, key="ASIN", snapshot_path=snapshot)
+    writer.add_many(rows)
+    writer.flush()
+
+
+def timed(label, ws, fn, *args, rows):
+    before, start = ws.api_calls, time.perf_counter()
+    fn(ws, *args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22}{ws.api_calls - before:>8}{elapsed:>10.2f}{rows / elapsed:>12,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per API call")
+    parser.add_argument("--changed", type=float, default=0.02, help="fraction of rows changed on re-export")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    rows = [[f"B{n:08d}", f"product {n}", f"{rng.uniform(5, 80):.2f}"] for n in range(args.rows)]
+    client = FakeSheetsClient(latency=args.latency)
+
+    print(f"{'mode':<22}{'calls':>8}{'seconds':>10}{'rows/s':>12}")
+    ws = open_worksheet(client, "Bench", "per_row")
+    timed("append_row per row", ws, per_row, rows, rows=args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = f"{tmp}/snapshot.json"
+        ws = open_worksheet(client, "Bench", "batched")
+        timed("batched, first export", ws, batched, rows, snapshot, rows=args.rows)
+        for row in rng.sample(rows, int(args.rows * args.changed)):
+            row[2] = f"{float(row[2]) + 1:.2f}"
+        timed("batched, re-export", ws, batched, rows, snapshot, rows=args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Webhook log benchmark (SQLite)
+Fills webhook_logs with --rows rows through the bulk queue path, times the
+old one-db.add-per-item path on a sample, then compares fetching a deep
+page with OFFSET against the keyset cursor used by /api/v1/webhook/logs.
+
+    python scripts/bench_webhook_logs.py --rows 1000000
+"""
+import sys
+import time
+import uuid
+import argparse
+import tempfile
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import WebhookLog
+from app.schemas import ExportItem
+from app.webhook_dispatcher import queue_items
+from app.webhook_export import fetch_log_page, encode_cursor
+
+
+def per_item_insert(db, webhook_id, items):
+    """The previous export_items loop: one ORM object per item"""
+    for item in items:
+        db.add(WebhookLog(webhook_id=webhook_id, item_upc=item.upc, status=202,
+                          attempts=0, response="queued"))
+    db.commit()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--webhooks", type=int, default=2)
+    parser.add_argument("--batch", type=int, default=10_000, help="items per queue call")
+    parser.add_argument("--sample", type=int, default=20_000, help="rows for the per-item insert timing")
+    parser.add_argument("--page", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/logs.db")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        ids = [uuid.uuid4() for _ in range(args.webhooks)]
+        items = [ExportItem(upc=f"{n:012d}", price=9.99, roi=0.3) for n in range(args.batch)]
+
+        elapsed, _ = timed(per_item_insert, db, ids[0], items[:args.sample] * (args.sample // len(items) or 1))
+        print(f"per-item db.add : {args.sample / elapsed:>12,.0f} rows/s")
+
+        start, queued = time.perf_counter(), 0
+        while queued < args.rows:
+            webhook_id = ids[(queued // args.batch) % len(ids)]
+            n, _ = queue_items(webhook_id, items[:min(args.batch, args.rows - queued)], db)
+            db.commit()
+            queued += n
+        elapsed = time.perf_counter() - start
+        print(f"bulk queue_items: {queued / elapsed:>12,.0f} rows/s  ({queued:,} rows)")
+
+        target = ids[1]
+        depth = db.query(WebhookLog).filter(WebhookLog.webhook_id == target).count() // 2
+
+        def offset_page():
+            return (db.query(WebhookLog).filter(WebhookLog.webhook_id == target)
+                      .order_by(WebhookLog.timestamp.desc(), WebhookLog.id.desc())
+                      .offset(depth).limit(args.page).all())
+
+        anchor = offset_page()[0]
+        db.expire_all()
+        # cursor pointing just before the anchor row, i.e. the same page as the OFFSET query
+        before = (db.query(WebhookLog).filter(WebhookLog.webhook_id == target)
+                    .order_by(WebhookLog.timestamp.desc(), WebhookLog.id.desc())
+                    .offset(depth - 1).limit(1).one())
+        cursor = encode_cursor(before)
+
+        first, _ = timed(fetch_log_page, db, target, args.page, None)
+        deep_offset, rows_a = timed(offset_page)
+        deep_keyset, (rows_b, _) = timed(fetch_log_page, db, target, args.page, cursor)
+        assert [r.id for r in rows_a] == [r.id for r in rows_b] and rows_b[0].id == anchor.id
+        print(f"first page      : {first * 1000:>9.2f} ms")
+        print(f"page at {depth:,} OFFSET : {deep_offset * 1000:>9.2f} ms")
+        print(f"page at {depth:,} keyset : {deep_keyset * 1000:>9.2f} ms")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
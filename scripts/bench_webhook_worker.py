@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Webhook delivery benchmark
+Queues items in a throwaway SQLite outbox, starts a local stand-in receiver
+and drains the queue with app.webhook_worker, reporting deliveries/sec for
+grouped POSTs versus one POST per item.
+
+    python scripts/bench_webhook_worker.py --webhooks 20 --items 5000
+"""
+import sys
+import json
+import uuid
+import asyncio
+import argparse
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import Webhook, WebhookLog
+from app.webhook_worker import WebhookDeliveryWorker, QUEUED_STATUS, close_http_client
+
+
+class Receiver(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def seed(Session, url: str, webhooks: int, items: int):
+    db = Session()
+    ids = [uuid.uuid4() for _ in range(webhooks)]
+    db.add_all(Webhook(id=i, name=f"bench-{n}", endpoint=url, active=True) for n, i in enumerate(ids))
+    now = datetime.utcnow()
+    db.bulk_insert_mappings(WebhookLog, [
+        {"webhook_id": ids[n % webhooks], "item_upc": f"{n:012d}", "status": QUEUED_STATUS,
+         "attempts": 0, "response": "queued", "next_attempt_at": now,
+         "payload": json.dumps({"upc": f"{n:012d}", "price": 9.99, "roi": 0.3})}
+        for n in range(items)
+    ])
+    db.commit()
+    db.close()
+
+
+def bench(url: str, webhooks: int, items: int, per_post: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/outbox.db")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        seed(Session, url, webhooks, items)
+
+        worker = WebhookDeliveryWorker(session_factory=Session, max_items_per_post=per_post)
+
+        async def go():
+            try:
+                await worker.drain()
+            finally:
+                await close_http_client()
+
+        asyncio.run(go())
+        engine.dispose()
+        return worker.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--webhooks", type=int, default=20)
+    parser.add_argument("--items", type=int, default=5000)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Receiver)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/hook"
+
+    print(f"{'mode':<14}{'posts':>8}{'delivered':>11}{'deliveries/s':>14}")
+    for label, per_post in (("one per item", 1), ("grouped", 100)):
+        r = bench(url, args.webhooks, args.items, per_post)
+        print(f"{label:<14}{r['posts']:>8}{r['delivered']:>11}{r['deliveries_per_sec']:>14.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()